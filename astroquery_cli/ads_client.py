@@ -0,0 +1,259 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from astropy.table import MaskedColumn, Table as AstropyTable
+from astroquery.nasa_ads import ADS
+
+from astroquery_cli import config
+from astroquery_cli.debug import debug
+from astroquery_cli.http_session import get_shared_session
+
+# The ADS search API returns at most this many rows per request
+ADS_MAX_ROWS = 2000
+
+# The ADS export API accepts at most this many bibcodes per request
+ADS_EXPORT_MAX_BIBCODES = 2000
+
+# Identifiers per search request when mapping requested bibcodes to canonical ones
+ADS_IDENTIFIER_CHUNK = 50
+
+# Wait for short rate-limit resets instead of failing (seconds)
+ADS_MAX_RATE_LIMIT_WAIT = 60
+
+
+class AdsRateLimitExceeded(RuntimeError):
+    pass
+
+
+def get_ads_token() -> Optional[str]:
+    return os.getenv("ADS_DEV_KEY") or ADS.TOKEN
+
+
+class AdsRateLimit:
+    """
+    Tracks the X-RateLimit-* headers ADS sends with every response and holds
+    requests back once the remaining quota would be used up by the requests
+    already in flight.
+    """
+
+    def __init__(self, reserve: int = 1):
+        self.reserve = reserve
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def update(self, headers):
+        with self._lock:
+            try:
+                if "X-RateLimit-Remaining" in headers:
+                    self.remaining = int(headers["X-RateLimit-Remaining"])
+                if "X-RateLimit-Limit" in headers:
+                    self.limit = int(headers["X-RateLimit-Limit"])
+                if "X-RateLimit-Reset" in headers:
+                    self.reset = float(headers["X-RateLimit-Reset"])
+            except ValueError:
+                return
+        debug(f"ADS rate limit: {self.remaining}/{self.limit} remaining, reset {self.reset}")
+
+    def _reset_message(self) -> str:
+        when = datetime.fromtimestamp(self.reset).isoformat(timespec="seconds") if self.reset else "later"
+        return f"ADS API rate limit exhausted ({self.limit} requests); it resets at {when}."
+
+    def wait(self, retry_after: Optional[float] = None):
+        """Blocks until a request may be sent, or raises if that would take too long."""
+        with self._lock:
+            if retry_after is None:
+                if self.remaining is None or self.remaining > self.reserve:
+                    return
+                retry_after = (self.reset - time.time()) if self.reset else ADS_MAX_RATE_LIMIT_WAIT + 1
+            if retry_after > ADS_MAX_RATE_LIMIT_WAIT:
+                raise AdsRateLimitExceeded(self._reset_message())
+        debug(f"ADS rate limit reached; waiting {retry_after:.0f} s")
+        time.sleep(max(0.0, retry_after))
+
+
+def ads_request(method: str, path: str, rate_limit: AdsRateLimit, token: str, **kwargs):
+    """
+    Sends one ADS API request over the shared connection pool. Every call
+    carries its own parameters, so concurrent calls share no mutable state.
+    """
+    url = ADS.SERVER.rstrip("/") + "/v1/" + path.lstrip("/")
+    headers = {"Authorization": f"Bearer {token}"}
+    for _attempt in range(3):
+        rate_limit.wait()
+        response = get_shared_session().request(method, url, headers=headers, timeout=ADS.TIMEOUT, **kwargs)
+        rate_limit.update(response.headers)
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            rate_limit.wait(float(retry_after) if retry_after else None)
+            continue
+        response.raise_for_status()
+        return response
+    raise AdsRateLimitExceeded(rate_limit._reset_message())
+
+
+# ADS fields with numeric values; every other field is stored as text. Fixing
+# the dtype per field gives every result page the same schema.
+ADS_FIELD_DTYPES = {
+    "citation_count": "int64",
+    "read_count": "int64",
+    "author_count": "int64",
+    "page_count": "int64",
+    "classic_factor": "int64",
+    "citation_count_norm": "float64",
+}
+
+
+def _field_value(doc: Dict[str, Any], field: str) -> Any:
+    value = doc.get(field)
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return value[0] if field == "title" and value else "; ".join(str(v) for v in value)
+    return value
+
+
+def docs_to_table(docs: List[Dict[str, Any]], fields: List[str]) -> AstropyTable:
+    """
+    Builds a table with one masked column per requested field (list values
+    joined with '; '); missing values are masked and the dtype depends only
+    on the field, not on the values of the page.
+    """
+    columns = []
+    for field in fields:
+        dtype = ADS_FIELD_DTYPES.get(field, "str")
+        values = [_field_value(doc, field) for doc in docs]
+        mask = [v is None for v in values]
+        if dtype == "str":
+            data = ["" if v is None else str(v) for v in values]
+        else:
+            data = [0 if v is None else v for v in values]
+        columns.append(MaskedColumn(data, name=field, mask=mask, dtype=dtype))
+    return AstropyTable(columns)
+
+
+def search_page(query: str, fields: List[str], sort: Optional[str], start: int, rows: int,
+                rate_limit: AdsRateLimit, token: str) -> Tuple[List[Dict[str, Any]], int]:
+    """Fetches one page of search results; returns (docs, total number of hits)."""
+    params = {"q": query, "fl": ",".join(fields), "start": start, "rows": rows}
+    if sort:
+        params["sort"] = sort
+    response = ads_request("GET", "search/query", rate_limit, token, params=params)
+    body = response.json().get("response", {})
+    return body.get("docs", []), int(body.get("numFound", 0))
+
+
+def page_requests(total: int, first_rows: int, rows: int, max_records: Optional[int]) -> List[Tuple[int, int]]:
+    """(start, rows) of the pages after the first one, up to `max_records` records in total."""
+    limit = total if max_records is None else min(total, max_records)
+    return [(start, min(rows, limit - start)) for start in range(first_rows, limit, rows)]
+
+
+_BIBTEX_KEY_RE = re.compile(r"^@\w+\s*\{\s*([^,\s]+)\s*,", re.MULTILINE)
+
+
+def split_bibtex(text: str) -> Dict[str, str]:
+    """Splits a BibTeX document into entries keyed by citation key (ADS uses the bibcode)."""
+    matches = list(_BIBTEX_KEY_RE.finditer(text))
+    entries = {}
+    for match, following in zip(matches, matches[1:] + [None]):
+        end = following.start() if following else len(text)
+        entries[match.group(1)] = text[match.start():end].strip() + "\n"
+    return entries
+
+
+def canonical_bibcodes(identifiers: List[str], rate_limit: AdsRateLimit, token: str) -> Dict[str, str]:
+    """
+    Requested identifier -> canonical bibcode, for identifiers ADS knows under
+    another bibcode (arXiv or alternate bibcodes of published papers).
+    """
+    mapping = {}
+    for chunk in bibcode_chunks(identifiers, ADS_IDENTIFIER_CHUNK):
+        query = "identifier:(" + " OR ".join(json.dumps(i) for i in chunk) + ")"
+        docs, _total = search_page(query, ["bibcode", "identifier", "alternate_bibcode"], None, 0, ADS_MAX_ROWS, rate_limit, token)
+        wanted = set(chunk)
+        for doc in docs:
+            for identifier in set(doc.get("identifier") or []) | set(doc.get("alternate_bibcode") or []):
+                if identifier in wanted and doc.get("bibcode"):
+                    mapping[identifier] = doc["bibcode"]
+    return mapping
+
+
+def export_bibtex(bibcodes: List[str], rate_limit: AdsRateLimit, token: str) -> Dict[str, str]:
+    """
+    Exports BibTeX for up to ADS_EXPORT_MAX_BIBCODES bibcodes in one request;
+    returns requested bibcode -> entry. Entries ADS returns under a canonical
+    bibcode are mapped back to the identifier that was requested.
+    """
+    response = ads_request("POST", "export/bibtex", rate_limit, token, json={"bibcode": list(bibcodes)})
+    entries = split_bibtex(response.json().get("export", ""))
+    unmatched = [b for b in bibcodes if b not in entries]
+    if unmatched:
+        mapped = {requested: bibcode for requested, bibcode in canonical_bibcodes(unmatched, rate_limit, token).items() if bibcode in entries}
+        for requested, bibcode in mapped.items():
+            entries[requested] = entries[bibcode]
+        requested_set = set(bibcodes)
+        for bibcode in set(mapped.values()) - requested_set:
+            del entries[bibcode]
+    return entries
+
+
+class BibtexStore:
+    """
+    Local store of exported BibTeX entries (<cache_dir>/bibtex.json), keyed by
+    bibcode, so regenerating a bibliography only exports bibcodes not seen before.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else config.get_cache_dir() / "bibtex.json"
+        self._entries: Optional[Dict[str, dict]] = None
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, ValueError) as e:
+                debug(f"Ignoring unreadable BibTeX store {self.path}: {e}")
+                self._entries = {}
+        return self._entries
+
+    def get(self, bibcode: str) -> Optional[str]:
+        entry = self._load().get(bibcode)
+        return entry["bibtex"] if entry else None
+
+    def update(self, entries: Dict[str, str]):
+        now = time.time()
+        stored = self._load()
+        for bibcode, bibtex in entries.items():
+            stored[bibcode] = {"bibtex": bibtex, "exported": now}
+
+    def save(self):
+        if self._entries is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+
+def bibcode_chunks(bibcodes: Iterable[str], size: int) -> List[List[str]]:
+    bibcodes = list(bibcodes)
+    size = max(1, min(size, ADS_EXPORT_MAX_BIBCODES))
+    return [bibcodes[i:i + size] for i in range(0, len(bibcodes), size)]
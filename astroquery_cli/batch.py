@@ -0,0 +1,277 @@
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import typer
+from astropy.table import Table as AstropyTable, vstack
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, ProgressColumn, TextColumn, TimeElapsedColumn
+from rich.text import Text
+
+from astroquery_cli import config
+from astroquery_cli.debug import debug
+from astroquery_cli.utils import console
+
+
+def read_targets(targets_file: Optional[str] = None, from_stdin: bool = False) -> List[str]:
+    """
+    Reads target names or coordinate strings, one per line, from a file and/or stdin.
+    Blank lines and lines starting with '#' are skipped.
+    """
+    targets = []
+    sources = []
+    if targets_file:
+        sources.append(open(os.path.expanduser(targets_file), "r", encoding="utf-8"))
+    if from_stdin:
+        sources.append(sys.stdin)
+    for source in sources:
+        try:
+            for line in source:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    targets.append(line)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+    return targets
+
+
+def resolve_batch_targets(
+    single_target: Optional[Union[str, List[str]]],
+    targets_file: Optional[str],
+    from_stdin: bool,
+) -> List[str]:
+    """
+    Combines the positional target(s) with any --targets-file / --stdin input.
+    Exits with an error if no target was given at all.
+    """
+    import builtins
+    _ = builtins._
+    if isinstance(single_target, str):
+        targets = [single_target]
+    else:
+        targets = list(single_target or [])
+    try:
+        targets.extend(read_targets(targets_file, from_stdin))
+    except OSError as e:
+        console.print(_("[bold red]Error reading targets file '{file}': {error}[/bold red]").format(file=targets_file, error=e))
+        raise typer.Exit(code=1)
+    if not targets:
+        console.print(_("[bold red]Error: Provide a target, --targets-file or --stdin.[/bold red]"))
+        raise typer.Exit(code=1)
+    return targets
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls to at most `rate` per second (0 or None disables it)."""
+
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def call_with_retry(
+    func: Callable[[], Any],
+    retries: int = 0,
+    backoff: float = 1.0,
+    max_backoff: float = 30.0,
+    description: str = "",
+) -> Any:
+    """
+    Calls `func()` and retries up to `retries` times on failure, sleeping with
+    exponential backoff plus jitter between attempts. typer.Exit is never retried.
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except typer.Exit:
+            raise
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            delay = min(max_backoff, backoff * (2 ** attempt)) * (0.5 + random.random() / 2)
+            attempt += 1
+            debug(f"Retry {attempt}/{retries} for {description or 'request'} in {delay:.1f}s after {type(e).__name__}: {e}")
+            time.sleep(delay)
+
+
+class ThroughputColumn(ProgressColumn):
+    """Renders completed items per second for a progress task."""
+
+    def render(self, task) -> Text:
+        elapsed = task.finished_time if task.finished else task.elapsed
+        if not elapsed or not task.completed:
+            return Text("-- /s", style="progress.data.speed")
+        return Text(f"{task.completed / elapsed:.1f}/s", style="progress.data.speed")
+
+
+class AlignedTableStream:
+    """
+    Feeds per-target result tables to a StreamingTableWriter as they arrive.
+
+    The schema is taken from the first table flagged as complete; tables written
+    before that (e.g. failure rows with only a few columns) are held back until
+    it is known. Every table is aligned to the schema's columns and dtypes, with
+    missing values masked, so the output has one consistent layout.
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+        self._template: Optional[AstropyTable] = None
+        self._pending: List[AstropyTable] = []
+
+    def _align(self, table: AstropyTable) -> AstropyTable:
+        merged = vstack([self._template, table], join_type="outer", metadata_conflicts="silent")
+        return merged[self._template.colnames]
+
+    def _start(self, tables: List[AstropyTable]):
+        self._template = vstack(tables, join_type="outer", metadata_conflicts="silent")[:0]
+        for table in tables:
+            self.writer.write(self._align(table))
+        self._pending = []
+
+    def write(self, table: AstropyTable, complete: bool = True):
+        if self._template is None:
+            if not complete:
+                self._pending.append(table)
+                return
+            self._start([table] + self._pending)
+            return
+        self.writer.write(self._align(table))
+
+    def close(self):
+        if self._template is None and self._pending:
+            self._start(self._pending)
+        self.writer.close()
+
+
+def tag_table(table: AstropyTable, target: str) -> AstropyTable:
+    """Adds (or replaces) a leading 'target_input' column holding the original input string."""
+    if "target_input" in table.colnames:
+        table.remove_column("target_input")
+    table.add_column([target] * len(table), name="target_input", index=0)
+    return table
+
+
+def merge_tables(tables: List[AstropyTable]) -> Optional[AstropyTable]:
+    if not tables:
+        return None
+    if len(tables) == 1:
+        return tables[0]
+    return vstack(tables, join_type="outer", metadata_conflicts="silent")
+
+
+def iter_completed(jobs: List[Any], fetch_one: Callable[[Any], Any], concurrency: int):
+    """
+    Runs `fetch_one(job)` for every job on a thread pool and yields
+    (job, result, error, seconds) in completion order, so callers can show
+    each result as soon as it arrives. Errors are yielded, not raised.
+    """
+    def timed(job):
+        started = time.perf_counter()
+        try:
+            return fetch_one(job), None, time.perf_counter() - started
+        except Exception as e:
+            return None, e, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=max(1, min(len(jobs), concurrency))) as executor:
+        futures = {executor.submit(timed, job): job for job in jobs}
+        for future in as_completed(futures):
+            yield (futures[future], *future.result())
+
+
+def run_batch(
+    service: str,
+    targets: List[str],
+    fetch_one: Callable[[str], Any],
+    concurrency: Optional[int] = None,
+    rate_limit: Optional[float] = None,
+    description: str = "",
+    retries: int = 0,
+    on_result: Optional[Callable[[str, AstropyTable], None]] = None,
+    tag: bool = True,
+    merge: bool = True,
+) -> Tuple[Optional[AstropyTable], List[Tuple[str, str]]]:
+    """
+    Runs `fetch_one(target)` for every target on a bounded thread pool.
+
+    Returns the merged table (input order preserved, each block tagged with a
+    'target_input' column unless `tag` is False) and a list of (target, error
+    message) failures. Targets returning None or an empty table are counted as
+    failures when tagging; untagged runs (e.g. query partitions) skip them.
+    Failed calls are retried `retries` times with exponential backoff, and
+    `on_result(target, table)` is called for each result as soon as it completes.
+    With `merge` False nothing is kept or merged (None is returned instead of a
+    table); results then only reach `on_result` and need not be tables.
+    """
+    concurrency = concurrency or config.get_batch_concurrency(service)
+    rate_limit = rate_limit if rate_limit is not None else config.get_batch_rate_limit(service)
+    limiter = RateLimiter(rate_limit)
+    debug(f"Batch {service}: {len(targets)} target(s), concurrency={concurrency}, rate_limit={rate_limit}/s, retries={retries}")
+
+    def attempt(target: str):
+        limiter.wait()
+        return fetch_one(target)
+
+    def task(target: str):
+        return call_with_retry(lambda: attempt(target), retries=retries, description=f"{service} '{target}'")
+
+    results: Dict[int, AstropyTable] = {}
+    failures: List[Tuple[str, str]] = []
+    with Progress(
+        TextColumn("[cyan]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        ThroughputColumn(),
+        TimeElapsedColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        progress_task = progress.add_task(description or service, total=len(targets))
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = {executor.submit(task, target): i for i, target in enumerate(targets)}
+            for future in as_completed(futures):
+                i = futures[future]
+                target = targets[i]
+                try:
+                    table = future.result()
+                    if table is not None and len(table) > 0:
+                        table = tag_table(table, target) if tag else table
+                        if merge:
+                            results[i] = table
+                        if on_result:
+                            on_result(target, table)
+                    elif tag:
+                        failures.append((target, "no results"))
+                except Exception as e:
+                    failures.append((target, f"{type(e).__name__}: {e}"))
+                progress.advance(progress_task)
+
+    merged = merge_tables([results[i] for i in sorted(results)]) if merge else None
+    return merged, failures
+
+
+def report_batch_failures(failures: List[Tuple[str, str]], total: int):
+    import builtins
+    _ = builtins._
+    if failures:
+        console.print(_("[yellow]No results for {count} target(s):[/yellow]").format(count=len(failures)))
+    for target, message in failures:
+        console.print(_("[yellow]  {target}: {error}[/yellow]").format(target=target, error=message))
+    console.print(_("[cyan]Batch finished: {ok} of {total} target(s) returned results.[/cyan]").format(ok=total - len(failures), total=total))
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from astroquery_cli import config
+from astroquery_cli.debug import debug
+
+
+def _normalize_value(value: Any) -> Any:
+    """
+    Turns query parameters into a stable, JSON-serializable form so that
+    equivalent requests map to the same cache key.
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize_value(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(v) for v in value]
+    if isinstance(value, set):
+        return sorted(_normalize_value(v) for v in value)
+    # SkyCoord: normalize to ICRS degrees with a fixed precision
+    if hasattr(value, "icrs") and hasattr(value, "isscalar"):
+        icrs = value.icrs
+        if value.isscalar:
+            return {"ra": round(float(icrs.ra.deg), 8), "dec": round(float(icrs.dec.deg), 8)}
+        return {"ra": [round(float(v), 8) for v in icrs.ra.deg], "dec": [round(float(v), 8) for v in icrs.dec.deg]}
+    # Quantity / Angle: keep value and unit
+    if hasattr(value, "value") and hasattr(value, "unit"):
+        return {"value": _normalize_value(value.value.tolist() if hasattr(value.value, "tolist") else value.value), "unit": str(value.unit)}
+    if hasattr(value, "value"):  # Enum
+        return _normalize_value(value.value)
+    return str(value)
+
+
+def make_cache_key(service: str, endpoint: str, params: Dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"service": service, "endpoint": endpoint, "params": _normalize_value(params)},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class QueryCache:
+    """
+    Content-addressed on-disk cache for query results.
+
+    Entries are pickled (binary, preserves astropy tables with units and meta)
+    under <cache_dir>/<service>/<key>.pkl. Expiry uses the creation time stored
+    in the entry; the file mtime is bumped on every hit and drives LRU eviction
+    once the total size exceeds the configured cap.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_size_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else config.get_cache_dir()
+        self.max_size_bytes = max_size_bytes if max_size_bytes is not None else config.get_cache_max_size_bytes()
+
+    def _entry_path(self, service: str, key: str) -> Path:
+        return self.cache_dir / service / f"{key}.pkl"
+
+    def get(self, service: str, key: str, ttl: int) -> Any:
+        path = self._entry_path(service, key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except Exception as e:
+            debug(f"Discarding unreadable cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        if ttl >= 0 and time.time() - entry.get("created", 0) > ttl:
+            debug(f"Cache entry expired: {path}")
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def put(self, service: str, key: str, value: Any, endpoint: str = ""):
+        path = self._entry_path(service, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"created": time.time(), "service": service, "endpoint": endpoint, "value": value}
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Removes least recently used entries until the cache fits the size cap."""
+        if self.max_size_bytes <= 0 or not self.cache_dir.exists():
+            return
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.pkl"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_size_bytes:
+            return
+        entries.sort()
+        for _mtime, size, path in entries:
+            if total <= self.max_size_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            debug(f"Evicted cache entry: {path}")
+
+    def clear(self, service: Optional[str] = None) -> int:
+        target = self.cache_dir / service if service else self.cache_dir
+        removed = 0
+        for path in target.glob("**/*.pkl"):
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+_query_cache: Optional[QueryCache] = None
+
+
+def get_query_cache() -> QueryCache:
+    global _query_cache
+    if _query_cache is None:
+        _query_cache = QueryCache()
+    return _query_cache
+
+
+def cached_query(
+    service: str,
+    endpoint: str,
+    params: Dict[str, Any],
+    fetch: Callable[[], Any],
+    no_cache: bool = False,
+    refresh: bool = False,
+) -> Any:
+    """
+    Returns the cached result for (service, endpoint, params) if present and fresh,
+    otherwise calls `fetch()` and stores its result.
+
+    `no_cache` bypasses the cache entirely; `refresh` skips the lookup but still
+    stores the new result.
+    """
+    if no_cache or not config.get_cache_enabled():
+        return fetch()
+
+    cache = get_query_cache()
+    key = make_cache_key(service, endpoint, params)
+    ttl = config.get_cache_ttl(service)
+
+    if not refresh:
+        value = cache.get(service, key, ttl)
+        if value is not None:
+            debug(f"Cache hit for {service}.{endpoint} ({key[:12]})")
+            return value
+        debug(f"Cache miss for {service}.{endpoint} ({key[:12]})")
+
+    value = fetch()
+    if value is not None:
+        try:
+            cache.put(service, key, value, endpoint=endpoint)
+        except Exception as e:
+            debug(f"Could not write cache entry for {service}.{endpoint}: {e}")
+    return value
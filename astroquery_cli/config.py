@@ -33,6 +33,49 @@ def load_config():
             f.write("# AQC_DEBUG = true\n")
             f.write("# AQC_VERBOSE = true\n")
             f.write("# AQC_LANG = en\n")
+            f.write("\n[Cache]\n")
+            f.write("# enabled = true\n")
+            f.write("# max_size_mb = 512\n")
+            f.write("# default_ttl = 86400\n")
+            f.write("# Per-service TTLs in seconds (-1 never expires), e.g.:\n")
+            f.write("# simbad_ttl = 604800\n")
+            f.write("# gaia_ttl = 2592000\n")
+            f.write("\n[Batch]\n")
+            f.write("# concurrency = 8\n")
+            f.write("# retries = 3\n")
+            f.write("# Per-service rate limits in requests per second (0 disables), e.g.:\n")
+            f.write("# simbad_rate = 5\n")
+            f.write("\n[Network]\n")
+            f.write("# Shared HTTP connection pool used by all services\n")
+            f.write("# pool_connections = 16\n")
+            f.write("# pool_maxsize = 16\n")
+            f.write("# pool_block = false\n")
+            f.write("# connect_retries = 2\n")
+            f.write("\n[Names]\n")
+            f.write("# Object name -> position cache shared by all commands (seconds, -1 never expires)\n")
+            f.write("# ttl = 2592000\n")
+            f.write("# Use only cached names, never contact Sesame (or set AQC_OFFLINE=1)\n")
+            f.write("# offline = false\n")
+            f.write("\n[VizieR]\n")
+            f.write("# Positions per upload for 'vizier xmatch'; larger lists are split and sent concurrently\n")
+            f.write("# xmatch_chunk_rows = 20000\n")
+            f.write("# Suggest 'aqc vizier index update' once the local catalog index is older than this (days)\n")
+            f.write("# index_max_age_days = 30\n")
+            f.write("\n[Gaia]\n")
+            f.write("# Cone searches wider than this radius (deg) are split into partitions\n")
+            f.write("# partition_radius_deg = 0.5\n")
+            f.write("# max_partitions = 32\n")
+            f.write("\n[Horizons]\n")
+            f.write("# Range queries are answered from the local ephemeris store when the relative\n")
+            f.write("# interpolation error estimate stays below this; otherwise Horizons is queried\n")
+            f.write("# interp_tolerance = 1e-9\n")
+            f.write("# interp_degree = 7\n")
+            f.write("\n[HEASARC]\n")
+            f.write("# Seconds before the stored HEASARC catalog list is fetched again (-1 never expires)\n")
+            f.write("# catalog_list_ttl = 604800\n")
+            f.write("\n[Output]\n")
+            f.write("# Rows per chunk when streaming large tables to disk or stdout\n")
+            f.write("# chunk_rows = 50000\n")
         if is_debug or is_verbose:
             print(f"Created default config file: {CONFIG_FILE_PATH}. Please edit it to set your environment variables.")
 
@@ -74,3 +117,200 @@ def get_language():
     if _config is None:
         load_config() # Ensure config is loaded
     return _config.get('Environment', 'aqc_lang', fallback=None)
+
+# Query result cache settings ([Cache] section of config.ini)
+DEFAULT_CACHE_TTL = 86400
+DEFAULT_CACHE_MAX_SIZE_MB = 512
+
+def _get_config():
+    global _config
+    if _config is None:
+        load_config() # Ensure config is loaded
+    return _config
+
+def get_cache_dir() -> Path:
+    cache_dir = _get_config().get('Cache', 'cache_dir', fallback=None)
+    return Path(cache_dir).expanduser() if cache_dir else Path.home() / ".aqc" / "cache"
+
+def get_jobs_dir() -> Path:
+    jobs_dir = _get_config().get('Jobs', 'jobs_dir', fallback=None)
+    return Path(jobs_dir).expanduser() if jobs_dir else Path.home() / ".aqc" / "jobs"
+
+def get_cache_enabled() -> bool:
+    if os.environ.get("AQC_NO_CACHE", "").lower() in ("1", "true", "yes"):
+        return False
+    try:
+        return _get_config().getboolean('Cache', 'enabled', fallback=True)
+    except ValueError:
+        return True
+
+def get_cache_ttl(service: str) -> int:
+    cfg = _get_config()
+    try:
+        default_ttl = cfg.getint('Cache', 'default_ttl', fallback=DEFAULT_CACHE_TTL)
+        return cfg.getint('Cache', f'{service.lower()}_ttl', fallback=default_ttl)
+    except ValueError:
+        return DEFAULT_CACHE_TTL
+
+def get_cache_max_size_bytes() -> int:
+    try:
+        size_mb = _get_config().getfloat('Cache', 'max_size_mb', fallback=DEFAULT_CACHE_MAX_SIZE_MB)
+    except ValueError:
+        size_mb = DEFAULT_CACHE_MAX_SIZE_MB
+    return int(size_mb * 1024 * 1024)
+
+# Batch mode settings ([Batch] section of config.ini)
+DEFAULT_BATCH_CONCURRENCY = 8
+DEFAULT_BATCH_RETRIES = 3
+# Conservative defaults so batch runs stay within the services' usage policies
+DEFAULT_BATCH_RATE_LIMITS = {
+    "simbad": 5.0,
+    "ned": 2.0,
+}
+
+# Services whose archives allow fewer parallel jobs per user
+DEFAULT_BATCH_CONCURRENCY_BY_SERVICE = {
+    "gaia": 4,
+    "ads": 4,
+    # CDS bans clients sending too many cross-match jobs in parallel
+    "vizier_xmatch": 2,
+    "vizier_catalogs": 6,
+    "esasky": 6,
+    "mast": 4,
+    "mast_download": 4,
+    # JPL asks batch users to keep parallel Horizons requests low
+    "horizons": 4,
+    "sbdb": 8,
+}
+
+def get_batch_concurrency(service: str) -> int:
+    cfg = _get_config()
+    try:
+        default = cfg.getint('Batch', 'concurrency', fallback=DEFAULT_BATCH_CONCURRENCY_BY_SERVICE.get(service.lower(), DEFAULT_BATCH_CONCURRENCY))
+        return max(1, cfg.getint('Batch', f'{service.lower()}_concurrency', fallback=default))
+    except ValueError:
+        return DEFAULT_BATCH_CONCURRENCY
+
+def get_batch_rate_limit(service: str) -> float:
+    cfg = _get_config()
+    fallback = DEFAULT_BATCH_RATE_LIMITS.get(service.lower(), 0.0)
+    try:
+        return cfg.getfloat('Batch', f'{service.lower()}_rate', fallback=fallback)
+    except ValueError:
+        return fallback
+
+def get_batch_retries(service: str) -> int:
+    cfg = _get_config()
+    try:
+        default = cfg.getint('Batch', 'retries', fallback=DEFAULT_BATCH_RETRIES)
+        return max(0, cfg.getint('Batch', f'{service.lower()}_retries', fallback=default))
+    except ValueError:
+        return DEFAULT_BATCH_RETRIES
+
+# Shared HTTP pool settings ([Network] section of config.ini)
+DEFAULT_HTTP_POOL_CONNECTIONS = 16
+DEFAULT_HTTP_CONNECT_RETRIES = 2
+
+def get_http_pool_settings():
+    """Returns (pool_connections, pool_maxsize, pool_block) for the shared HTTP adapter."""
+    cfg = _get_config()
+    # Keep at least one pooled connection per batch worker so none are discarded
+    default_maxsize = max(DEFAULT_HTTP_POOL_CONNECTIONS, get_batch_concurrency("default"))
+    try:
+        pool_connections = max(1, cfg.getint('Network', 'pool_connections', fallback=DEFAULT_HTTP_POOL_CONNECTIONS))
+        pool_maxsize = max(1, cfg.getint('Network', 'pool_maxsize', fallback=default_maxsize))
+        pool_block = cfg.getboolean('Network', 'pool_block', fallback=False)
+    except ValueError:
+        return DEFAULT_HTTP_POOL_CONNECTIONS, default_maxsize, False
+    return pool_connections, pool_maxsize, pool_block
+
+def get_http_connect_retries() -> int:
+    try:
+        return max(0, _get_config().getint('Network', 'connect_retries', fallback=DEFAULT_HTTP_CONNECT_RETRIES))
+    except ValueError:
+        return DEFAULT_HTTP_CONNECT_RETRIES
+
+# Output settings ([Output] section of config.ini)
+DEFAULT_STREAM_CHUNK_ROWS = 50000
+
+def get_stream_chunk_rows() -> int:
+    try:
+        return max(1, _get_config().getint('Output', 'chunk_rows', fallback=DEFAULT_STREAM_CHUNK_ROWS))
+    except ValueError:
+        return DEFAULT_STREAM_CHUNK_ROWS
+
+# Gaia cone partitioning ([Gaia] section of config.ini)
+DEFAULT_GAIA_PARTITION_RADIUS_DEG = 0.5
+DEFAULT_GAIA_MAX_PARTITIONS = 32
+
+def get_gaia_partition_settings():
+    """Returns (partition_radius_deg, max_partitions) for splitting wide Gaia cone searches."""
+    cfg = _get_config()
+    try:
+        radius = cfg.getfloat('Gaia', 'partition_radius_deg', fallback=DEFAULT_GAIA_PARTITION_RADIUS_DEG)
+        max_partitions = max(1, cfg.getint('Gaia', 'max_partitions', fallback=DEFAULT_GAIA_MAX_PARTITIONS))
+    except ValueError:
+        return DEFAULT_GAIA_PARTITION_RADIUS_DEG, DEFAULT_GAIA_MAX_PARTITIONS
+    return radius, max_partitions
+
+# Upload cross-match ([VizieR] section of config.ini)
+DEFAULT_XMATCH_CHUNK_ROWS = 20000
+
+def get_xmatch_chunk_rows() -> int:
+    """Positions per upload when cross-matching a local list against a VizieR catalog."""
+    cfg = _get_config()
+    try:
+        return max(1, cfg.getint('VizieR', 'xmatch_chunk_rows', fallback=DEFAULT_XMATCH_CHUNK_ROWS))
+    except ValueError:
+        return DEFAULT_XMATCH_CHUNK_ROWS
+
+# Local VizieR catalog metadata index
+DEFAULT_VIZIER_INDEX_MAX_AGE_DAYS = 30
+
+def get_vizier_index_max_age_days() -> float:
+    try:
+        return _get_config().getfloat('VizieR', 'index_max_age_days', fallback=DEFAULT_VIZIER_INDEX_MAX_AGE_DAYS)
+    except ValueError:
+        return DEFAULT_VIZIER_INDEX_MAX_AGE_DAYS
+
+# Object name resolution cache ([Names] section of config.ini)
+DEFAULT_NAME_CACHE_TTL = 30 * 86400
+
+def get_name_cache_ttl() -> int:
+    try:
+        return _get_config().getint('Names', 'ttl', fallback=DEFAULT_NAME_CACHE_TTL)
+    except ValueError:
+        return DEFAULT_NAME_CACHE_TTL
+
+def get_offline_mode() -> bool:
+    if os.environ.get("AQC_OFFLINE", "").lower() in ("1", "true", "yes"):
+        return True
+    try:
+        return _get_config().getboolean('Names', 'offline', fallback=False)
+    except ValueError:
+        return False
+
+# Stored HEASARC catalog list ([HEASARC] section of config.ini)
+DEFAULT_HEASARC_CATALOG_TTL = 7 * 86400
+
+def get_heasarc_catalog_ttl() -> int:
+    try:
+        return _get_config().getint('HEASARC', 'catalog_list_ttl', fallback=DEFAULT_HEASARC_CATALOG_TTL)
+    except ValueError:
+        return DEFAULT_HEASARC_CATALOG_TTL
+
+# Local Horizons ephemeris store ([Horizons] section of config.ini)
+DEFAULT_HORIZONS_INTERP_TOLERANCE = 1e-9
+DEFAULT_HORIZONS_INTERP_DEGREE = 7
+
+def get_horizons_interp_tolerance() -> float:
+    try:
+        return max(0.0, _get_config().getfloat('Horizons', 'interp_tolerance', fallback=DEFAULT_HORIZONS_INTERP_TOLERANCE))
+    except ValueError:
+        return DEFAULT_HORIZONS_INTERP_TOLERANCE
+
+def get_horizons_interp_degree() -> int:
+    try:
+        return min(15, max(3, _get_config().getint('Horizons', 'interp_degree', fallback=DEFAULT_HORIZONS_INTERP_DEGREE)))
+    except ValueError:
+        return DEFAULT_HORIZONS_INTERP_DEGREE
@@ -0,0 +1,197 @@
+import sys
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import astropy.units as u
+from astropy.coordinates import SkyCoord
+from astropy.table import Column, MaskedColumn, Table as AstropyTable, hstack
+
+from astroquery_cli.debug import debug
+
+# Column names tried (case-insensitively, in order) when no RA/Dec column is given
+RA_COLUMN_CANDIDATES = ("ra", "ra_icrs", "raj2000", "_raj2000", "ra_deg", "radeg", "s_ra", "ra_d", "alpha", "ra_j2000")
+DEC_COLUMN_CANDIDATES = ("dec", "de", "dec_icrs", "de_icrs", "dej2000", "_dej2000", "decj2000", "dec_deg", "de_deg", "decdeg", "dedeg", "s_dec", "dec_d", "delta", "dec_j2000", "de_j2000")
+COORD_COLUMN_CANDIDATES = ("coord", "coords", "coordinates", "position", "target", "target_input")
+
+MATCH_MODES = ("best", "all")
+
+SEPARATION_COLUMN = "separation_arcsec"
+
+
+def read_local_table(path: str, table_format: Optional[str] = None) -> AstropyTable:
+    """Reads a table written by any aqc command (or by hand); '-' reads CSV/ECSV from stdin."""
+    if path == "-":
+        return AstropyTable.read(sys.stdin.read(), format=table_format or "ascii")
+    kwargs = {"format": table_format} if table_format else {}
+    if not table_format and path.lower().endswith((".parquet", ".pq")):
+        kwargs["format"] = "parquet"
+    return AstropyTable.read(path, **kwargs)
+
+
+def find_column(table: AstropyTable, candidates, explicit: Optional[str] = None) -> Optional[str]:
+    if explicit:
+        if explicit in table.colnames:
+            return explicit
+        lowered = {name.lower(): name for name in table.colnames}
+        if explicit.lower() in lowered:
+            return lowered[explicit.lower()]
+        raise KeyError(explicit)
+    lowered = {name.lower(): name for name in table.colnames}
+    for candidate in candidates:
+        if candidate in lowered:
+            return lowered[candidate]
+    return None
+
+
+def _angle_values(col, default_unit) -> np.ndarray:
+    """Numeric column -> float ndarray in degrees; masked entries become NaN."""
+    unit = getattr(col, "unit", None) or default_unit
+    data = np.ma.filled(np.ma.asarray(col, dtype=float), np.nan)
+    return (data * u.Unit(unit)).to_value(u.deg)
+
+
+def table_skycoord(table: AstropyTable, ra_col: Optional[str] = None, dec_col: Optional[str] = None,
+                   coord_col: Optional[str] = None,
+                   parse_many: Optional[Callable[[List[str]], Tuple[SkyCoord, np.ndarray]]] = None) -> Tuple[SkyCoord, np.ndarray, str]:
+    """
+    Builds one array-valued SkyCoord for the rows of `table`.
+
+    Numeric RA/Dec columns are used directly (degrees unless the column has a
+    unit). Text columns (sexagesimal RA/Dec, or a single coordinate column)
+    are parsed in one go with `parse_many` (utils.parse_coordinates_batch),
+    which returns (coords, failed). Returns (coords, valid mask, description).
+    """
+    ra_name = dec_name = None
+    if not coord_col:
+        ra_name = find_column(table, RA_COLUMN_CANDIDATES, ra_col)
+        dec_name = find_column(table, DEC_COLUMN_CANDIDATES, dec_col)
+    if ra_name and dec_name:
+        ra_c, dec_c = table[ra_name], table[dec_name]
+        if ra_c.dtype.kind in "iuf" and dec_c.dtype.kind in "iuf":
+            ra = _angle_values(ra_c, u.deg)
+            dec = _angle_values(dec_c, u.deg)
+            valid = np.isfinite(ra) & np.isfinite(dec)
+            ra[~valid] = 0.0
+            dec[~valid] = 0.0
+            return SkyCoord(ra=ra * u.deg, dec=dec * u.deg, frame="icrs"), valid, f"{ra_name}/{dec_name}"
+        strings = [f"{r} {d}" for r, d in zip(ra_c.astype(str), dec_c.astype(str))]
+        described = f"{ra_name}/{dec_name}"
+    else:
+        coord_name = find_column(table, COORD_COLUMN_CANDIDATES, coord_col)
+        if coord_name is None:
+            raise KeyError("no RA/Dec or coordinate column found")
+        strings = [str(value) for value in table[coord_name]]
+        described = coord_name
+    coords, failed = parse_many(strings)
+    return coords, ~failed, described
+
+
+def crossmatch(left: SkyCoord, right: SkyCoord, radius: u.Quantity, mode: str = "best",
+               left_valid: Optional[np.ndarray] = None, right_valid: Optional[np.ndarray] = None):
+    """
+    Matches positions on the sphere using astropy's KD-tree index (no pairwise loops).
+
+    mode 'best': nearest right-hand source for each left row within `radius`.
+    mode 'all':  every pair closer than `radius`.
+    Returns (left_idx, right_idx, separation) for the matched pairs, with indices
+    into the original (unfiltered) arrays.
+    """
+    try:
+        import scipy.spatial  # noqa: F401  (astropy builds its KD-tree with scipy)
+    except ImportError as e:
+        raise ImportError("Cross-matching requires the 'scipy' package (pip install scipy).") from e
+    left_rows = np.flatnonzero(left_valid) if left_valid is not None else np.arange(len(left))
+    right_rows = np.flatnonzero(right_valid) if right_valid is not None else np.arange(len(right))
+    empty = (np.array([], dtype=int), np.array([], dtype=int), np.array([]) * u.arcsec)
+    if len(left_rows) == 0 or len(right_rows) == 0:
+        return empty
+    left_c, right_c = left[left_rows], right[right_rows]
+    debug(f"Cross-matching {len(left_c)} x {len(right_c)} positions (mode={mode}, radius={radius})")
+    if mode == "best":
+        idx, sep, _ = left_c.match_to_catalog_sky(right_c)
+        keep = sep <= radius
+        return left_rows[keep], right_rows[idx[keep]], sep[keep]
+    if mode == "all":
+        idx_right, idx_left, sep, _ = left_c.search_around_sky(right_c, radius)
+        order = np.lexsort((sep.value, idx_left))
+        return left_rows[idx_left[order]], right_rows[idx_right[order]], sep[order]
+    raise ValueError(f"Unknown match mode '{mode}'")
+
+
+def _as_masked(table: AstropyTable) -> AstropyTable:
+    return AstropyTable(table, masked=True, copy=False)
+
+
+def _masked_like(table: AstropyTable, rows: int) -> AstropyTable:
+    """`rows` fully masked rows with the columns (dtype, shape, unit) of `table`."""
+    return AstropyTable([
+        MaskedColumn(np.zeros((rows,) + col.shape[1:], dtype=col.dtype), name=name, mask=True,
+                     unit=col.unit, description=col.description, format=col.format)
+        for name, col in table.columns.items()
+    ])
+
+
+def join_matches(left: AstropyTable, right: AstropyTable, left_idx: np.ndarray, right_idx: np.ndarray,
+                 separation: u.Quantity, keep_unmatched: bool = False,
+                 names: Tuple[str, str] = ("1", "2")) -> AstropyTable:
+    """
+    Joins matched rows side by side with a separation column. Clashing column
+    names get '_1'/'_2' suffixes. With `keep_unmatched`, left rows without a
+    match are kept with masked right-hand columns.
+    """
+    if keep_unmatched:
+        unmatched = np.setdiff1d(np.arange(len(left)), left_idx)
+        all_left = np.concatenate([left_idx, unmatched])
+        order = np.argsort(all_left, kind="stable")
+        left_part = left[all_left[order]]
+        missing = np.concatenate([np.zeros(len(right_idx), dtype=bool), np.ones(len(unmatched), dtype=bool)])[order]
+        if len(right) == 0:
+            # Nothing to index into: every left row is unmatched
+            right_part = _masked_like(right, len(all_left))
+        else:
+            right_part = _as_masked(right[np.concatenate([right_idx, np.zeros(len(unmatched), dtype=int)])[order]])
+            for name in right_part.colnames:
+                right_part[name].mask |= missing
+        sep_values = np.concatenate([separation.to_value(u.arcsec), np.zeros(len(unmatched))])[order]
+        sep_col = MaskedColumn(sep_values, name=SEPARATION_COLUMN, unit=u.arcsec, mask=missing)
+    else:
+        left_part = left[left_idx]
+        right_part = right[right_idx]
+        sep_col = Column(separation.to_value(u.arcsec), name=SEPARATION_COLUMN, unit=u.arcsec)
+    result = hstack([left_part, right_part], table_names=list(names), uniq_col_name="{col_name}_{table_name}", join_type="exact")
+    result.add_column(sep_col)
+    return result
+
+
+# Columns of the position table sent to server-side cross-match services
+UPLOAD_ROW_COLUMN = "aqc_row"
+UPLOAD_RA_COLUMN = "aqc_ra"
+UPLOAD_DEC_COLUMN = "aqc_dec"
+
+
+def upload_chunks(coords: SkyCoord, valid: np.ndarray, chunk_rows: int) -> List[AstropyTable]:
+    """
+    Splits the valid positions into small (row index, RA, Dec) tables for upload.
+    The row index maps server results back to the rows of the local table.
+    """
+    rows = np.flatnonzero(valid)
+    chunk_rows = max(1, chunk_rows)
+    chunks = []
+    for start in range(0, len(rows), chunk_rows):
+        part = rows[start:start + chunk_rows]
+        chunks.append(AstropyTable({
+            UPLOAD_ROW_COLUMN: part,
+            UPLOAD_RA_COLUMN: np.round(coords.ra.deg[part], 9),
+            UPLOAD_DEC_COLUMN: np.round(coords.dec.deg[part], 9),
+        }))
+    return chunks
+
+
+def nearest_per_row(table: AstropyTable, row_col: str, dist_col: str) -> AstropyTable:
+    """Keeps the closest match for each uploaded row."""
+    if len(table) == 0:
+        return table
+    order = np.lexsort((np.asarray(table[dist_col], dtype=float), np.asarray(table[row_col])))
+    table = table[order]
+    _, first = np.unique(np.asarray(table[row_col]), return_index=True)
+    return table[first]
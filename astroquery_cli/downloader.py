@@ -0,0 +1,243 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rich.progress import BarColumn, DownloadColumn, Progress, TextColumn, TimeRemainingColumn, TransferSpeedColumn
+
+from astroquery_cli.batch import call_with_retry
+from astroquery_cli.debug import debug
+from astroquery_cli.utils import console
+
+# Bytes read per iteration of a download
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+MANIFEST_NAME = "aqc_manifest.json"
+
+PART_SUFFIX = ".part"
+
+_RATE_RE = re.compile(r"^\s*([\d.]+)\s*([kmgt]?)(i?b)?(/s)?\s*$", re.IGNORECASE)
+_RATE_UNITS = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+
+
+def parse_byte_rate(text: Optional[str]) -> Optional[float]:
+    """'20M', '500KB/s', '1.5g' -> bytes per second; None or '0' disables the cap."""
+    if not text:
+        return None
+    match = _RATE_RE.match(text)
+    if not match:
+        raise ValueError(f"Invalid rate '{text}'; use e.g. '20M', '500K' or '1.5G' (bytes per second).")
+    rate = float(match.group(1)) * _RATE_UNITS[match.group(2).lower()]
+    return rate or None
+
+
+class BandwidthLimiter:
+    """Token bucket shared by all download threads; `consume(n)` blocks to keep the total rate under the cap."""
+
+    def __init__(self, bytes_per_second: Optional[float]):
+        self.rate = bytes_per_second
+        self._lock = threading.Lock()
+        self._allowance = bytes_per_second or 0.0
+        self._last = time.monotonic()
+
+    def consume(self, nbytes: int):
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(self.rate, self._allowance + (now - self._last) * self.rate)
+            self._last = now
+            self._allowance -= nbytes
+            delay = -self._allowance / self.rate if self._allowance < 0 else 0.0
+        if delay > 0:
+            time.sleep(delay)
+
+
+class DownloadItem:
+    def __init__(self, url: str, path: str, size: Optional[int] = None, checksum: Optional[Tuple[str, str]] = None):
+        self.url = url
+        self.path = path
+        self.size = size
+        # (hashlib algorithm name, hex digest) when the product table provides one
+        self.checksum = checksum
+
+
+class Manifest:
+    """
+    JSON record (<download_dir>/aqc_manifest.json) of every file fetched into
+    a download directory: URL, size, checksum, status and time. Saved after
+    each file, so an interrupted run can be resumed and audited.
+    """
+
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries: Dict[str, dict] = json.load(f)
+        except FileNotFoundError:
+            self.entries = {}
+        except (OSError, ValueError) as e:
+            debug(f"Ignoring unreadable download manifest {self.path}: {e}")
+            self.entries = {}
+
+    def record(self, key: str, **entry):
+        with self._lock:
+            self.entries[key] = dict(entry, recorded=time.time())
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=1)
+            os.replace(tmp_path, self.path)
+
+
+def _file_digest(path: str, algorithm: str, hasher=None):
+    hasher = hasher or hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(DOWNLOAD_CHUNK_BYTES), b""):
+            hasher.update(block)
+    return hasher
+
+
+def is_complete(item: DownloadItem) -> bool:
+    """True if the file exists with the expected size (and checksum, when known)."""
+    if not os.path.isfile(item.path):
+        return False
+    if item.size is not None and os.path.getsize(item.path) != item.size:
+        return False
+    if item.checksum:
+        algorithm, expected = item.checksum
+        return _file_digest(item.path, algorithm).hexdigest().lower() == expected.lower()
+    return item.size is not None
+
+
+def download_one(item: DownloadItem, session, limiter: BandwidthLimiter, on_bytes: Callable[[int], None],
+                 timeout: float = 120) -> Tuple[str, int]:
+    """
+    Downloads one file, resuming a previous partial download (<path>.part)
+    with an HTTP Range request. Verifies size and checksum before moving the
+    file into place. Returns (status, bytes transferred in this call).
+    """
+    os.makedirs(os.path.dirname(item.path) or ".", exist_ok=True)
+    part = item.path + PART_SUFFIX
+    offset = os.path.getsize(part) if os.path.exists(part) else 0
+    if item.size is not None and offset > item.size:
+        os.remove(part)
+        offset = 0
+    algorithm = item.checksum[0] if item.checksum else "md5"
+    hasher = _file_digest(part, algorithm) if offset else hashlib.new(algorithm)
+
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    transferred = 0
+    with session.get(item.url, headers=headers, stream=True, timeout=timeout) as response:
+        if offset and response.status_code == 416:
+            # The range starts at or past the end: the .part may already be complete
+            total = response.headers.get("Content-Range", "").rpartition("/")[2]
+            expected = item.size if item.size is not None else (int(total) if total.isdigit() else None)
+            response.close()
+            if expected != offset:
+                debug(f"Range not satisfiable for {item.url}; discarding partial file")
+                os.remove(part)
+                return download_one(item, session, limiter, on_bytes, timeout)
+        else:
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                # Server ignored the range: start over
+                debug(f"No range support for {item.url}; restarting download")
+                offset = 0
+                hasher = hashlib.new(algorithm)
+            header_md5 = response.headers.get("Content-MD5") if response.status_code == 200 else None
+            with open(part, "ab" if offset else "wb") as f:
+                for block in response.iter_content(DOWNLOAD_CHUNK_BYTES):
+                    if not block:
+                        continue
+                    f.write(block)
+                    hasher.update(block)
+                    transferred += len(block)
+                    on_bytes(len(block))
+                    limiter.consume(len(block))
+            if header_md5 and algorithm == "md5" and base64.b64encode(hasher.digest()).decode() != header_md5:
+                os.remove(part)
+                raise IOError(f"Content-MD5 mismatch for {os.path.basename(item.path)}")
+
+    size = os.path.getsize(part)
+    if item.size is not None and size != item.size:
+        if size > item.size:
+            os.remove(part)
+        raise IOError(f"{os.path.basename(item.path)}: got {size} bytes, expected {item.size}")
+    if item.checksum and hasher.hexdigest().lower() != item.checksum[1].lower():
+        os.remove(part)
+        raise IOError(f"{item.checksum[0]} checksum mismatch for {os.path.basename(item.path)}")
+    os.replace(part, item.path)
+    return ("resumed" if offset else "downloaded"), transferred
+
+
+def download_all(items: List[DownloadItem], session, manifest: Manifest, concurrency: int = 4,
+                 max_rate: Optional[float] = None, retries: int = 0, overwrite: bool = False,
+                 manifest_key: Callable[[DownloadItem], str] = lambda item: item.path) -> List[dict]:
+    """
+    Downloads `items` on a thread pool with one shared bandwidth cap, showing
+    byte progress. Files that are already complete are skipped (checked
+    against the expected size/checksum). Returns one result dict per item.
+    """
+    limiter = BandwidthLimiter(max_rate)
+    results: List[dict] = []
+    pending = []
+    for item in items:
+        recorded = manifest.entries.get(manifest_key(item), {})
+        # Without a size or checksum to check against, trust a matching manifest entry
+        unverifiable_but_recorded = (item.size is None and not item.checksum and recorded.get("status") == "complete"
+                                     and os.path.isfile(item.path) and os.path.getsize(item.path) == recorded.get("size"))
+        if not overwrite and (unverifiable_but_recorded or is_complete(item)):
+            results.append({"path": item.path, "status": "skipped", "bytes": 0, "message": ""})
+            manifest.record(manifest_key(item), url=item.url, size=os.path.getsize(item.path), status="complete",
+                            checksum=item.checksum[1] if item.checksum else None)
+        else:
+            if overwrite and os.path.exists(item.path + PART_SUFFIX):
+                os.remove(item.path + PART_SUFFIX)
+            pending.append(item)
+    if not pending:
+        return results
+
+    known_total = sum(item.size for item in pending if item.size is not None)
+    debug(f"Downloading {len(pending)} file(s), {known_total} bytes known, concurrency={concurrency}, max_rate={max_rate}")
+    with Progress(
+        TextColumn("[cyan]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        TimeRemainingColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task(f"0/{len(pending)} file(s)", total=known_total or None)
+        done = 0
+
+        def fetch(item: DownloadItem):
+            return call_with_retry(
+                lambda: download_one(item, session, limiter, lambda n: progress.advance(task, n)),
+                retries=retries, description=f"download {os.path.basename(item.path)}",
+            )
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = {executor.submit(fetch, item): item for item in pending}
+            for future in as_completed(futures):
+                item = futures[future]
+                done += 1
+                progress.update(task, description=f"{done}/{len(pending)} file(s)")
+                try:
+                    status, transferred = future.result()
+                    results.append({"path": item.path, "status": status, "bytes": transferred, "message": ""})
+                    manifest.record(manifest_key(item), url=item.url, size=os.path.getsize(item.path), status="complete",
+                                    checksum=item.checksum[1] if item.checksum else None)
+                except Exception as e:
+                    results.append({"path": item.path, "status": "failed", "bytes": 0, "message": f"{type(e).__name__}: {e}"})
+                    manifest.record(manifest_key(item), url=item.url, size=item.size, status="failed", message=str(e))
+                    console.print(f"[bold red]{os.path.basename(item.path)}: {e}[/bold red]")
+    return results
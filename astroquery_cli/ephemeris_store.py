@@ -0,0 +1,328 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from astropy.table import MaskedColumn, Table as AstropyTable
+from astropy.time import Time
+
+from astroquery_cli import config
+from astroquery_cli.debug import debug
+
+# Vector columns interpolated with cubic Hermite from their time derivatives (per day)
+_HERMITE_PAIRS = {"x": "vx", "y": "vy", "z": "vz"}
+
+# Epochs per block when evaluating the interpolation stencils (bounds temporary arrays)
+_EVAL_BLOCK = 4096
+
+
+def epoch_grid(start_jd: float, stop_jd: float, step_days: float) -> np.ndarray:
+    count = int((stop_jd - start_jd) / step_days + 1e-6) + 1
+    return start_jd + np.arange(count) * step_days
+
+
+def _merge_intervals(intervals: List[List[float]]) -> List[List[float]]:
+    merged: List[List[float]] = []
+    for start, stop in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1e-9:
+            merged[-1][1] = max(merged[-1][1], stop)
+        else:
+            merged.append([start, stop])
+    return merged
+
+
+def _lagrange_weights(nodes: np.ndarray, epochs: np.ndarray) -> np.ndarray:
+    """
+    Barycentric Lagrange weights (one row per epoch) of the polynomial through
+    each row of `nodes`, evaluated at the matching epoch. Epochs that fall on
+    a node get that node's unit weight.
+    """
+    lo, span = nodes[:, :1], np.maximum(nodes[:, -1:] - nodes[:, :1], 1e-12)
+    x = (nodes - lo) / span
+    t = (epochs[:, None] - lo) / span
+    k = nodes.shape[1]
+    diff = x[:, :, None] - x[:, None, :]
+    diff[:, np.arange(k), np.arange(k)] = 1.0
+    weights = 1.0 / np.prod(diff, axis=2)
+    d = t - x
+    exact = d == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = weights / d
+    terms = np.where(exact.any(axis=1, keepdims=True), exact.astype(float), terms)
+    return terms / terms.sum(axis=1, keepdims=True)
+
+
+def _time_labels(epochs: np.ndarray, sample: str) -> List[str]:
+    """Horizons-style labels ('2025-Jan-01 00:00', 'A.D. 2025-Jan-01 00:00:00.0000') for epochs between stored nodes."""
+    prefix = "A.D. " if sample.startswith("A.D. ") else ""
+    body = sample[len(prefix):].strip()
+    if not body or not body[:4].isdigit():
+        return list(Time(epochs, format="jd", scale="tdb", precision=3).iso)
+    digits = len(body.rsplit(".", 1)[1]) if "." in body.rsplit(":", 1)[-1] else 0
+    fmt = "%Y-%b-%d %H:%M:%S" if body.count(":") == 2 else "%Y-%b-%d %H:%M"
+    labels = []
+    for label in Time(epochs, format="jd", scale="tdb").strftime(fmt + (".%f" if digits else "")):
+        if digits:
+            label = label[:len(label) - 6 + min(digits, 6)] if len(label.rsplit(".", 1)[1]) >= 6 else label
+        labels.append(prefix + label)
+    return labels
+
+
+class EphemerisSeries:
+    """
+    Stored Horizons samples of one target and query setup (ephemeris type,
+    location, quantities): the JD of every node, the numeric and text
+    columns, and the JD intervals they cover without gaps.
+    """
+
+    def __init__(self, key: str, meta: dict, jd: Optional[np.ndarray] = None, columns: Optional[Dict[str, np.ndarray]] = None,
+                 text_columns: Optional[Dict[str, np.ndarray]] = None):
+        self.key = key
+        self.meta = meta
+        self.jd = jd if jd is not None else np.empty(0)
+        self.columns = columns or {}
+        self.text_columns = text_columns or {}
+
+    @property
+    def coverage(self) -> List[List[float]]:
+        return self.meta.setdefault("coverage", [])
+
+    def missing(self, start_jd: float, stop_jd: float) -> List[Tuple[float, float]]:
+        """Sub-ranges of [start_jd, stop_jd] not covered by stored samples."""
+        gaps, cursor = [], start_jd
+        for lo, hi in self.coverage:
+            if hi < cursor or lo > stop_jd:
+                continue
+            if lo > cursor:
+                gaps.append((cursor, lo))
+            cursor = max(cursor, hi)
+        if cursor < stop_jd:
+            gaps.append((cursor, stop_jd))
+        return gaps
+
+    def covers(self, start_jd: float, stop_jd: float) -> bool:
+        return not self.missing(start_jd, stop_jd)
+
+    def insert(self, table: AstropyTable, replace: bool = False):
+        """Adds the rows of a Horizons result; the covered interval is the span of its epochs."""
+        if table is None or len(table) == 0 or "datetime_jd" not in table.colnames:
+            return
+        jd = np.asarray(table["datetime_jd"], dtype=float)
+        new, new_text = {}, {}
+        for name in table.colnames:
+            column = table[name]
+            if name in ("datetime_jd", "target_input"):
+                continue
+            if column.dtype.kind in "fiu":
+                new[name] = np.ma.filled(np.ma.asarray(column, dtype=float), np.nan)
+                if column.dtype.kind in "iu":
+                    self.meta.setdefault("int_columns", [])
+                    if name not in self.meta["int_columns"]:
+                        self.meta["int_columns"].append(name)
+            elif column.dtype.kind in "USO":
+                new_text[name] = np.asarray(np.ma.filled(np.ma.asarray(column).astype(str), ""), dtype=str)
+            else:
+                continue
+            if column.unit is not None:
+                self.meta.setdefault("units", {})[name] = str(column.unit)
+        self.meta["colnames"] = [n for n in table.colnames if n != "target_input"]
+        if replace:
+            keep = (self.jd < jd.min() - 1e-9) | (self.jd > jd.max() + 1e-9)
+            self.jd = self.jd[keep]
+            self.columns = {k: v[keep] for k, v in self.columns.items()}
+            self.text_columns = {k: v[keep] for k, v in self.text_columns.items()}
+            self.meta["coverage"] = [iv for iv in self.coverage if iv[1] < jd.min() or iv[0] > jd.max()]
+        old_n, new_n = len(self.jd), len(jd)
+
+        def combine(old: dict, added: dict, fill):
+            names = list(dict.fromkeys(list(old) + list(added)))
+            return {n: np.concatenate([old[n] if n in old else np.full(old_n, fill),
+                                       added[n] if n in added else np.full(new_n, fill)]) for n in names}
+
+        merged = combine(self.columns, new, np.nan)
+        merged_text = combine(self.text_columns, new_text, "")
+        all_jd = np.concatenate([self.jd, jd])
+        # Newest sample wins for repeated epochs
+        order = np.argsort(all_jd, kind="stable")
+        all_jd = all_jd[order]
+        last = np.append(np.diff(np.round(all_jd * 86400e3)) != 0, True)
+        self.jd = all_jd[last]
+        self.columns = {n: v[order][last] for n, v in merged.items()}
+        self.text_columns = {n: v[order][last] for n, v in merged_text.items()}
+        self.meta["coverage"] = _merge_intervals(self.coverage + [[float(jd.min()), float(jd.max())]])
+        self.meta["updated"] = time.time()
+
+    def interpolate(self, epochs: np.ndarray, degree: int) -> Tuple[AstropyTable, Dict[str, float]]:
+        """
+        Evaluates the stored series at `epochs`. Epochs that coincide with
+        stored nodes return the stored row unchanged (text columns included).
+        Other epochs are interpolated with a Lagrange polynomial through the
+        `degree` + 1 nearest nodes (cubic Hermite for x/y/z when velocities are
+        stored), evaluated for all epochs at once in blocks; text columns are
+        masked there unless constant. Returns the table and, per column, the
+        largest error estimate relative to the column's scale: the difference
+        from a lower-order fit (or the Hermite value) at off-node epochs.
+        """
+        n = len(self.jd)
+        degree = min(degree, n - 1)
+        if degree < 2:
+            raise ValueError("Too few stored samples to interpolate")
+        epochs = np.asarray(epochs, dtype=float)
+        names = list(self.columns)
+        values = np.column_stack([self.columns[name] for name in names]) if names else np.empty((n, 0))
+        units = self.meta.get("units", {})
+        # Angles are unwrapped before fitting; those given in [0, 360] are wrapped back afterwards
+        angles = [i for i, name in enumerate(names) if units.get(name) == "deg" and np.any(~np.isnan(values[:, i]))]
+        wrapped = [i for i in angles if np.nanmin(values[:, i]) >= 0 and np.nanmax(values[:, i]) <= 360]
+        for i in angles:
+            ok = ~np.isnan(values[:, i])
+            values[ok, i] = np.unwrap(values[ok, i], period=360.0)
+
+        # Missing values (masked in the Horizons table) poison only the stencils that contain them
+        missing = np.isnan(values)
+        values = np.where(missing, 0.0, values)
+
+        pos = np.searchsorted(self.jd, epochs)
+        after, before = np.clip(pos, 0, n - 1), np.clip(pos - 1, 0, n - 1)
+        node = np.where(np.abs(self.jd[before] - epochs) < np.abs(self.jd[after] - epochs), before, after)
+        on_node = np.abs(self.jd[node] - epochs) * 86400e3 < 1.0
+
+        starts = np.clip(pos - (degree + 1) // 2, 0, n - degree - 1)
+        offsets = np.arange(degree + 1)
+        result = np.empty((len(epochs), len(names)))
+        lower = np.empty_like(result)
+        for block in range(0, len(epochs), _EVAL_BLOCK):
+            rows = slice(block, block + _EVAL_BLOCK)
+            idx = starts[rows, None] + offsets
+            weights = _lagrange_weights(self.jd[idx], epochs[rows])
+            result[rows] = np.einsum("ek,ekc->ec", weights, values[idx])
+            inner = idx[:, 1:-1]
+            lower[rows] = np.einsum("ek,ekc->ec", _lagrange_weights(self.jd[inner], epochs[rows]), values[inner])
+            result[rows][missing[idx].any(axis=1)] = np.nan
+
+        for pos_name, vel_name in _HERMITE_PAIRS.items():
+            if pos_name in names and vel_name in names:
+                i, j = names.index(pos_name), names.index(vel_name)
+                k = np.clip(pos - 1, 0, n - 2)
+                t0, t1 = self.jd[k], self.jd[k + 1]
+                h = t1 - t0
+                s = (epochs - t0) / h
+                h00, h10, h01, h11 = 2 * s**3 - 3 * s**2 + 1, s**3 - 2 * s**2 + s, -2 * s**3 + 3 * s**2, s**3 - s**2
+                hermite = h00 * values[k, i] + h10 * h * values[k, j] + h01 * values[k + 1, i] + h11 * h * values[k + 1, j]
+                hermite[missing[k, i] | missing[k + 1, i] | missing[k, j] | missing[k + 1, j]] = np.nan
+                lower[:, i] = result[:, i]
+                result[:, i] = hermite
+
+        errors = {}
+        off_node = ~on_node
+        for i, name in enumerate(names):
+            column_scale = max(float(np.max(np.abs(values[:, i]))), 1e-12)
+            diff = np.abs(result[off_node, i] - lower[off_node, i])
+            errors[name] = float(np.nanmax(diff)) / column_scale if np.any(~np.isnan(diff)) else 0.0
+        for i in wrapped:
+            result[:, i] = np.mod(result[:, i], 360.0)
+        for i, name in enumerate(names):
+            result[on_node, i] = self.columns[name][node[on_node]]
+
+        table = AstropyTable()
+        int_columns = set(self.meta.get("int_columns", []))
+        for name in self.meta.get("colnames") or (["datetime_str", "datetime_jd"] + names + list(self.text_columns)):
+            if name == "datetime_jd":
+                table[name] = epochs
+                table[name].unit = "d"
+            elif name in self.columns:
+                data = result[:, names.index(name)]
+                mask = np.isnan(data)
+                if name in int_columns and not mask.any() and not off_node.any():
+                    data = np.round(data).astype(np.int64)
+                table[name] = MaskedColumn(data, mask=mask, unit=units.get(name))
+            elif name in self.text_columns:
+                stored = self.text_columns[name]
+                data = np.empty(len(epochs), dtype=stored.dtype if len(stored) else "U1")
+                data[on_node] = stored[node[on_node]]
+                if name == "datetime_str":
+                    data = data.astype(object)
+                    data[off_node] = _time_labels(epochs[off_node], str(stored[0]) if len(stored) else "")
+                    table[name] = data.astype(str)
+                    continue
+                constant = len(stored) and np.all(stored == stored[0])
+                if constant:
+                    data[off_node] = stored[0]
+                table[name] = MaskedColumn(data, mask=off_node & ~bool(constant))
+        if "datetime_str" not in table.colnames:
+            table.add_column(Time(epochs, format="jd", scale="tdb", precision=3).iso, name="datetime_str", index=0)
+        if "targetname" not in table.colnames and "targetname" in self.meta:
+            table.add_column([self.meta["targetname"]] * len(epochs), name="targetname", index=0)
+        table.meta["interpolated"] = bool(off_node.any())
+        table.meta["interpolation_error"] = errors
+        return table, errors
+
+
+class EphemerisStore:
+    """
+    Local store of Horizons samples (<cache_dir>/ephemeris/<key>.npz), one
+    file per target and query setup, so repeated or shifted time windows are
+    answered by interpolation and only uncovered ranges are requested again.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory) if directory else config.get_cache_dir() / "ephemeris"
+
+    @staticmethod
+    def series_key(target: str, ephem_type: str, location: Optional[str], id_type: Optional[str], quantities: Optional[str]) -> str:
+        setup = json.dumps([target.strip(), ephem_type, location, id_type, quantities if ephem_type == "OBSERVER" else None])
+        return hashlib.sha1(setup.encode("utf-8")).hexdigest()[:20]
+
+    def load(self, target: str, ephem_type: str, location: Optional[str], id_type: Optional[str], quantities: Optional[str]) -> EphemerisSeries:
+        key = self.series_key(target, ephem_type, location, id_type, quantities)
+        meta = {"target": target, "ephem_type": ephem_type, "location": location, "id_type": id_type, "quantities": quantities}
+        path = self.directory / f"{key}.npz"
+        if not path.exists():
+            return EphemerisSeries(key, meta)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                columns = {name: data[f"col_{name}"] for name in meta.get("columns", [])}
+                text_columns = {name: data[f"txt_{name}"] for name in meta.get("text_columns", [])}
+                return EphemerisSeries(key, meta, data["jd"], columns, text_columns)
+        except (OSError, ValueError, KeyError) as e:
+            debug(f"Ignoring unreadable ephemeris store {path}: {e}")
+            return EphemerisSeries(key, meta)
+
+    def save(self, series: EphemerisSeries):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        series.meta["columns"] = list(series.columns)
+        series.meta["text_columns"] = list(series.text_columns)
+        arrays = {f"col_{name}": values for name, values in series.columns.items()}
+        arrays.update({f"txt_{name}": values for name, values in series.text_columns.items()})
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp.npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, jd=series.jd, meta=np.array(json.dumps(series.meta)), **arrays)
+            os.replace(tmp_path, self.directory / f"{series.key}.npz")
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def entries(self) -> List[dict]:
+        rows = []
+        for path in sorted(self.directory.glob("*.npz")):
+            try:
+                with np.load(path, allow_pickle=False) as data:
+                    meta = json.loads(str(data["meta"]))
+                    rows.append(dict(meta, samples=len(data["jd"]), size=path.stat().st_size))
+            except (OSError, ValueError, KeyError):
+                continue
+        return rows
+
+    def clear(self) -> int:
+        count = 0
+        for path in self.directory.glob("*.npz"):
+            path.unlink()
+            count += 1
+        return count
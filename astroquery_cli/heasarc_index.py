@@ -0,0 +1,147 @@
+import bisect
+import difflib
+import gzip
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from astropy.table import Table as AstropyTable
+
+from astroquery_cli import config
+from astroquery_cli.debug import debug
+
+# Names users know HEASARC tables by that differ from the table name
+CATALOG_ALIASES = {"atnfpsr": "atnfpulsar"}
+
+
+def fetch_catalog_schema(heasarc) -> Dict[str, dict]:
+    """
+    Table name -> {description, columns} for every public HEASARC table, from
+    the Xamin TAP tableset (one request; it carries the columns of all tables).
+    """
+    catalogs = {}
+    for name, table in heasarc.tap.tables.items():
+        if "TAP" in name:
+            continue
+        columns = []
+        for col in table.columns:
+            datatype = getattr(col.datatype, "content", col.datatype) if col.datatype is not None else ""
+            columns.append([col.name, col.unit or "", str(datatype or ""), col.description or ""])
+        catalogs[name] = {"description": table.description or "", "columns": columns}
+    return catalogs
+
+
+class HeasarcCatalogIndex:
+    """
+    The HEASARC table list kept on disk (<cache_dir>/heasarc_catalogs.json.gz)
+    and indexed in memory: exact lookups are case-insensitive dict hits,
+    prefix lookups bisect a sorted key list, and misspelled names get
+    difflib suggestions. The stored column lists let queries be checked
+    before they are sent.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else config.get_cache_dir() / "heasarc_catalogs.json.gz"
+        self.catalogs: Dict[str, dict] = {}
+        self.updated: Optional[float] = None
+        self._by_key: Dict[str, str] = {}
+        self._keys: List[str] = []
+
+    def _build(self, catalogs: Dict[str, dict], updated: float):
+        self.catalogs = catalogs
+        self.updated = updated
+        self._by_key = {name.strip().lower(): name for name in catalogs}
+        self._keys = sorted(self._by_key)
+
+    def load(self) -> bool:
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            self._build(data["catalogs"], float(data["updated"]))
+            return True
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError) as e:
+            debug(f"Ignoring unreadable HEASARC catalog index {self.path}: {e}")
+            return False
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump({"updated": self.updated, "catalogs": self.catalogs}, f)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def is_fresh(self, ttl: int) -> bool:
+        return bool(self.catalogs) and (ttl < 0 or time.time() - (self.updated or 0) <= ttl)
+
+    def refresh(self, heasarc):
+        self._build(fetch_catalog_schema(heasarc), time.time())
+        debug(f"HEASARC catalog index: {len(self.catalogs)} table(s) fetched")
+        self.save()
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Exact, case-insensitive table name (aliases included), or None."""
+        key = name.strip().lower()
+        key = CATALOG_ALIASES.get(key, key)
+        return self._by_key.get(key)
+
+    def with_prefix(self, prefix: str) -> List[str]:
+        key = prefix.strip().lower()
+        start = bisect.bisect_left(self._keys, key)
+        end = bisect.bisect_left(self._keys, key + "\uffff", lo=start)
+        return [self._by_key[k] for k in self._keys[start:end]]
+
+    def suggest(self, name: str, limit: int = 5) -> List[str]:
+        """Prefix matches first, then close spellings."""
+        matches = self.with_prefix(name)[:limit]
+        if len(matches) < limit:
+            close = difflib.get_close_matches(name.strip().lower(), self._keys, n=limit, cutoff=0.6)
+            matches += [self._by_key[k] for k in close if self._by_key[k] not in matches][:limit - len(matches)]
+        return matches
+
+    def columns(self, name: str) -> List[List[str]]:
+        """[name, unit, datatype, description] per column of a table."""
+        return self.catalogs[name]["columns"]
+
+    def table(self, names: Optional[List[str]] = None) -> AstropyTable:
+        names = sorted(self.catalogs) if names is None else names
+        return AstropyTable(
+            {"name": names,
+             "description": [self.catalogs[n]["description"] for n in names],
+             "columns": [len(self.catalogs[n]["columns"]) for n in names]}
+        )
+
+
+_index: Optional[HeasarcCatalogIndex] = None
+
+
+def get_catalog_index(heasarc, refresh: bool = False) -> Tuple[HeasarcCatalogIndex, bool]:
+    """
+    Returns the catalog index (loaded once per process) and whether it came
+    from disk. It is fetched again on `refresh`, or when older than the
+    configured TTL and not in offline mode; if that fails, a stale copy is
+    used with a debug note.
+    """
+    global _index
+    if _index is None:
+        _index = HeasarcCatalogIndex()
+        _index.load()
+    offline = config.get_offline_mode() and bool(_index.catalogs)
+    if refresh or not (offline or _index.is_fresh(config.get_heasarc_catalog_ttl())):
+        try:
+            _index.refresh(heasarc)
+            return _index, False
+        except Exception as e:
+            if not _index.catalogs:
+                raise
+            debug(f"Could not refresh the HEASARC catalog index, using the stored copy: {e}")
+    return _index, True
@@ -0,0 +1,143 @@
+import difflib
+import os
+import re
+import tempfile
+from typing import Iterable, List, Optional
+
+import astropy.units as u
+from astropy.coordinates import SkyCoord
+
+from astroquery_cli.debug import debug
+
+# Bytes per read when copying a TAP result to disk
+STREAM_CHUNK_BYTES = 1024 * 1024
+
+# Output formats the HEASARC TAP service produces itself (results are copied to disk as received)
+VOTABLE_FORMATS = ("votable", "vot", "xml")
+
+# ADQL words that may appear in a WHERE clause without being column names
+_ADQL_WORDS = {
+    "AND", "OR", "NOT", "IN", "LIKE", "ILIKE", "BETWEEN", "IS", "NULL", "TRUE", "FALSE",
+    "ICRS", "FK5", "GALACTIC", "ASC", "DESC",
+}
+
+_TOKEN_RE = re.compile(r"'(?:[^']|'')*'|\"[^\"]+\"|[A-Za-z_][A-Za-z0-9_.]*|\d+\.?\d*(?:[eE][-+]?\d+)?|\S")
+_ORDER_RE = re.compile(r"^\s*(\"[^\"]+\"|[A-Za-z_][A-Za-z0-9_]*)\s*(ASC|DESC)?\s*$", re.IGNORECASE)
+_QUERY_STATUS_ERROR_RE = re.compile(r'<INFO[^>]*name="QUERY_STATUS"[^>]*value="ERROR"[^>]*>(.*?)</INFO>', re.IGNORECASE | re.DOTALL)
+
+
+class AdqlValidationError(ValueError):
+    pass
+
+
+class CatalogColumns:
+    """Case-insensitive view of one catalog's columns, from the stored HEASARC schema."""
+
+    def __init__(self, catalog: str, columns: Iterable[List[str]]):
+        self.catalog = catalog
+        self.by_key = {column[0].lower(): column[0] for column in columns}
+
+    def canonical(self, name: str) -> str:
+        key = name.strip().strip('"').lower()
+        if key in self.by_key:
+            return self.by_key[key]
+        close = difflib.get_close_matches(key, list(self.by_key), n=3, cutoff=0.6)
+        hint = f" Did you mean: {', '.join(self.by_key[c] for c in close)}?" if close else ""
+        raise AdqlValidationError(f"'{name}' is not a column of {self.catalog}.{hint}")
+
+
+def select_list(names: List[str], schema: Optional[CatalogColumns]) -> str:
+    """'*' or the requested columns, in the catalog's spelling."""
+    if not names or names == ["*"]:
+        return "*"
+    return ", ".join(schema.canonical(n) if schema else n for n in names)
+
+
+def check_where(where: str, schema: Optional[CatalogColumns]) -> str:
+    """
+    Checks that every identifier in a WHERE predicate that is not an ADQL
+    word, a function call or a literal is a column of the catalog.
+    """
+    if ";" in where:
+        raise AdqlValidationError("';' is not allowed in --where.")
+    tokens = _TOKEN_RE.findall(where)
+    for i, token in enumerate(tokens):
+        if token.startswith("'") or token[0].isdigit():
+            continue
+        if token.startswith('"') or token[0].isalpha() or token[0] == "_":
+            followed_by_call = i + 1 < len(tokens) and tokens[i + 1] == "("
+            if followed_by_call or token.upper() in _ADQL_WORDS:
+                continue
+            if schema:
+                schema.canonical(token.rsplit(".", 1)[-1])
+    return where
+
+
+def order_by_clause(order_by: Optional[List[str]], schema: Optional[CatalogColumns]) -> str:
+    """'name' / 'flux desc' items -> 'name ASC, flux DESC'."""
+    terms = []
+    for item in order_by or []:
+        for part in item.split(","):
+            if not part.strip():
+                continue
+            match = _ORDER_RE.match(part)
+            if not match:
+                raise AdqlValidationError(f"Invalid --order-by term '{part.strip()}'; use 'column' or 'column desc'.")
+            column = schema.canonical(match.group(1)) if schema else match.group(1)
+            terms.append(f"{column} {(match.group(2) or 'ASC').upper()}")
+    return ", ".join(terms)
+
+
+def cone_query(heasarc, catalog: str, ra: float, dec: float, radius_deg: float, columns: Optional[str] = None) -> str:
+    """Base ADQL of a cone search (the catalog's default columns unless `columns` is given)."""
+    return heasarc.query_region(position=SkyCoord(ra, dec, unit="deg"), catalog=catalog, radius=radius_deg * u.deg,
+                                columns=columns, get_query_payload=True)
+
+
+def build_adql(base_query: str, where: Optional[str] = None, order_by: str = "") -> str:
+    """Adds a (checked) user predicate and ordering to 'SELECT ... FROM ...[ WHERE ...]'."""
+    adql = base_query
+    if where:
+        joiner = " AND " if re.search(r"\sWHERE\s", adql, re.IGNORECASE) else " WHERE "
+        adql += f"{joiner}({where})"
+    if order_by:
+        adql += f" ORDER BY {order_by}"
+    return adql
+
+
+def is_votable_output(output_file: Optional[str], output_format: Optional[str]) -> bool:
+    if not output_file or output_file == "-":
+        return False
+    if output_format:
+        return output_format.lower() in VOTABLE_FORMATS
+    return os.path.splitext(output_file.lower())[1].lstrip(".") in VOTABLE_FORMATS + ("votable",)
+
+
+def stream_to_file(stream, path: str) -> int:
+    """
+    Copies a VOTable result stream to `path` (via a temporary file) without
+    parsing it, so memory use does not grow with the result. Raises if the
+    service reported a query error inside the VOTable. Returns the byte count.
+    """
+    path = os.path.abspath(os.path.expanduser(path))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+    written = 0
+    head = b""
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for block in iter(lambda: stream.read(STREAM_CHUNK_BYTES), b""):
+                if len(head) < 65536:
+                    head += block[:65536 - len(head)]
+                f.write(block)
+                written += len(block)
+        error = _QUERY_STATUS_ERROR_RE.search(head.decode("utf-8", errors="replace"))
+        if error:
+            raise RuntimeError(f"HEASARC TAP query failed: {error.group(1).strip() or 'no details from server'}")
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    debug(f"HEASARC TAP: {written} bytes written to {path}")
+    return written
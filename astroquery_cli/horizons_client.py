@@ -0,0 +1,86 @@
+import re
+from typing import Dict, List, Optional, Union
+
+from astropy.table import Table as AstropyTable
+from astropy.time import Time
+import astropy.units as u
+
+from astroquery_cli.debug import debug
+
+# Epochs per Horizons request. The server refuses tables of more than
+# 90024 lines; staying well below that also keeps single requests short.
+HORIZONS_MAX_STEPS = 10000
+
+DEFAULT_OBSERVER_QUANTITIES = "1,2,4,8,9,10,12,13,14,19,20,21,23,24,31"
+
+# Horizons step sizes with a fixed length, in minutes ('mo' and 'y' vary)
+_STEP_UNITS_MINUTES = {"m": 1, "min": 1, "h": 60, "hour": 60, "d": 1440, "day": 1440}
+_STEP_RE = re.compile(r"^\s*(\d+)\s*([a-z]*)\s*$", re.IGNORECASE)
+
+EpochSpec = Union[None, float, List[float], Dict[str, str]]
+
+
+def step_minutes(step: str) -> Optional[int]:
+    """'10m' -> 10, '1h' -> 60, '2d' -> 2880; None for steps that cannot be split ('1mo', '1y', '100')."""
+    match = _STEP_RE.match(step or "")
+    if not match:
+        raise ValueError(f"Invalid Horizons step '{step}'; use e.g. '10m', '1h' or '1d'.")
+    minutes = _STEP_UNITS_MINUTES.get(match.group(2).lower())
+    return int(match.group(1)) * minutes if minutes else None
+
+
+def _format_epoch(t: Time) -> str:
+    t = Time(t, precision=3)
+    return t.iso
+
+
+def epoch_chunks(start: str, stop: str, step: str, max_steps: int = HORIZONS_MAX_STEPS) -> List[Dict[str, str]]:
+    """
+    Splits a start/stop/step range into consecutive ranges of at most
+    `max_steps` epochs each, on the same step grid and without repeating the
+    boundary epochs. Steps without a fixed length are returned unsplit.
+    """
+    max_steps = max(2, max_steps)
+    minutes = step_minutes(step)
+    if minutes is None:
+        return [{"start": start, "stop": stop, "step": step}]
+    # Date arithmetic on the labels Horizons was given, without leap-second shifts
+    t0, t1 = Time(start, scale="tdb"), Time(stop, scale="tdb")
+    if t1 <= t0:
+        raise ValueError(f"Stop time {stop} is not after start time {start}.")
+    total = int(((t1 - t0).to_value(u.min) + 1e-6) // minutes) + 1
+    bounds = list(range(0, total, max_steps)) + [total]
+    if len(bounds) > 2 and bounds[-1] - bounds[-2] == 1:
+        # Horizons needs stop > start; move one epoch from the previous chunk
+        bounds[-2] -= 1
+    chunks = []
+    for first, end in zip(bounds, bounds[1:]):
+        chunks.append({
+            "start": _format_epoch(t0 + first * minutes * u.min),
+            "stop": _format_epoch(t0 + (end - 1) * minutes * u.min),
+            "step": step,
+        })
+    debug(f"Horizons: {total} epoch(s) from {start} to {stop} every {step} in {len(chunks)} request(s)")
+    return chunks
+
+
+def query_horizons(target: str, ephem_type: str, location: Optional[str] = None, epochs: EpochSpec = None,
+                   id_type: Optional[str] = None, quantities: Optional[str] = None) -> AstropyTable:
+    """One Horizons request on its own Horizons instance (safe to run in parallel)."""
+    from astroquery.jplhorizons import Horizons
+    from astroquery_cli.http_session import use_shared_pool
+    params = {"id": target, "location": location, "epochs": epochs, "id_type": id_type}
+    obj = use_shared_pool(Horizons(**{k: v for k, v in params.items() if v is not None}))
+    if ephem_type == "OBSERVER":
+        return obj.ephemerides(quantities=quantities or DEFAULT_OBSERVER_QUANTITIES)
+    if ephem_type == "VECTORS":
+        if quantities:
+            debug("Horizons vectors take no quantities; ignoring them")
+        return obj.vectors()
+    return obj.elements()
+
+
+def sort_by_epoch(table: AstropyTable) -> AstropyTable:
+    if table is not None and "datetime_jd" in table.colnames:
+        table.sort("datetime_jd")
+    return table
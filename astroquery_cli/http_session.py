@@ -0,0 +1,68 @@
+import threading
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from astroquery_cli import config
+from astroquery_cli.debug import debug
+
+_lock = threading.Lock()
+_shared_adapter: Optional[HTTPAdapter] = None
+_shared_session: Optional[requests.Session] = None
+
+
+def get_shared_adapter() -> HTTPAdapter:
+    """
+    Returns the process-wide HTTP adapter.
+
+    The adapter owns the urllib3 connection pools, so mounting the same instance
+    on several sessions lets them reuse keep-alive connections to the same hosts
+    while each session keeps its own headers, hooks and authentication.
+    """
+    global _shared_adapter
+    with _lock:
+        if _shared_adapter is None:
+            pool_connections, pool_maxsize, pool_block = config.get_http_pool_settings()
+            _shared_adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+                # Only retry failed connects; the request itself may not be idempotent.
+                max_retries=Retry(total=None, connect=config.get_http_connect_retries(), read=0, redirect=None, status=0, backoff_factor=0.5),
+            )
+            debug(f"Created shared HTTP pool: pool_connections={pool_connections}, pool_maxsize={pool_maxsize}, pool_block={pool_block}")
+        return _shared_adapter
+
+
+def mount_shared_adapter(session: requests.Session) -> requests.Session:
+    adapter = get_shared_adapter()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_shared_session() -> requests.Session:
+    """Returns a process-wide requests.Session backed by the shared connection pool."""
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = mount_shared_adapter(requests.Session())
+    return _shared_session
+
+
+def use_shared_pool(service: Any) -> Any:
+    """
+    Routes an astroquery service instance (Simbad, Vizier, Ned, Irsa, ...) through
+    the shared connection pool and returns it.
+    """
+    session = getattr(service, "_session", None)
+    if session is None:
+        # Heasarc only creates its session when the TAP service is first used
+        session = requests.Session()
+        service._session = session
+    if isinstance(session, requests.Session):
+        mount_shared_adapter(session)
+    else:
+        debug(f"{type(service).__name__} has no requests session; not using the shared HTTP pool")
+    return service
@@ -0,0 +1,99 @@
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from astroquery_cli import config
+
+# UWS phases after which a job will not change any more
+FINAL_PHASES = ("COMPLETED", "ERROR", "ABORTED", "ARCHIVED")
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class JobStore:
+    """
+    Keeps records of asynchronous (UWS/TAP) jobs on disk so that a long query
+    can be checked and fetched from a later session.
+
+    Each job is a small JSON file under <jobs_dir>/<service>/<job_id>.json.
+    """
+
+    def __init__(self, jobs_dir: Optional[Path] = None):
+        self.jobs_dir = Path(jobs_dir) if jobs_dir else config.get_jobs_dir()
+
+    def _path(self, service: str, job_id: str) -> Path:
+        return self.jobs_dir / service / f"{job_id}.json"
+
+    def save(self, service: str, job_id: str, **fields: Any) -> Dict[str, Any]:
+        """Creates or updates the record of a job and returns it."""
+        record = self.load(service, job_id) or {"service": service, "job_id": job_id, "created": now_iso()}
+        record.update({k: v for k, v in fields.items() if v is not None})
+        record["updated"] = now_iso()
+        path = self._path(service, job_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f, indent=2, default=str)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return record
+
+    def load(self, service: str, job_id: str) -> Optional[Dict[str, Any]]:
+        path = self._path(service, job_id)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def list(self, service: str) -> List[Dict[str, Any]]:
+        """Returns all job records of a service, newest first."""
+        records = []
+        for path in (self.jobs_dir / service).glob("*.json"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    records.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(records, key=lambda r: r.get("created", ""), reverse=True)
+
+    def remove(self, service: str, job_id: str) -> bool:
+        path = self._path(service, job_id)
+        if path.exists():
+            path.unlink()
+            return True
+        return False
+
+
+def wait_for_phase(get_phase, on_update=None, poll_interval: float = 2.0, max_interval: float = 30.0,
+                   timeout: Optional[float] = None) -> str:
+    """
+    Polls `get_phase()` until the job reaches a final phase and returns it.
+    The interval grows by half each round up to `max_interval`; `on_update(phase, elapsed)`
+    is called after every poll. Returns the last seen phase if `timeout` expires.
+    """
+    start = time.monotonic()
+    interval = poll_interval
+    while True:
+        phase = str(get_phase()).upper().strip()
+        elapsed = time.monotonic() - start
+        if on_update:
+            on_update(phase, elapsed)
+        if phase in FINAL_PHASES:
+            return phase
+        if timeout is not None and elapsed >= timeout:
+            return phase
+        time.sleep(interval)
+        interval = min(max_interval, interval * 1.5)
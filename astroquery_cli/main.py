@@ -4,7 +4,11 @@ os.environ['LANGUAGE'] = 'zh_CN.UTF-8'
 
 import sys
 import typer
+import click
 import builtins
+import importlib
+from typing import List, Optional
+from typer.core import TyperGroup
 
 import logging
 from astropy.logger import AstropyLogger
@@ -69,8 +73,96 @@ def save_default_lang(lang):
 def load_default_lang():
     return config.get_language()
 
+def get_subcommand_manifest():
+    """
+    Static manifest of top-level subcommands: name -> (module, help text, override).
+    Listing commands only needs this table; the module (and its astroquery
+    backend) is imported when the command is actually selected. When `override`
+    is set, the help text replaces the module's own help (as for the aliased names).
+    """
+    return {
+        "mast": ("mast_cli", builtins._("Query the Mikulski Archive for Space Telescopes"), False),
+        "vizier": ("vizier_cli", builtins._("Query the VizieR astronomical catalog database. (viz)"), True),
+        "viz": ("vizier_cli", builtins._("Query the VizieR astronomical catalog service."), False), # Alias for vizier
+        "simbad": ("simbad_cli", builtins._("Query the SIMBAD astronomical database. (sim)"), True),
+        "sim": ("simbad_cli", builtins._("SIMBAD astronomical database."), False), # Alias for simbad
+        "jpl": ("jpl_cli", builtins._("Query JPL services (Horizons and Small-Body Database)."), False),
+        "exoplanet": ("exoplanet_cli", builtins._("Query the NASA Exoplanet Archive. (exo)"), True),
+        "exo": ("exoplanet_cli", builtins._("Query the NASA Exoplanet Archive."), False), # Alias for exoplanet
+        "heasarc": ("heasarc_cli", builtins._("Query the HEASARC database. (hea)"), True),
+        "hea": ("heasarc_cli", builtins._("Query the HEASARC database."), False), # Alias for heasarc
+        "gaia": ("gaia_cli", builtins._("Query the Gaia archive."), False),
+        "alma": ("alma_cli", builtins._("Query the ALMA archive."), False),
+        "irsa": ("irsa_cli", builtins._("Query NASA/IPAC Infrared Science Archive"), False),
+        "sdss": ("sdss_cli", builtins._("Query the Sloan Digital Sky Survey database."), False),
+        "ned": ("ned_cli", builtins._("Query the NASA/IPAC Extragalactic Database"), False),
+        "eso": ("eso_cli", builtins._("Query the European Southern Observatory archive."), False),
+        "esasky": ("esasky_cli", builtins._("Query the ESA Sky archive."), False),
+        "nist": ("nist_cli", builtins._("Query the NIST Atomic Spectra Database."), False),
+        "splatalogue": ("splatalogue_cli", builtins._("Query the Splatalogue spectral line database. (spl)"), True),
+        "spl": ("splatalogue_cli", builtins._("Query the Splatalogue spectral line database."), False), # Alias for splatalogue
+        "ads": ("ads_cli", builtins._("Query the NASA Astrophysics Data System"), False),
+        "xmatch": ("xmatch_cli", builtins._("Cross-match two local tables by sky position."), False),
+        "names": ("names_cli", builtins._("Manage the local object name resolution cache."), False),
+    }
+
+# Modules whose get_app() expects the translator to be passed in
+_APPS_TAKING_TRANSLATOR = {"sdss_cli", "nist_cli"}
+
+def load_subcommand(name: str) -> Optional[click.Command]:
+    """Import the module behind a subcommand and build its click group."""
+    entry = get_subcommand_manifest().get(name)
+    if entry is None:
+        return None
+    module_name, help_text, override_help = entry
+
+    # Suppress astroquery log messages during import
+    logging.getLogger('astroquery').setLevel(logging.CRITICAL)
+    module = importlib.import_module(f"astroquery_cli.modules.{module_name}")
+    # Restore astroquery log level after import
+    logging.getLogger('astroquery').setLevel(logging.NOTSET)
+
+    if module_name in _APPS_TAKING_TRANSLATOR:
+        sub_app = module.get_app(builtins._)
+    else:
+        sub_app = module.get_app()
+    # A module app with a single command and no callback (xmatch) becomes a plain command
+    command = typer.main.get_command(sub_app)
+    command.name = name
+    if override_help or not command.help:
+        command.help = help_text
+    return command
+
+class LazySubcommandGroup(TyperGroup):
+    """
+    Top-level group that lists subcommands from the static manifest and only
+    imports a subcommand module once it is resolved for invocation.
+    """
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        manifest_names = list(get_subcommand_manifest())
+        return manifest_names + [n for n in self.commands if n not in manifest_names]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.commands:
+            return self.commands[cmd_name]
+        entry = get_subcommand_manifest().get(cmd_name)
+        if entry is None:
+            return None
+        # Lightweight placeholder, enough for help listings
+        return click.Group(name=cmd_name, help=entry[1])
+
+    def resolve_command(self, ctx: click.Context, args: List[str]):
+        cmd_name, cmd, remaining = super().resolve_command(ctx, args)
+        if cmd_name not in self.commands:
+            loaded = load_subcommand(cmd_name)
+            if loaded is not None:
+                self.commands[cmd_name] = loaded
+                cmd = loaded
+        return cmd_name, cmd, remaining
+
 app = typer.Typer(
     name="aqc",
+    cls=LazySubcommandGroup,
     help=builtins._("Astroquery CLI"),
     invoke_without_command=True,
     no_args_is_help=False,
@@ -78,42 +170,6 @@ app = typer.Typer(
     context_settings={"help_option_names": ["-h", "--help"]},
 )
 
-def setup_subcommands():
-    import logging
-    # Suppress astroquery log messages during import
-    logging.getLogger('astroquery').setLevel(logging.CRITICAL)
-
-    # Import all subcommands
-    from .modules import (
-        simbad_cli, alma_cli, esasky_cli, gaia_cli, irsa_cli, jpl_cli,
-        mast_cli, ads_cli, ned_cli, splatalogue_cli, vizier_cli,
-        heasarc_cli, sdss_cli, eso_cli, nist_cli, exoplanet_cli
-    )
-    # Restore astroquery log level after import
-    logging.getLogger('astroquery').setLevel(logging.NOTSET)
-
-    app.add_typer(mast_cli.get_app(), name="mast")
-    app.add_typer(vizier_cli.get_app(), name="vizier", help=builtins._("Query the VizieR astronomical catalog database. (viz)"))
-    app.add_typer(vizier_cli.get_app(), name="viz") # Alias for vizier
-    app.add_typer(simbad_cli.get_app(), name="simbad", help=builtins._("Query the SIMBAD astronomical database. (sim)"))
-    app.add_typer(simbad_cli.get_app(), name="sim") # Alias for simbad
-    app.add_typer(jpl_cli.get_app(), name="jpl") # Updated for jpl
-    app.add_typer(exoplanet_cli.get_app(), name="exoplanet", help=builtins._("Query the NASA Exoplanet Archive. (exo)"))
-    app.add_typer(exoplanet_cli.get_app(), name="exo") # Alias for exoplanet
-    app.add_typer(heasarc_cli.get_app(), name="heasarc", help=builtins._("Query the HEASARC database. (hea)"))
-    app.add_typer(heasarc_cli.get_app(), name="hea") # Alias for heasarc
-    app.add_typer(gaia_cli.get_app(), name="gaia")
-    app.add_typer(alma_cli.get_app(), name="alma")
-    app.add_typer(irsa_cli.get_app(), name="irsa")
-    app.add_typer(sdss_cli.get_app(builtins._), name="sdss")
-    app.add_typer(ned_cli.get_app(), name="ned")
-    app.add_typer(eso_cli.get_app(), name="eso")
-    app.add_typer(esasky_cli.get_app(), name="esasky")
-    app.add_typer(nist_cli.get_app(builtins._), name="nist")
-    app.add_typer(splatalogue_cli.get_app(), name="splatalogue", help=builtins._("Query the Splatalogue spectral line database. (spl)"))
-    app.add_typer(splatalogue_cli.get_app(), name="spl") # Alias for splatalogue
-    app.add_typer(ads_cli.get_app(), name="ads")
-
 @app.callback()
 def main_callback(
     ctx: typer.Context,
@@ -329,7 +385,13 @@ def cli():
             console.print(_("[bold green]Debug mode enabled.[/bold green]"))
         # Removed the "Debug mode disabled" message as per user request.
 
-        setup_subcommands()
+        # With '-o -' the table goes to stdout, so keep messages out of the pipe
+        argv = sys.argv[1:]
+        if any(arg in ("-o", "--output-file") and i + 1 < len(argv) and argv[i + 1] == "-" for i, arg in enumerate(argv)) \
+           or "--output-file=-" in argv:
+            from astroquery_cli.utils import use_stderr_for_messages
+            use_stderr_for_messages()
+
         app()
     except KeyboardInterrupt:
         _ = i18n.get_translator()
@@ -0,0 +1,102 @@
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from astropy.table import Table as AstropyTable
+from astroquery.mast import Observations
+from astroquery.mast.discovery_portal import _json_to_table, _prepare_service_request_string
+from astroquery.exceptions import RemoteServiceError
+
+from astroquery_cli.batch import iter_completed
+from astroquery_cli.debug import debug
+
+# Rows per Mashup page; the portal's own default is 50000
+MAST_PAGESIZE = 2000
+
+# Seconds one page request may spend waiting for the portal (it answers "EXECUTING" until done)
+MAST_TIMEOUT = 120
+
+_CAOM_CONE = "Mast.Caom.Cone"
+_CAOM_FILTERED_POSITION = "Mast.Caom.Filtered.Position"
+
+_col_config_lock = threading.Lock()
+
+
+class MastQuery:
+    """
+    One CAOM observation query, sent to the MAST portal page by page.
+
+    With criteria, the filtered service applies them and returns only the
+    requested `columns`. Without criteria the cone service is used, which
+    always returns every column. Each page request carries its own page
+    number, size and timeout, so pages can be fetched concurrently and the
+    shared `Observations` settings are left untouched.
+    """
+
+    def __init__(self, coordinates, radius_deg: float, criteria: Optional[Dict[str, Any]] = None,
+                 columns: Optional[List[str]] = None, pagesize: int = MAST_PAGESIZE, timeout: float = MAST_TIMEOUT):
+        self.pagesize = pagesize
+        self.timeout = timeout
+        self.columns = columns or None
+        self._portal = Observations._portal_api_connection
+        criteria = {k: v for k, v in (criteria or {}).items() if v not in (None, [], ())}
+        if criteria:
+            self.service = _CAOM_FILTERED_POSITION
+            position, filters = Observations._parse_caom_criteria(coordinates=coordinates, radius=radius_deg, **criteria)
+            self.params = {"columns": ",".join(self.columns) if self.columns else "*", "filters": filters, "position": position}
+            self.server_columns = bool(self.columns)
+        else:
+            self.service = _CAOM_CONE
+            self.params = {"ra": coordinates.ra.deg, "dec": coordinates.dec.deg, "radius": radius_deg}
+            self.server_columns = False
+        with _col_config_lock:
+            if self.service not in self._portal._column_configs:
+                self._portal._get_col_config(self.service)
+        debug(f"MAST {self.service}: criteria={criteria}, columns={self.params.get('columns')}, pagesize={pagesize}")
+
+    def fetch_page(self, page: int) -> Tuple[AstropyTable, Dict[str, int]]:
+        """Returns (table, paging) for one page; paging has 'pagesFiltered' and 'rowsFiltered'."""
+        request = {"service": self.service, "params": self.params, "format": "json",
+                   "pagesize": self.pagesize, "page": page}
+        data = _prepare_service_request_string(request)
+        session = self._portal._session
+        headers = {"User-Agent": session.headers["User-Agent"],
+                   "Content-type": "application/x-www-form-urlencoded",
+                   "Accept": "text/plain"}
+        deadline = time.monotonic() + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"MAST page {page} did not complete within {self.timeout:.0f} s")
+            response = session.post(self._portal.MAST_REQUEST_URL, data=data, headers=headers, timeout=remaining)
+            response.raise_for_status()
+            result = response.json()
+            status = result.get("status") if result else "ERROR"
+            if status != "EXECUTING":
+                break
+        if status == "ERROR":
+            raise RemoteServiceError(result.get("msg", "There was an error with your request.") if result else "Empty response from MAST")
+        table = _json_to_table(result, self._portal._column_configs.get(self.service))
+        paging = result.get("paging") or {}
+        return table, {"pagesFiltered": int(paging.get("pagesFiltered", 1)), "rowsFiltered": int(paging.get("rowsFiltered", len(table)))}
+
+    def iter_pages(self, concurrency: int = 4) -> Iterator[AstropyTable]:
+        """
+        Yields the result pages in order. The first page gives the page count;
+        the others are fetched `concurrency` at a time, so at most that many
+        pages are held in memory. `rows_filtered` is set after the first page.
+        """
+        first, paging = self.fetch_page(1)
+        self.rows_filtered = paging["rowsFiltered"]
+        pages = paging["pagesFiltered"]
+        debug(f"MAST: {self.rows_filtered} row(s) in {pages} page(s)")
+        yield first
+        for window_start in range(2, pages + 1, max(1, concurrency)):
+            window = list(range(window_start, min(window_start + concurrency, pages + 1)))
+            done = {}
+            for page, result, error, _seconds in iter_completed(window, self.fetch_page, concurrency):
+                if error is not None:
+                    raise error
+                done[page] = result[0]
+            for page in window:
+                yield done.pop(page)
@@ -1,6 +1,6 @@
 import typer
 from typing import Optional, List
-from astropy.table import Table as AstropyTable, vstack # Import vstack
+from astropy.table import Table as AstropyTable
 from astroquery.nasa_ads import ADS
 from ..i18n import get_translator
 from ..utils import (
@@ -8,10 +8,23 @@ from ..utils import (
     display_table,
     handle_astroquery_exception,
     common_output_options,
+    common_cache_options,
+    common_batch_options,
     save_table_to_file,
+    open_table_stream,
+    report_table_stream,
+    use_stderr_for_messages,
     global_keyboard_interrupt_handler,
 )
+from ..cache import cached_query
+from ..batch import run_batch, merge_tables, resolve_batch_targets
+from ..ads_client import (
+    ADS_MAX_ROWS, ADS_EXPORT_MAX_BIBCODES, AdsRateLimit, BibtexStore, get_ads_token,
+    search_page, docs_to_table, page_requests, export_bibtex, bibcode_chunks,
+)
+from .. import config
 import os
+import sys
 import re # Import re
 from io import StringIO # Import StringIO
 from contextlib import redirect_stdout # Import redirect_stdout
@@ -120,8 +133,14 @@ def get_app():
             1, help=builtins._("Maximum number of pages to retrieve.")
         ),
         rows_per_page: int = typer.Option(
-            25, help=builtins._("Number of results per page (max 200 for ADS API).")
+            25, help=builtins._("Number of results per page (max 2000 for ADS API).")
+        ),
+        fetch_all: bool = typer.Option(
+            False, "--all", help=builtins._("Retrieve every matching record, ignoring --max-pages.")
         ),
+        concurrency: Optional[int] = common_batch_options["concurrency"],
+        no_cache: bool = common_cache_options["no_cache"],
+        refresh: bool = common_cache_options["refresh"],
         output_file: Optional[str] = common_output_options["output_file"],
         output_format: Optional[str] = common_output_options["output_format"],
         max_rows_display: int = typer.Option(
@@ -184,114 +203,156 @@ def get_app():
             console.print(builtins._("[red]Error: No valid query could be formed. Please check your inputs.[/red]"))
             raise typer.Exit(code=1)
 
-        # Ensure ADS.TOKEN is set from environment variable if available
-        if os.getenv("ADS_DEV_KEY"):
-            ADS.TOKEN = os.getenv("ADS_DEV_KEY")
-        
-        if not ADS.TOKEN:
+        token = get_ads_token()
+        if not token:
             console.print(_("[red]Error: No NASA ADS API token found! Please get yours from: https://ui.adsabs.harvard.edu/user/settings/token and set it in the ADS_DEV_KEY environment variable or in your ~/.aqc/config.ini file.[/red]"))
             raise typer.Exit(code=1) # Exit if no token is found
-        
+
+        request_fields = list(dict.fromkeys(fields or ["bibcode"]))
+        rows = max(1, min(rows_per_page, ADS_MAX_ROWS))
+        max_records = None if fetch_all else max_pages * rows
+        concurrency = concurrency or config.get_batch_concurrency("ads")
+        # Each page request carries its own start/rows/sort; the ADS class globals are never touched
+        rate_limit = AdsRateLimit(reserve=concurrency)
+
+        def fetch_page(start: int, page_rows: int):
+            cache_params = {"q": _final_query_string, "fl": request_fields, "sort": _final_sort_by, "start": start, "rows": page_rows}
+            return cached_query(
+                "ads", "search", cache_params,
+                lambda: search_page(_final_query_string, request_fields, _final_sort_by, start, page_rows, rate_limit, token),
+                no_cache=no_cache, refresh=refresh
+            )
+
+        writer = None
         try:
-            # Store original ADS settings
-            original_nrows = ADS.NROWS
-            original_nstart = ADS.NSTART
-            original_sort = ADS.SORT
+            docs, total = fetch_page(0, rows if max_records is None else min(rows, max_records))
+            if not docs:
+                console.print(_("[yellow]No results found for your ADS query.[/yellow]"))
+                return
+            first_table = docs_to_table(docs, request_fields)
+            pages = page_requests(total, len(docs), rows, max_records)
+            debug(f"ADS: {total} hit(s), {1 + len(pages)} page(s) of up to {rows} rows")
 
-            # Set ADS class attributes for query
-            ADS.NROWS = min(rows_per_page, 200)
-            if _final_sort_by: # Use _final_sort_by
-                ADS.SORT = _final_sort_by
+            if output_file:
+                writer = open_table_stream(ctx, output_file, output_format, _("NASA ADS query"))
+            if writer:
+                writer.write(first_table)
 
-            all_ads_results = AstropyTable() # Initialize as an empty AstropyTable
-            for page in range(max_pages):
-                ADS.NSTART = page * ADS.NROWS
-                try:
-                    page_results = ADS.query_simple(_final_query_string)
-                except RuntimeError as e:
-                    if str(e) == 'No results returned!':
-                        console.print(_("[yellow]No results found for your ADS query.[/yellow]"))
-                        page_results = None # Explicitly set to None to skip further processing
-                    else:
-                        raise # Re-raise other RuntimeErrors
-                
-                if page_results:
-                    if len(all_ads_results) == 0: # If all_ads_results is empty, assign the first page_results
-                        all_ads_results = page_results
-                    else: # Otherwise, vstack the new page_results
-                        all_ads_results = vstack([all_ads_results, page_results])
-                else:
-                    # If page_results is None (due to RuntimeError) or empty, break
-                    break
+            # Pages finish in any order; hold them until they can be written in sequence
+            labels = [str(start) for start, _rows in pages]
+            page_rows = dict(zip(labels, (r for _start, r in pages)))
+            pending = {}
+            next_page = 0
 
-            # Reset ADS class attributes to original values
-            ADS.NROWS = original_nrows
-            ADS.NSTART = original_nstart
-            ADS.SORT = original_sort
+            def on_page(label: str, table: AstropyTable):
+                nonlocal next_page
+                pending[label] = table
+                while next_page < len(labels) and labels[next_page] in pending:
+                    writer.write(pending.pop(labels[next_page]))
+                    next_page += 1
 
-            # Manually filter fields
-            if all_ads_results and fields:
-                existing_fields = [f for f in fields if f in all_ads_results.colnames]
-                if existing_fields:
-                    all_ads_results = all_ads_results[existing_fields]
-                else:
-                    console.print(_("[yellow]None of the requested fields were found in the ADS query results.[/yellow]"))
-                    all_ads_results = AstropyTable() # No relevant data to display
+            rest = None
+            if pages:
+                console.print(_("[cyan]{total} hit(s); fetching {count} more page(s) concurrently...[/cyan]").format(total=total, count=len(pages)))
+                rest, failures = run_batch(
+                    "ads", labels, lambda label: docs_to_table(fetch_page(int(label), page_rows[label])[0], request_fields),
+                    concurrency=concurrency, description=_("ADS pages"), tag=False,
+                    on_result=on_page if writer else None,
+                )
+                for label, message in failures:
+                    console.print(_("[bold red]Page starting at {start} failed: {error}[/bold red]").format(start=label, error=message))
+                if writer:
+                    # Failed pages leave gaps; write whatever arrived after them
+                    for label in labels[next_page:]:
+                        if label in pending:
+                            writer.write(pending.pop(label))
 
-            if all_ads_results and len(all_ads_results) > 0:
-                result_table = all_ads_results
-                console.print(_("[green]Found {count} result(s) from ADS.[/green]").format(count=len(result_table)))
-                display_table(ctx, result_table, title=_("ADS Query Results"), max_rows=max_rows_display, show_all_columns=show_all_columns)
-                if output_file:
-                    save_table_to_file(ctx, result_table, output_file, output_format, _("NASA ADS query"))
-            else:
-                console.print(_("[yellow]No results found for your ADS query.[/yellow]"))
+            result_table = merge_tables([first_table, rest] if rest is not None else [first_table])
+            console.print(_("[green]Found {count} result(s) from ADS ({total} hit(s) in total).[/green]").format(count=len(result_table), total=total))
+            display_table(ctx, result_table, title=_("ADS Query Results"), max_rows=max_rows_display, show_all_columns=show_all_columns)
+            if writer:
+                writer.close()
+                report_table_stream(writer)
+            elif output_file:
+                save_table_to_file(ctx, result_table, output_file, output_format, _("NASA ADS query"))
 
         except Exception as e:
+            if writer:
+                writer.close()
             handle_astroquery_exception(ctx, e, _("NASA ADS query"))
             raise typer.Exit(code=1)
 
-    @app.command(name="get-bibtex", help=builtins._("Get BibTeX for a NASA ADS bibcode."))
+    @app.command(name="get-bibtex", help=builtins._("Get BibTeX for NASA ADS bibcodes (batched export)."))
     @global_keyboard_interrupt_handler
     def get_bibtex(ctx: typer.Context,
-        bibcodes: List[str] = typer.Argument(..., help=builtins._("List of ADS bibcodes.")),
-        output_file: Optional[str] = typer.Option(None, "-o", "--output-file", help=builtins._("File to save BibTeX entries (e.g., refs.bib)."))
+        bibcodes: Optional[List[str]] = typer.Argument(None, help=builtins._("List of ADS bibcodes.")),
+        targets_file: Optional[str] = typer.Option(None, "--bibcodes-file", help=builtins._("File with one bibcode per line. Lines starting with '#' are ignored.")),
+        from_stdin: bool = common_batch_options["from_stdin"],
+        output_file: Optional[str] = typer.Option(None, "-o", "--output-file", help=builtins._("File to save BibTeX entries (e.g., refs.bib), or '-' for standard output.")),
+        chunk_size: int = typer.Option(ADS_EXPORT_MAX_BIBCODES, "--chunk-size", help=builtins._("Bibcodes per export request (max 2000).")),
+        no_cache: bool = typer.Option(False, "--no-cache", help=builtins._("Ignore and do not update the local BibTeX store (~/.aqc/cache/bibtex.json).")),
+        refresh: bool = common_cache_options["refresh"],
     ):
-        # Debugging information
-        debug(f"get_bibtex - bibcodes: {bibcodes}")
+        r"""
+        Example: aqc ads get-bibtex 2019ApJ...882L..24A 1998AJ....116.1009R -o refs.bib
+        Example: grep -o '[0-9]\{4\}[A-Za-z&.]\{5\}[0-9A-Za-z.]\{9\}[A-Z]' paper.aux | aqc ads get-bibtex --stdin -o -
+        """
+        if output_file == "-":
+            use_stderr_for_messages()
+        bibcodes = list(dict.fromkeys(b.strip() for b in resolve_batch_targets(bibcodes, targets_file, from_stdin) if b.strip()))
+        debug(f"get_bibtex - {len(bibcodes)} bibcode(s)")
+        token = get_ads_token()
+        if not token:
+            console.print(_("[red]Error: No NASA ADS API token found! Please get yours from: https://ui.adsabs.harvard.edu/user/settings/token and set it in the ADS_DEV_KEY environment variable or in your ~/.aqc/config.ini file.[/red]"))
+            raise typer.Exit(code=1)
 
-        console.print(_("[cyan]Fetching BibTeX for: {bibcode_list}...[/cyan]").format(bibcode_list=', '.join(bibcodes)))
-        if not ADS.TOKEN and not os.getenv("ADS_DEV_KEY"):
-            console.print(_("[yellow]Warning: ADS_DEV_KEY environment variable not set. Queries may be rate-limited.[/yellow]"))
-        try:
-            bibtex_entries = []
+        store = BibtexStore()
+        entries = {}
+        if not (no_cache or refresh):
             for bibcode in bibcodes:
-                # Use ADS.query_simple for bibtex, as it's the only query method
-                # Temporarily set NROWS to 1 to get only the first result for bibcode
-                original_nrows = ADS.NROWS
-                ADS.NROWS = 1
-                q = ADS.query_simple(f"bibcode:{bibcode}")
-                ADS.NROWS = original_nrows # Reset NROWS
-
-                if q and 'bibtex' in q.colnames and q['bibtex'][0]:
-                    bibtex_entries.append(q['bibtex'][0])
-                else:
-                    console.print(_("[yellow]Could not retrieve BibTeX for {bibcode}.[/yellow]").format(bibcode=bibcode))
-
-            if bibtex_entries:
-                full_bibtex_str = "\n\n".join(bibtex_entries)
-                console.print(_("[green]BibTeX entries retrieved:[/green]"))
-                console.print(full_bibtex_str)
-                if output_file:
-                    expanded_output_file = os.path.expanduser(output_file)
-                    with open(expanded_output_file, 'w', encoding='utf-8') as f:
-                        f.write(full_bibtex_str)
-                    console.print(_("[green]BibTeX entries saved to '{file_path}'.[/green]").format(file_path=expanded_output_file))
-            else:
-                console.print(_("[yellow]No BibTeX entries could be retrieved.[/yellow]"))
+                cached = store.get(bibcode)
+                if cached:
+                    entries[bibcode] = cached
+        missing = [b for b in bibcodes if b not in entries]
+        chunks = bibcode_chunks(missing, chunk_size)
+        console.print(_("[cyan]{total} bibcode(s): {cached} from the local store, {missing} to export in {requests} request(s)...[/cyan]").format(
+            total=len(bibcodes), cached=len(entries), missing=len(missing), requests=len(chunks)))
 
+        rate_limit = AdsRateLimit()
+        try:
+            for chunk in chunks:
+                exported = export_bibtex(chunk, rate_limit, token)
+                debug(f"Exported {len(exported)} BibTeX entr(ies) for {len(chunk)} bibcode(s)")
+                entries.update(exported)
+                if not no_cache:
+                    # Saved after every chunk so an interrupted export keeps its progress
+                    store.update(exported)
+                    store.save()
         except Exception as e:
-            handle_astroquery_exception(ctx, e, _("NASA ADS get_bibtex")) # Added 'ctx' argument
+            handle_astroquery_exception(ctx, e, _("NASA ADS get_bibtex"))
             raise typer.Exit(code=1)
 
+        not_found = [b for b in bibcodes if b not in entries]
+        for bibcode in not_found:
+            console.print(_("[yellow]Could not retrieve BibTeX for {bibcode}.[/yellow]").format(bibcode=bibcode))
+        # Requested order first; entries ADS returned under a bibcode that could not be mapped back follow
+        requested = set(bibcodes)
+        ordered = [entries[b] for b in bibcodes if b in entries] + [v for k, v in entries.items() if k not in requested]
+        if not ordered:
+            console.print(_("[yellow]No BibTeX entries could be retrieved.[/yellow]"))
+            raise typer.Exit(code=1)
+
+        full_bibtex_str = "\n".join(ordered)
+        if output_file == "-":
+            sys.stdout.write(full_bibtex_str)
+            sys.stdout.flush()
+        elif output_file:
+            expanded_output_file = os.path.expanduser(output_file)
+            with open(expanded_output_file, 'w', encoding='utf-8') as f:
+                f.write(full_bibtex_str)
+            console.print(_("[green]{count} BibTeX entries saved to '{file_path}'.[/green]").format(count=len(ordered), file_path=expanded_output_file))
+        else:
+            console.print(_("[green]BibTeX entries retrieved:[/green]"))
+            console.print(full_bibtex_str, markup=False, highlight=False)
+
     return app
@@ -7,12 +7,20 @@ from ..utils import (
     display_table,
     handle_astroquery_exception,
     common_output_options,
+    common_batch_options,
     save_table_to_file,
+    suffixed_output_path,
+    open_table_container,
     parse_coordinates,
     parse_angle_str_to_quantity,
     global_keyboard_interrupt_handler,
 )
 from ..i18n import get_translator
+from ..name_resolver import resolve_name
+from ..batch import iter_completed, merge_tables
+from ..http_session import use_shared_pool
+from .. import config
+import time
 import re # Import re
 from io import StringIO # Import StringIO
 from contextlib import redirect_stdout # Import redirect_stdout
@@ -76,6 +84,8 @@ def get_app():
                 console.print(full_help_text)
             raise typer.Exit()
     
+    use_shared_pool(ESASky)
+
     # ================== ESASKY_CATALOGS =========================
     ESASKY_CATALOGS = [
         "TYCHO-2",
@@ -137,6 +147,86 @@ def get_app():
 
 
 
+    def write_stdout_tables(ctx: typer.Context, tables, output_format: Optional[str], query_type: str):
+        """Writes (catalog, table) pairs to stdout as one table, tagged with a leading '_catalog' column."""
+        if len(tables) == 1:
+            save_table_to_file(ctx, tables[0][1], "-", output_format, query_type)
+            return
+        tagged = []
+        for cat_name, table in tables:
+            table = table.copy(copy_data=False)
+            table.add_column([cat_name] * len(table), name="_catalog", index=0)
+            tagged.append(table)
+        try:
+            combined = merge_tables(tagged)
+        except Exception as e:
+            console.print(_("[bold red]The {count} catalog tables cannot be combined on standard output ({error}). Write them to a file instead; each catalog then gets its own file.[/bold red]").format(count=len(tables), error=e))
+            raise typer.Exit(code=1)
+        save_table_to_file(ctx, combined, "-", output_format, query_type)
+
+    def query_catalogs(ctx: typer.Context, catalogs: List[str], query_one, title: str, query_type: str,
+                       output_file: Optional[str], output_format: Optional[str], single_file: bool,
+                       concurrency: Optional[int], max_rows_display: int, show_all_columns: bool):
+        """
+        Queries each ESASky catalog in its own request on a thread pool. Results
+        are displayed and saved as each catalog finishes: one file per catalog
+        (name suffixed with the catalog), or all catalogs as extensions of one
+        FITS/HDF5 file with `single_file`. On stdout ('-o -') the tables are
+        stacked in catalog order into one table with a leading '_catalog' column
+        and written once. Ends with a per-catalog timing summary.
+        """
+        container = open_table_container(ctx, output_file, output_format, _("ESASky {query_type}").format(query_type=query_type)) if output_file and single_file else None
+
+        summary = {"catalog": [], "rows": [], "seconds": [], "status": []}
+        errors = []
+        # Standard output takes one table, so results are collected and written at the end
+        stdout_results = {}
+        workers = concurrency or config.get_batch_concurrency("esasky")
+        debug(f"ESASky: {len(catalogs)} catalog(s), concurrency={workers}")
+        for catalog, result, error, elapsed in iter_completed(catalogs, query_one, workers):
+            summary["catalog"].append(catalog)
+            summary["seconds"].append(round(elapsed, 2))
+            if error is not None:
+                errors.append(error)
+                summary["rows"].append(0)
+                summary["status"].append(_("failed ({error_type})").format(error_type=type(error).__name__))
+                console.print(_("[bold red]Catalog '{cat_name}' failed: {error}[/bold red]").format(cat_name=catalog, error=error))
+                continue
+            tables = [(name, result[name]) for name in result.keys() if result[name] is not None and len(result[name]) > 0] if result else []
+            summary["rows"].append(sum(len(table) for _name, table in tables))
+            summary["status"].append("ok" if tables else "no results")
+            if not tables:
+                console.print(_("[yellow]No results from catalog '{cat_name}' for {title}.[/yellow]").format(cat_name=catalog, title=title))
+                continue
+            if output_file == "-" and container is None:
+                stdout_results[catalog] = tables
+            for cat_name, table in tables:
+                display_table(ctx, table, title=_("ESASky: {cat_name} for {title}").format(cat_name=cat_name, title=title), max_rows=max_rows_display, show_all_columns=show_all_columns)
+                if container is not None:
+                    extension = container.add(cat_name, table)
+                    console.print(_("[green]Added {count} rows from '{cat_name}' to '{file_path}' ({extension}).[/green]").format(count=len(table), cat_name=cat_name, file_path=container.output_file, extension=extension))
+                elif output_file and output_file != "-":
+                    save_table_to_file(ctx, table, suffixed_output_path(output_file, cat_name), output_format, _("ESASky {cat_name} {query_type}").format(cat_name=cat_name, query_type=query_type))
+
+        summary_table = AstropyTable(summary)
+        order = {catalog: i for i, catalog in enumerate(catalogs)}
+        summary_table["order"] = [order[name] for name in summary_table["catalog"]]
+        summary_table.sort("order")
+        summary_table.remove_column("order")
+        display_table(ctx, summary_table, title=_("ESASky catalog timing"), max_rows=-1, show_all_columns=True)
+        if stdout_results:
+            write_stdout_tables(ctx, [t for catalog in catalogs for t in stdout_results.get(catalog, [])], output_format, _("ESASky {query_type}").format(query_type=query_type))
+        if container is not None and container.names:
+            console.print(_("[green]Saved {count} catalog table(s), {rows} rows, to '{file_path}'.[/green]").format(count=len(container.names), rows=container.rows_written, file_path=container.output_file))
+        if len(errors) == len(catalogs):
+            handle_astroquery_exception(ctx, errors[0], _("ESASky {query_type}").format(query_type=query_type))
+            raise typer.Exit(code=1)
+
+    def catalogs_or_all(catalogs: Optional[List[str]]) -> List[str]:
+        if catalogs:
+            return list(dict.fromkeys(c.upper() for c in catalogs))
+        return ESASky.list_catalogs()
+
     @app.command(name="object", help=builtins._("Query ESASky catalogs for an object."))
     @global_keyboard_interrupt_handler
     def query_object_catalogs(ctx: typer.Context,
@@ -151,70 +241,34 @@ def get_app():
         ),
         output_file: Optional[str] = common_output_options["output_file"],
         output_format: Optional[str] = common_output_options["output_format"],
+        single_file: bool = typer.Option(False, "--single-file", help=builtins._("Write all catalogs into one FITS (one extension per catalog) or HDF5 file instead of one file per catalog.")),
+        concurrency: Optional[int] = common_batch_options["concurrency"],
         max_rows_display: int = typer.Option(20, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
         show_all_columns: bool = typer.Option(False, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
 test: bool = typer.Option(False, "--test", "-t", help=builtins._("Enable test mode and print elapsed time."))
     ):
-        import time
         start = time.perf_counter() if test else None
 
         console.print(_("[cyan]Querying ESASky catalogs for object: '{object_name}'...[/cyan]").format(object_name=object_name))
         try:
-            # Ensure catalogs_to_query is always a list of strings.
-            # If catalogs is None or empty, use the predefined ESASKY_CATALOGS.
-            # Otherwise, use the catalogs provided by the user.
-            catalogs_to_query = catalogs if catalogs else ["GAIA-DR3"]
-            
-            result_tables_dict: Optional[dict] = ESASky.query_object_catalogs(object_name, catalogs=catalogs_to_query)
-
-            if result_tables_dict:
-                console.print(_("[green]Found data for '{object_name}' in {count} catalog(s).[/green]").format(object_name=object_name, count=len(result_tables_dict)))
-                from astropy.table.table import Table
-                try:
-                    from astropy.table.table import TableList
-                except ImportError:
-                    TableList = None
-                try:
-                    from astroquery.utils.commons import TableList as AQTableList
-                except ImportError:
-                    AQTableList = None
-                if isinstance(result_tables_dict, dict):
-                    for cat_name, table_list in result_tables_dict.items():
-                        if table_list:
-                            table = table_list[0]
-                            display_table(ctx, table, title=_("ESASky: {cat_name} for {object_name}").format(cat_name=cat_name, object_name=object_name), max_rows=max_rows_display, show_all_columns=show_all_columns)
-                            if output_file:
-                                save_table_to_file(table, output_file.replace(".", f"_{cat_name}."), output_format, _("ESASky {cat_name} object query").format(cat_name=cat_name))
-                        else:
-                            console.print(_("[yellow]No results from catalog '{cat_name}' for '{object_name}'.[/yellow]").format(cat_name=cat_name, object_name=object_name))
-                elif (TableList is not None and isinstance(result_tables_dict, TableList)) or (AQTableList is not None and isinstance(result_tables_dict, AQTableList)):
-                    for table in result_tables_dict:
-                        display_table(ctx, table, title=_("ESASky object result"), max_rows=max_rows_display, show_all_columns=show_all_columns)
-                        if output_file:
-                            save_table_to_file(table, output_file, output_format, _("ESASky object query"))
-                    return
-                elif isinstance(result_tables_dict, Table):
-                    display_table(ctx, result_tables_dict, title=_("ESASky object result"), max_rows=max_rows_display, show_all_columns=show_all_columns)
-                    if output_file:
-                        save_table_to_file(result_tables_dict, output_file, output_format, _("ESASky object query"))
-                else:
-                    if hasattr(result_tables_dict, "tables") and hasattr(result_tables_dict, "keys"):
-                        for table in result_tables_dict:
-                            cat_name = getattr(table, "name", None) or getattr(table, "meta", {}).get("name", "Unknown")
-                            display_table(ctx, table, title=_("ESASky: {cat_name} for {object_name}").format(cat_name=cat_name, object_name=object_name), max_rows=max_rows_display, show_all_columns=show_all_columns)
-                            if output_file:
-                                save_table_to_file(table, output_file.replace(".", f"_{cat_name}."), output_format, _("ESASky {cat_name} object query").format(cat_name=cat_name))
-                        return
-                    else:
-                        console.print(_("[yellow]Unknown result type from ESASky.query_object_catalogs.[/yellow]"))
-                        debug(f"type: {type(result_tables_dict)}, value: {result_tables_dict}")
-            else:
-                console.print(_("[yellow]No catalog information found for object '{object_name}'.[/yellow]").format(object_name=object_name))
-
+            catalogs_to_query = catalogs_or_all(catalogs or ["GAIA-DR3"])
+            # Resolve through the shared name cache; ESASky resolves the name itself otherwise
+            try:
+                position = resolve_name(object_name)
+            except Exception as e:
+                debug(f"Name cache could not resolve '{object_name}' ({e}); passing the name to ESASky")
+                position = object_name
         except Exception as e:
             handle_astroquery_exception(ctx, e, _("ESASky object"))
             raise typer.Exit(code=1)
 
+        query_catalogs(
+            ctx, catalogs_to_query,
+            lambda catalog: ESASky.query_object_catalogs(position, catalogs=catalog),
+            f"'{object_name}'", _("object query"),
+            output_file, output_format, single_file, concurrency, max_rows_display, show_all_columns,
+        )
+
         if test:
             elapsed = time.perf_counter() - start
             print(f"Elapsed: {elapsed:.3f} s")
@@ -228,38 +282,36 @@ test: bool = typer.Option(False, "--test", "-t", help=builtins._("Enable test mo
         catalogs: Optional[List[str]] = typer.Option(
             None,
             "--catalog",
-            help=builtins._("Specify catalogs to query (e.g., 'XMM-Newton (XMM-SSC)', 'atnfpsr (CDA)'). Can be specified multiple times. Use 'object' command to see all available catalogs.")
+            help=builtins._("Specify catalogs to query (e.g., 'XMM-EPIC', 'HSC'). Can be specified multiple times. Default: all catalogs (see 'list').")
         ),
         output_file: Optional[str] = common_output_options["output_file"],
         output_format: Optional[str] = common_output_options["output_format"],
+        single_file: bool = typer.Option(False, "--single-file", help=builtins._("Write all catalogs into one FITS (one extension per catalog) or HDF5 file instead of one file per catalog.")),
+        concurrency: Optional[int] = common_batch_options["concurrency"],
         max_rows_display: int = typer.Option(20, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
         show_all_columns: bool = typer.Option(False, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
 test: bool = typer.Option(False, "--test", "-t", help=builtins._("Enable test mode and print elapsed time."))
     ):
-        import time
         start = time.perf_counter() if test else None
 
         console.print(_("[cyan]Querying ESASky catalogs for region: '{coordinates}' with radius '{radius}'...[/cyan]").format(coordinates=coordinates, radius=radius))
+        rad_quantity = parse_angle_str_to_quantity(ctx, radius)
+        position = parse_coordinates(ctx, coordinates)
+        if rad_quantity is None or position is None:
+            raise typer.Exit(code=1)
         try:
-            rad_quantity = parse_angle_str_to_quantity(radius)
-            result_tables_dict: Optional[dict] = ESASky.query_region_catalogs(coordinates, radius=rad_quantity, catalogs=catalogs if catalogs else None)
-
-            if result_tables_dict:
-                console.print(_("[green]Found data in {count} catalog(s) for the region.[/green]").format(count=len(result_tables_dict)))
-                for cat_name, table_list in result_tables_dict.items():
-                    if table_list:
-                        table = table_list[0]
-                        display_table(ctx, table, title=_("ESASky: {cat_name} for region").format(cat_name=cat_name), max_rows=max_rows_display, show_all_columns=show_all_columns)
-                        if output_file:
-                            save_table_to_file(table, output_file.replace(".", f"_{cat_name}."), output_format, _("ESASky {cat_name} region query").format(cat_name=cat_name))
-                    else:
-                        console.print(_("[yellow]No results from catalog '{cat_name}' for the region.[/yellow]").format(cat_name=cat_name))
-            else:
-                console.print(_("[yellow]No catalog information found for the specified region.[/yellow]"))
+            catalogs_to_query = catalogs_or_all(catalogs)
         except Exception as e:
             handle_astroquery_exception(ctx, e, _("ESASky region"))
             raise typer.Exit(code=1)
 
+        query_catalogs(
+            ctx, catalogs_to_query,
+            lambda catalog: ESASky.query_region_catalogs(position, radius=rad_quantity, catalogs=catalog),
+            _("region"), _("region query"),
+            output_file, output_format, single_file, concurrency, max_rows_display, show_all_columns,
+        )
+
         if test:
             elapsed = time.perf_counter() - start
             print(f"Elapsed: {elapsed:.3f} s")
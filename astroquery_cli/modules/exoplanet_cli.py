@@ -8,6 +8,7 @@ from ..utils import (
     display_table,
     handle_astroquery_exception,
     common_output_options,
+    common_batch_options,
     save_table_to_file,
     global_keyboard_interrupt_handler,
 )
@@ -17,6 +18,8 @@ from io import StringIO
 from contextlib import redirect_stdout
 from astroquery_cli.common_options import setup_debug_context
 from astroquery_cli.debug import debug
+from astroquery_cli.batch import resolve_batch_targets, run_batch, report_batch_failures
+from astroquery_cli import config
 
 def get_app():
     import builtins
@@ -75,7 +78,7 @@ def get_app():
     @global_keyboard_interrupt_handler
     def exoplanet_query_command(
         ctx: typer.Context,
-        planet_name: str = typer.Argument(..., help=builtins._("Planet name (e.g., 'Kepler-186 f').")),
+        planet_name: Optional[str] = typer.Argument(None, help=builtins._("Planet name (e.g., 'Kepler-186 f'). Optional with --targets-file/--stdin.")),
         output_file: Optional[str] = common_output_options["output_file"],
         output_format: Optional[str] = common_output_options["output_format"],
         max_rows_display: int = typer.Option(
@@ -83,16 +86,27 @@ def get_app():
         ),
         show_all_columns: bool = typer.Option(
             False, "--show-all-cols", help=builtins._("Show all columns in the output table.")
-        )
+        ),
+        targets_file: Optional[str] = common_batch_options["targets_file"],
+        from_stdin: bool = common_batch_options["from_stdin"],
+        concurrency: Optional[int] = common_batch_options["concurrency"],
+        rate_limit: Optional[float] = common_batch_options["rate_limit"],
+        retries: Optional[int] = common_batch_options["retries"],
     ):
         # debug and verbose options are handled by the main callback
         if ctx.obj.get("DEBUG"):
             debug(f"query_exoplanet - planet_name: {planet_name}")
 
+        targets = resolve_batch_targets(planet_name, targets_file, from_stdin)
+
         console.print(f"[cyan]{_('Querying NASA Exoplanet Archive...')}[/cyan]")
 
         try:
-            results = NasaExoplanetArchive.query_object(planet_name)
+            if targets_file or from_stdin:
+                results, failures = run_batch("exoplanet", targets, NasaExoplanetArchive.query_object, concurrency, rate_limit, description=_("Exoplanets"), retries=retries if retries is not None else config.get_batch_retries("exoplanet"))
+                report_batch_failures(failures, len(targets))
+            else:
+                results = NasaExoplanetArchive.query_object(planet_name)
 
             if results and len(results) > 0:
                 console.print(_("[green]Found {count} result(s) from NASA Exoplanet Archive.[/green]").format(count=len(results)))
@@ -2,23 +2,35 @@ from typing import Optional, List
 import typer
 from astroquery.gaia import Gaia, conf as gaia_conf
 from astropy.coordinates import SkyCoord
+from astropy.table import Table as AstropyTable
 import astropy.units as u
-from rich.console import Console
-
-console = Console()
 
 # Suppress Gaia server messages during import
 gaia_conf.show_server_messages = False
 
-from ..utils import display_table, handle_astroquery_exception, parse_coordinates, parse_angle_str_to_quantity, common_output_options, save_table_to_file
+from ..utils import console, display_table, handle_astroquery_exception, parse_coordinates, parse_coordinates_batch, parse_angle_str_to_quantity, common_output_options, common_cache_options, common_batch_options, save_table_to_file, open_table_stream, report_table_stream
+from ..cache import cached_query
+from ..batch import resolve_batch_targets, run_batch, report_batch_failures
+from ..jobs import JobStore, FINAL_PHASES, wait_for_phase
+from ..sky_partition import auto_partition_count, cone_partition_conditions, Deduplicator
+from .. import config
 from ..utils import global_keyboard_interrupt_handler
 from ..i18n import get_translator
+import os
 import re # Import re
+import time
 from io import StringIO # Import StringIO
 from contextlib import redirect_stdout # Import redirect_stdout
 from astroquery_cli.common_options import setup_debug_context # Import setup_debug_context
 from astroquery_cli.debug import debug # Import debug function
 
+def gaia_logged_in() -> bool:
+    # This astroquery version exposes the login state only on the TapPlus base
+    return bool(getattr(Gaia, "_TapPlus__isLoggedIn", False))
+
+def gaia_username() -> Optional[str]:
+    return getattr(Gaia, "_TapPlus__user", None) if gaia_logged_in() else None
+
 def get_app():
     import builtins
     _ = builtins._ # This line is fine, it just ensures _ is available in this scope
@@ -109,7 +121,7 @@ def get_app():
     @global_keyboard_interrupt_handler
     def query_object(
         ctx: typer.Context,
-        target: str = typer.Argument(..., help=builtins._("Object name or coordinates (e.g., 'M31', '10.68h +41.26d').")),
+        target: Optional[str] = typer.Argument(None, help=builtins._("Object name or coordinates (e.g., 'M31', '10.68h +41.26d'). Optional with --targets-file/--stdin.")),
         radius: str = typer.Option("5arcsec", help=builtins._("Search radius for matching Gaia source (e.g., '5arcsec', '0.001deg').")),
         table_name: str = typer.Option(
             GAIA_TABLES["main_source"],
@@ -119,41 +131,79 @@ def get_app():
         columns: Optional[List[str]] = typer.Option(None, "--col", help=builtins._("Columns to retrieve (e.g., 'source_id', 'ra', 'dec', 'parallax').")),
         output_file: Optional[str] = common_output_options["output_file"],
         output_format: Optional[str] = common_output_options["output_format"],
+        output_columns: Optional[List[str]] = common_output_options["columns"],
+        compression: Optional[str] = common_output_options["compression"],
         max_rows_display: int = typer.Option(5, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
         show_all_columns: bool = typer.Option(False, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
+        no_cache: bool = common_cache_options["no_cache"],
+        refresh: bool = common_cache_options["refresh"],
+        targets_file: Optional[str] = common_batch_options["targets_file"],
+        from_stdin: bool = common_batch_options["from_stdin"],
+        concurrency: Optional[int] = common_batch_options["concurrency"],
+        rate_limit: Optional[float] = common_batch_options["rate_limit"],
+        retries: Optional[int] = common_batch_options["retries"],
         test: bool = typer.Option(False, "--test", "-t", help=_("Enable test mode and print elapsed time."))
     ):
         import time
         start = time.perf_counter() if test else None
 
         resolved_table_name = GAIA_TABLES.get(table_name, table_name)
+        targets = resolve_batch_targets(target, targets_file, from_stdin)
         # Removed: _ = get_translator(ctx.obj.get("lang", "en") if ctx.obj else "en")
         # This line was overriding the builtins._ set by main.py
-        try:
-            coords_obj = parse_coordinates(ctx, target)
-            rad_quantity = parse_angle_str_to_quantity(ctx, radius)
-            if rad_quantity is None:
-                message = builtins._("Invalid radius provided.")
-                console.print(f"[bold red]{message}[/bold red]")
-                raise typer.Exit(code=1)
+        rad_quantity = parse_angle_str_to_quantity(ctx, radius)
+        if rad_quantity is None:
+            message = builtins._("Invalid radius provided.")
+            console.print(f"[bold red]{message}[/bold red]")
+            raise typer.Exit(code=1)
 
+        # In batch mode all targets are parsed up front in one vectorized call
+        parsed_targets = {}
+        if targets_file or from_stdin:
+            batch_coords, failed = parse_coordinates_batch(ctx, targets)
+            parsed_targets = {name: batch_coords[i] for i, name in enumerate(targets) if not failed[i]}
+
+        def fetch_object(name: str):
+            coords_obj = parsed_targets[name] if name in parsed_targets else parse_coordinates(ctx, name)
+            if coords_obj is None:
+                raise ValueError(_("Could not resolve '{target}'").format(target=name))
             query = f"""
             SELECT TOP 1 {', '.join(columns) if columns else 'source_id, ra, dec, parallax, pmra, pmdec, phot_g_mean_mag, radial_velocity'}
             FROM {resolved_table_name}
             WHERE 1=CONTAINS(POINT('ICRS', ra, dec), CIRCLE('ICRS', {coords_obj.ra.deg}, {coords_obj.dec.deg}, {rad_quantity.to(u.deg).value}))
             """
-            console.print(builtins._("[cyan]Querying Gaia for object: {target}...[/cyan]").format(target=target)) # Use builtins._
 
-            job = Gaia.launch_job(query, dump_to_file=False)
-            debug("Job launched. Getting results...")
-            result_table = job.get_results()
+            def fetch():
+                job = Gaia.launch_job(query, dump_to_file=False)
+                debug("Job launched. Getting results...")
+                return job.get_results()
+
+            return cached_query("gaia", "launch_job", {"query": " ".join(query.split())}, fetch, no_cache=no_cache, refresh=refresh)
+
+        if targets_file or from_stdin:
+            console.print(_("[cyan]Querying Gaia for {count} object(s)...[/cyan]").format(count=len(targets)))
+            result_table, failures = run_batch("gaia", targets, fetch_object, concurrency, rate_limit, description=_("Gaia objects"), retries=retries if retries is not None else config.get_batch_retries("gaia"))
+            report_batch_failures(failures, len(targets))
+            if result_table is not None and len(result_table) > 0:
+                display_table(ctx, result_table, title=_("Gaia Main Source for {count} object(s)").format(count=len(targets)), max_rows=max(max_rows_display, 20), show_all_columns=show_all_columns)
+                if output_file:
+                    save_table_to_file(ctx, result_table, output_file, output_format, _("Gaia object query"), columns=output_columns, compression=compression)
+            if test:
+                elapsed = time.perf_counter() - start
+                print(f"Elapsed: {elapsed:.3f} s")
+                raise typer.Exit()
+            return
+
+        try:
+            console.print(builtins._("[cyan]Querying Gaia for object: {target}...[/cyan]").format(target=target)) # Use builtins._
+            result_table = fetch_object(target)
             debug(f"Results retrieved. Table length: {len(result_table) if result_table is not None else 0}")
 
             if result_table is not None and len(result_table) > 0:
                 title = _("Gaia Main Source for '{target}'").format(target=target)
                 display_table(ctx, result_table, title=title, max_rows=max_rows_display, show_all_columns=show_all_columns)
                 if output_file:
-                    save_table_to_file(ctx, result_table, output_file, output_format, _("Gaia object query"))
+                    save_table_to_file(ctx, result_table, output_file, output_format, _("Gaia object query"), columns=output_columns, compression=compression)
             else:
                 console.print(_("[yellow]No Gaia source found for '{target}' in the given radius.[/yellow]").format(target=target))
 
@@ -166,6 +216,63 @@ def get_app():
             print(f"Elapsed: {elapsed:.3f} s")
             raise typer.Exit()
 
+    def partitioned_cone_search(ctx, build_query, coords_obj, radius_deg, n_partitions, table_name,
+                                row_limit, concurrency, login_user, no_cache, refresh,
+                                output_file, output_format, output_columns, compression):
+        """
+        Runs a wide cone search as `n_partitions` disjoint sub-queries in parallel,
+        dropping rows already returned by another partition (by source_id).
+        Partitions are written to `output_file` as they complete when the format
+        can be streamed. Returns (merged table, stream writer or None).
+        """
+        method, conditions = cone_partition_conditions(
+            coords_obj.ra.deg, coords_obj.dec.deg, radius_deg, n_partitions,
+            use_source_id="gaia_source" in table_name.lower(),
+        )
+        console.print(_("[cyan]Splitting the cone into {count} partition(s) by {method} (LIMIT {row_limit} each)...[/cyan]").format(count=len(conditions), method=method, row_limit=row_limit))
+        dedupe = Deduplicator("source_id")
+        truncated: List[str] = []
+
+        def fetch_partition(condition: str) -> Optional[AstropyTable]:
+            query = build_query(condition)
+            debug(f"{query.strip()}")
+            cache_params = {"query": " ".join(query.split()), "user": login_user}
+            table = cached_query(
+                "gaia", "launch_job_async", cache_params,
+                lambda: Gaia.launch_job_async(query, dump_to_file=False).get_results(),
+                no_cache=no_cache, refresh=refresh
+            )
+            if table is None:
+                return None
+            if len(table) >= row_limit:
+                truncated.append(condition)
+            return dedupe(table)
+
+        writer = open_table_stream(ctx, output_file, output_format, _("Gaia cone search"), columns=output_columns, compression=compression) if output_file else None
+        on_result = (lambda condition, table: writer.write(table)) if writer else None
+        started = time.perf_counter()
+        try:
+            result_table, failures = run_batch(
+                "gaia", conditions, fetch_partition, concurrency=concurrency,
+                description=_("Gaia partitions"), on_result=on_result, tag=False,
+            )
+        finally:
+            if writer:
+                writer.close()
+        elapsed = time.perf_counter() - started
+
+        if failures:
+            for condition, message in failures:
+                console.print(_("[bold red]Partition '{condition}' failed: {error}[/bold red]").format(condition=condition, error=message))
+            if writer and not writer.to_stdout:
+                console.print(_("[yellow]'{file}' is incomplete.[/yellow]").format(file=writer.output_file))
+            raise typer.Exit(code=1)
+        if truncated:
+            console.print(_("[yellow]{count} partition(s) reached the row limit ({row_limit}); results may be incomplete. Increase --row-limit or --partitions.[/yellow]").format(count=len(truncated), row_limit=row_limit))
+        rows = len(result_table) if result_table is not None else 0
+        console.print(_("[green]{rows} row(s) from {count} partition(s) in {elapsed:.1f} s ({dropped} duplicate(s) dropped).[/green]").format(rows=rows, count=len(conditions), elapsed=elapsed, dropped=dedupe.dropped))
+        return result_table, writer
+
     @app.command(name="cone-search", help=builtins._("Perform a cone search around a coordinate."))
     @global_keyboard_interrupt_handler
     def cone_search(ctx: typer.Context,
@@ -180,12 +287,22 @@ def get_app():
         row_limit: int = typer.Option(1000, help=builtins._("Maximum number of rows to return from the server.")),
         output_file: Optional[str] = common_output_options["output_file"],
         output_format: Optional[str] = common_output_options["output_format"],
+        output_columns: Optional[List[str]] = common_output_options["columns"],
+        compression: Optional[str] = common_output_options["compression"],
         max_rows_display: int = typer.Option(20, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
         show_all_columns: bool = typer.Option(False, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
         login_user: Optional[str] = typer.Option(None, envvar="GAIA_USER", help=builtins._("Gaia archive username (or set GAIA_USER env var).")),
         login_password: Optional[str] = typer.Option(None, envvar="GAIA_PASSWORD", help=builtins._("Gaia archive password (or set GAIA_PASSWORD env var). Prompt if user set but no password."), prompt=False, hide_input=True),
+        no_cache: bool = common_cache_options["no_cache"],
+        refresh: bool = common_cache_options["refresh"],
+        partitions: Optional[int] = typer.Option(None, "--partitions", min=1, help=builtins._("Split the cone into this many sub-queries run in parallel (default: automatic for wide cones, see [Gaia] in config.ini). Use 1 to disable.")),
+        concurrency: Optional[int] = common_batch_options["concurrency"],
         test: bool = typer.Option(False, "--test", "-t", help=_("Enable test mode and print elapsed time."))
     ):
+        """
+        Example: aqc gaia cone-search M31 --radius 10arcsec
+        Example: aqc gaia cone-search "NGC 104" --radius 1.5deg --col source_id --col ra --col dec --col phot_g_mean_mag -o 47tuc.parquet
+        """
         import time
         start = time.perf_counter() if test else None
 
@@ -202,8 +319,8 @@ def get_app():
             except Exception as e:
                 console.print(_("[bold red]Gaia login failed: {error}[/bold red]").format(error=e))
                 console.print(_("[yellow]Proceeding with anonymous access if possible.[/yellow]"))
-        elif Gaia.authenticated():
-            debug(_("Already logged into Gaia archive as '{user}'.").format(user=Gaia.credentials.username if Gaia.credentials else _('unknown user')))
+        elif gaia_logged_in():
+            debug(_("Already logged into Gaia archive as '{user}'.").format(user=gaia_username() or _('unknown user')))
         else:
             debug(_("No Gaia login credentials provided. Using anonymous access."))
 
@@ -214,25 +331,46 @@ def get_app():
                 console.print(_("[bold red]Invalid radius provided.[/bold red]"))
                 raise typer.Exit(code=1)
 
-            query = f"""
+            radius_deg = rad_quantity.to(u.deg).value
+            partition_radius, max_partitions = config.get_gaia_partition_settings()
+            n_partitions = partitions or auto_partition_count(radius_deg, partition_radius, max_partitions)
+
+            def build_query(condition: str = "") -> str:
+                return f"""
             SELECT {', '.join(columns) if columns else '*'}
             FROM {resolved_table_name}
-            WHERE 1=CONTAINS(POINT('ICRS', ra, dec), CIRCLE('ICRS', {coords_obj.ra.deg}, {coords_obj.dec.deg}, {rad_quantity.to(u.deg).value}))
+            WHERE 1=CONTAINS(POINT('ICRS', ra, dec), CIRCLE('ICRS', {coords_obj.ra.deg}, {coords_obj.dec.deg}, {radius_deg})){f" AND {condition}" if condition else ""}
             LIMIT {row_limit}
             """
-            debug(_("Executing ADQL query (first {row_limit} rows):").format(row_limit=row_limit))
-            debug(f"{query.strip()}")
 
-            job = Gaia.launch_job(query, dump_to_file=False)
-            result_table = job.get_results()
+            streamed = None
+            if n_partitions > 1:
+                result_table, streamed = partitioned_cone_search(
+                    ctx, build_query, coords_obj, radius_deg, n_partitions, resolved_table_name,
+                    row_limit, concurrency, login_user, no_cache, refresh,
+                    output_file, output_format, output_columns, compression,
+                )
+            else:
+                query = build_query()
+                debug(_("Executing ADQL query (first {row_limit} rows):").format(row_limit=row_limit))
+                debug(f"{query.strip()}")
+
+                cache_params = {"query": " ".join(query.split()), "user": login_user}
+                result_table = cached_query(
+                    "gaia", "launch_job", cache_params,
+                    lambda: Gaia.launch_job(query, dump_to_file=False).get_results(),
+                    no_cache=no_cache, refresh=refresh
+                )
 
             if result_table is not None and len(result_table) > 0:
                 title = _("Gaia Cone Search Results ({table_name})").format(table_name=resolved_table_name)
-                if Gaia.authenticated() and Gaia.credentials:
-                    title += _(" (User: {user})").format(user=Gaia.credentials.username)
+                if gaia_logged_in():
+                    title += _(" (User: {user})").format(user=gaia_username())
                 display_table(ctx, result_table, title=title, max_rows=max_rows_display, show_all_columns=show_all_columns)
-                if output_file:
-                    save_table_to_file(ctx, result_table, output_file, output_format, _("Gaia cone search"))
+                if streamed is not None:
+                    report_table_stream(streamed)
+                elif output_file:
+                    save_table_to_file(ctx, result_table, output_file, output_format, _("Gaia cone search"), columns=output_columns, compression=compression)
             else:
                 console.print(_("[yellow]No results found from Gaia for this cone search.[/yellow]"))
 
@@ -240,7 +378,7 @@ def get_app():
             handle_astroquery_exception(ctx, e, _("Gaia cone search on {table_name}").format(table_name=resolved_table_name))
             raise typer.Exit(code=1)
         finally:
-            if login_user and Gaia.authenticated():
+            if login_user and gaia_logged_in():
                 Gaia.logout()
                 debug(_("Logged out from Gaia archive."))
 
@@ -250,14 +388,150 @@ def get_app():
             raise typer.Exit()
 
 
-    @app.command(name="adql-query", help=builtins._("Execute a raw ADQL query (synchronous)."))
+    # Result formats the Gaia TAP service can produce for async jobs, by file extension
+    # (a trailing '.gz' is split off first, see gaia_result_format)
+    GAIA_ASYNC_FORMATS = {
+        ".vot": "votable",
+        ".xml": "votable",
+        ".votable": "votable",
+        ".csv": "csv",
+        ".ecsv": "ecsv",
+        ".fits": "fits",
+        ".json": "json",
+    }
+    GAIA_FORMAT_EXTENSIONS = {
+        "votable_gzip": ".vot.gz",
+        "votable": ".vot",
+        "votable_plain": ".vot",
+        "csv": ".csv",
+        "ecsv": ".ecsv",
+        "fits": ".fits",
+        "json": ".json",
+    }
+
+    def gaia_result_format(output_file: Optional[str], output_format: Optional[str]) -> Optional[str]:
+        """Returns the server-side result format matching the requested output, or None if Gaia cannot produce it."""
+        if output_format:
+            fmt = {"vot": "votable", "xml": "votable"}.get(output_format.lower(), output_format.lower())
+            return fmt if fmt in GAIA_FORMAT_EXTENSIONS else None
+        if output_file and output_file != "-":
+            name, gzipped = split_gzip_suffix(output_file.lower())
+            fmt = GAIA_ASYNC_FORMATS.get(os.path.splitext(name)[1])
+            # Only VOTable is gzipped by the server; other formats are gzipped after download
+            return "votable_gzip" if gzipped and fmt == "votable" else fmt
+        return "votable"
+
+    def split_gzip_suffix(output_file: str):
+        """'out.csv.gz' -> ('out.csv', True); 'out.csv' -> ('out.csv', False)."""
+        if output_file.lower().endswith(".gz"):
+            return output_file[:-3], True
+        return output_file, False
+
+    def base_format(result_format: Optional[str]) -> Optional[str]:
+        return "votable" if result_format in ("votable_gzip", "votable_plain") else result_format
+
+    def copy_with_gzip(src: str, dst: str, compress: bool):
+        """Copies src to dst, gzip-compressing (or decompressing) in blocks."""
+        import gzip
+        import shutil
+        opener_in, opener_out = (open, gzip.open) if compress else (gzip.open, open)
+        with opener_in(src, "rb") as fin, opener_out(dst, "wb") as fout:
+            shutil.copyfileobj(fin, fout, 1024 * 1024)
+
+    def gaia_login(login_user: Optional[str], login_password: Optional[str]):
+        if login_user and not login_password:
+            login_password = typer.prompt(_("Gaia archive password"), hide_input=True)
+        if login_user and login_password:
+            debug(_("Logging into Gaia archive as '{user}'...").format(user=login_user))
+            try:
+                Gaia.login(user=login_user, password=login_password)
+            except Exception as e:
+                console.print(_("[bold red]Gaia login failed: {error}[/bold red]").format(error=e))
+                console.print(_("[yellow]Proceeding with anonymous access if possible.[/yellow]"))
+
+    def print_job_summary(job_id: str, phase: str, job=None, wall_time: Optional[float] = None):
+        console.print(_("[bold]Job ID:[/bold] {job_id}").format(job_id=job_id))
+        console.print(_("[bold]Phase:[/bold] {phase}").format(phase=phase))
+        if job is not None:
+            for label, value in (
+                (_("Created"), job.creationTime),
+                (_("Started"), job.startTime),
+                (_("Ended"), job.endTime),
+                (_("Execution duration (s)"), job.executionDuration),
+            ):
+                if value:
+                    console.print(f"[bold]{label}:[/bold] {value}")
+        if wall_time is not None:
+            console.print(_("[bold]Wall time:[/bold] {seconds:.1f} s").format(seconds=wall_time))
+
+    def job_timings(job) -> dict:
+        return {
+            "creation_time": job.creationTime,
+            "start_time": job.startTime,
+            "end_time": job.endTime,
+            "execution_duration": job.executionDuration,
+        }
+
+    def wait_for_gaia_job(job, store: JobStore) -> str:
+        with console.status(_("[cyan]Waiting for Gaia job {job_id}...[/cyan]").format(job_id=job.jobid)) as status:
+            def on_update(phase: str, elapsed: float):
+                status.update(_("[cyan]Gaia job {job_id}: {phase} ({elapsed:.0f} s)[/cyan]").format(job_id=job.jobid, phase=phase, elapsed=elapsed))
+                store.save("gaia", job.jobid, phase=phase)
+            return wait_for_phase(lambda: job.get_phase(update=True), on_update)
+
+    def download_gaia_job(ctx: typer.Context, job, output_file: str, result_format: str, store: JobStore):
+        """
+        Streams the job's result file from the server to disk. A '.gz' target
+        of a non-gzipped result (or the reverse) is (de)compressed locally; a
+        target in another format is converted through an astropy table.
+        """
+        path = os.path.abspath(os.path.expanduser(output_file))
+        inner_path, want_gzip = split_gzip_suffix(path)
+        target_format = gaia_result_format(path, None)
+        if base_format(target_format) != base_format(result_format):
+            if target_format == "json":
+                console.print(_("[bold red]Gaia job {job_id} produced {source} results, which cannot be converted to JSON locally. Save them as {extension} instead.[/bold red]").format(job_id=job.jobid, source=result_format, extension=GAIA_FORMAT_EXTENSIONS.get(result_format, ".vot.gz")))
+                raise typer.Exit(code=1)
+            console.print(_("[yellow]Job {job_id} produced {source} results; converting them for '{path}'.[/yellow]").format(job_id=job.jobid, source=result_format, path=path))
+            table_format = "votable" if base_format(target_format) == "votable" else None
+            save_table_to_file(ctx, job.get_results(), inner_path, table_format, _("Gaia job {job_id}").format(job_id=job.jobid))
+            if not os.path.exists(inner_path):
+                raise typer.Exit(code=1)
+            if want_gzip:
+                copy_with_gzip(inner_path, path, compress=True)
+                os.unlink(inner_path)
+                console.print(_("[green]Compressed to '{path}'.[/green]").format(path=path))
+            store.save("gaia", job.jobid, output_file=path, downloaded=True)
+            return
+        console.print(_("[cyan]Downloading results of job {job_id} to '{path}'...[/cyan]").format(job_id=job.jobid, path=path))
+        start_time = time.perf_counter()
+        server_gzip = result_format == "votable_gzip"
+        download_path = path if server_gzip == want_gzip else path + ".part"
+        job.outputFileUser = download_path
+        job.outputFile = download_path
+        job.save_results()
+        if download_path != path:
+            try:
+                copy_with_gzip(download_path, path, compress=want_gzip)
+            finally:
+                os.unlink(download_path)
+        elapsed = time.perf_counter() - start_time
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        store.save("gaia", job.jobid, output_file=path, downloaded=True)
+        console.print(_("[green]Saved {size:.1f} MB to '{path}' in {elapsed:.1f} s.[/green]").format(size=size_mb, path=path, elapsed=elapsed))
+
+    @app.command(name="adql-query", help=builtins._("Execute a raw ADQL query (synchronous, or an asynchronous TAP job with --async)."))
     @global_keyboard_interrupt_handler
     def adql_query(ctx: typer.Context,
         query: str = typer.Argument(..., help=builtins._("The ADQL query string.")),
         output_file: Optional[str] = common_output_options["output_file"],
         output_format: Optional[str] = common_output_options["output_format"],
+        output_columns: Optional[List[str]] = common_output_options["columns"],
+        compression: Optional[str] = common_output_options["compression"],
         max_rows_display: int = typer.Option(20, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
         show_all_columns: bool = typer.Option(False, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
+        async_mode: bool = typer.Option(False, "--async", help=builtins._("Run as an asynchronous TAP job (no sync row cap). The job is recorded in ~/.aqc/jobs and results in a server-supported format are streamed to disk.")),
+        no_wait: bool = typer.Option(False, "--no-wait", help=builtins._("With --async, submit the job and return immediately. Use 'aqc gaia jobs status/fetch' later.")),
         login_user: Optional[str] = typer.Option(None, envvar="GAIA_USER", help=builtins._("Gaia archive username (or set GAIA_USER env var).")),
         login_password: Optional[str] = typer.Option(None, envvar="GAIA_PASSWORD", help=builtins._("Gaia archive password (or set GAIA_PASSWORD env var). Prompt if user set but no password."), prompt=False, hide_input=True),
 test: bool = typer.Option(False, "--test", "-t", help=builtins._("Enable test mode and print elapsed time."))
@@ -268,40 +542,83 @@ test: bool = typer.Option(False, "--test", "-t", help=builtins._("Enable test mo
         console.print(_("[cyan]Executing Gaia ADQL query...[/cyan]"))
         debug(f"{query}")
 
-        if login_user and not login_password:
-            login_password = typer.prompt(_("Gaia archive password"), hide_input=True)
-
-        if login_user and login_password:
-            debug(_("Logging into Gaia archive as '{user}'...").format(user=login_user))
-            try:
-                Gaia.login(user=login_user, password=login_password)
-            except Exception as e:
-                console.print(_("[bold red]Gaia login failed: {error}[/bold red]").format(error=e))
-                console.print(_("[yellow]Proceeding with anonymous access if possible.[/yellow]"))
-        elif Gaia.authenticated():
-            debug(_("Already logged into Gaia archive as '{user}'.").format(user=Gaia.credentials.username if Gaia.credentials else _('unknown user')))
+        if login_user:
+            gaia_login(login_user, login_password)
+        elif gaia_logged_in():
+            debug(_("Already logged into Gaia archive as '{user}'.").format(user=gaia_username() or _('unknown user')))
 
         try:
-            job = Gaia.launch_job(query, dump_to_file=False)
-            result_table = job.get_results()
+            if async_mode:
+                # Results go straight to disk when Gaia can produce the requested
+                # format and no client-side projection is needed.
+                server_format = gaia_result_format(output_file, output_format)
+                stream_to_disk = bool(output_file) and output_file != "-" and server_format is not None and not output_columns
+                store = JobStore()
+                job = Gaia.launch_job_async(query, background=True, dump_to_file=False, output_format=server_format if stream_to_disk else "votable_gzip")
+                job_id = job.jobid
+                user = gaia_username()
+                store.save(
+                    "gaia", job_id,
+                    query=query,
+                    phase=job.get_phase(),
+                    result_format=server_format if stream_to_disk else "votable_gzip",
+                    output_file=os.path.abspath(os.path.expanduser(output_file)) if stream_to_disk else None,
+                    user=user,
+                    remote_location=job.remoteLocation,
+                )
+                console.print(_("[green]Submitted Gaia async job {job_id}.[/green]").format(job_id=job_id))
+                if no_wait:
+                    print_job_summary(job_id, job.get_phase())
+                    console.print(_("[cyan]Check it with 'aqc gaia jobs status {job_id}' and download with 'aqc gaia jobs fetch {job_id}'.[/cyan]").format(job_id=job_id))
+                    return
+
+                wait_start = time.perf_counter()
+                phase = wait_for_gaia_job(job, store)
+                try:
+                    loaded = Gaia.load_async_job(jobid=job_id, load_results=False)
+                    store.save("gaia", job_id, phase=phase, **job_timings(loaded))
+                except Exception as e:
+                    debug(f"Could not reload job {job_id} for timings: {e}")
+                    loaded = None
+                print_job_summary(job_id, phase, loaded, wall_time=time.perf_counter() - wait_start)
+                if phase != "COMPLETED":
+                    console.print(_("[bold red]Gaia job {job_id} ended in phase {phase}.[/bold red]").format(job_id=job_id, phase=phase))
+                    if phase == "ERROR":
+                        try:
+                            console.print(f"[red]{job.get_error()}[/red]")
+                        except Exception:
+                            pass
+                    raise typer.Exit(code=1)
+
+                if stream_to_disk:
+                    download_gaia_job(ctx, job, output_file, server_format, store)
+                    return
+                if output_file and (compression or output_columns or server_format is None):
+                    debug("Loading async results into memory for client-side conversion")
+                result_table = job.get_results()
+            else:
+                job = Gaia.launch_job(query, dump_to_file=False)
+                result_table = job.get_results()
 
             if result_table is not None and len(result_table) > 0:
                 title = _("Gaia ADQL Query Results")
-                if Gaia.authenticated() and Gaia.credentials:
-                    title += _(" (User: {user})").format(user=Gaia.credentials.username)
+                if gaia_logged_in():
+                    title += _(" (User: {user})").format(user=gaia_username())
                 display_table(ctx, result_table, title=title, max_rows=max_rows_display, show_all_columns=show_all_columns)
                 if output_file:
-                    save_table_to_file(ctx, result_table, output_file, output_format, _("Gaia ADQL query"))
+                    save_table_to_file(ctx, result_table, output_file, output_format, _("Gaia ADQL query"), columns=output_columns, compression=compression)
             else:
                 console.print(_("[yellow]ADQL query returned no results or an empty table.[/yellow]"))
 
+        except typer.Exit:
+            raise
         except Exception as e:
             handle_astroquery_exception(ctx, e, _("Gaia ADQL query"))
             if "ERROR:" in str(e):
                 console.print(_("[bold red]ADQL Query Error Details from server:\n{error_details}[/bold red]").format(error_details=str(e)))
             raise typer.Exit(code=1)
         finally:
-            if login_user and Gaia.authenticated():
+            if login_user and gaia_logged_in():
                 Gaia.logout()
                 debug(_("Logged out from Gaia archive."))
 
@@ -309,5 +626,114 @@ test: bool = typer.Option(False, "--test", "-t", help=builtins._("Enable test mo
             elapsed = time.perf_counter() - start
             print(f"Elapsed: {elapsed:.3f} s")
             raise typer.Exit()
- 
+
+    jobs_app = typer.Typer(
+        name="jobs",
+        help=builtins._("Manage asynchronous Gaia jobs submitted with 'adql-query --async'."),
+        no_args_is_help=True
+    )
+
+    @jobs_app.command(name="list", help=builtins._("List Gaia jobs recorded in ~/.aqc/jobs."))
+    @global_keyboard_interrupt_handler
+    def list_jobs(ctx: typer.Context,
+        max_rows_display: int = typer.Option(20, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
+    ):
+        records = JobStore().list("gaia")
+        if not records:
+            console.print(_("[yellow]No Gaia jobs recorded yet.[/yellow]"))
+            return
+        jobs_table = AstropyTable(
+            rows=[
+                (
+                    r.get("job_id", ""),
+                    r.get("phase", ""),
+                    r.get("created", ""),
+                    r.get("updated", ""),
+                    r.get("execution_duration") or "",
+                    r.get("output_file") or "",
+                    (r.get("query", "")[:60] + "...") if len(r.get("query", "")) > 60 else r.get("query", ""),
+                )
+                for r in records
+            ],
+            names=("job_id", "phase", "created", "updated", "duration", "output_file", "query"),
+        )
+        display_table(ctx, jobs_table, title=_("Gaia Jobs"), max_rows=max_rows_display, show_all_columns=True)
+
+    @jobs_app.command(name="status", help=builtins._("Show the current phase and timings of a Gaia job."))
+    @global_keyboard_interrupt_handler
+    def job_status(ctx: typer.Context,
+        job_id: str = typer.Argument(..., help=builtins._("Job ID (see 'aqc gaia jobs list').")),
+        login_user: Optional[str] = typer.Option(None, envvar="GAIA_USER", help=builtins._("Gaia archive username (or set GAIA_USER env var).")),
+        login_password: Optional[str] = typer.Option(None, envvar="GAIA_PASSWORD", help=builtins._("Gaia archive password (or set GAIA_PASSWORD env var)."), prompt=False, hide_input=True),
+    ):
+        store = JobStore()
+        gaia_login(login_user, login_password)
+        try:
+            job = Gaia.load_async_job(jobid=job_id, load_results=False)
+            if job is None:
+                console.print(_("[bold red]Gaia job {job_id} not found on the server.[/bold red]").format(job_id=job_id))
+                raise typer.Exit(code=1)
+            phase = str(job.get_phase(update=True)).upper().strip()
+            store.save("gaia", job_id, phase=phase, **job_timings(job))
+            print_job_summary(job_id, phase, job)
+            record = store.load("gaia", job_id)
+            if record and record.get("query"):
+                console.print(_("[bold]Query:[/bold] {query}").format(query=record["query"]))
+        except typer.Exit:
+            raise
+        except Exception as e:
+            handle_astroquery_exception(ctx, e, _("Gaia job status"))
+            raise typer.Exit(code=1)
+        finally:
+            if login_user and gaia_logged_in():
+                Gaia.logout()
+
+    @jobs_app.command(name="fetch", help=builtins._("Wait for a Gaia job if needed and stream its results to disk."))
+    @global_keyboard_interrupt_handler
+    def job_fetch(ctx: typer.Context,
+        job_id: str = typer.Argument(..., help=builtins._("Job ID (see 'aqc gaia jobs list').")),
+        output_file: Optional[str] = typer.Option(None, "--output-file", "-o", help=builtins._("Where to save the results. Default: the file given at submission, or gaia_<job_id> with the job's format extension.")),
+        no_wait: bool = typer.Option(False, "--no-wait", help=builtins._("Do not wait if the job is still running.")),
+        login_user: Optional[str] = typer.Option(None, envvar="GAIA_USER", help=builtins._("Gaia archive username (or set GAIA_USER env var).")),
+        login_password: Optional[str] = typer.Option(None, envvar="GAIA_PASSWORD", help=builtins._("Gaia archive password (or set GAIA_PASSWORD env var)."), prompt=False, hide_input=True),
+    ):
+        store = JobStore()
+        record = store.load("gaia", job_id) or {}
+        gaia_login(login_user, login_password)
+        try:
+            job = Gaia.load_async_job(jobid=job_id, load_results=False)
+            if job is None:
+                console.print(_("[bold red]Gaia job {job_id} not found on the server.[/bold red]").format(job_id=job_id))
+                raise typer.Exit(code=1)
+            phase = str(job.get_phase(update=True)).upper().strip()
+            if phase not in FINAL_PHASES:
+                if no_wait:
+                    store.save("gaia", job_id, phase=phase)
+                    print_job_summary(job_id, phase, job)
+                    console.print(_("[yellow]Job is still running; try again later.[/yellow]"))
+                    return
+                phase = wait_for_gaia_job(job, store)
+                job = Gaia.load_async_job(jobid=job_id, load_results=False)
+            store.save("gaia", job_id, phase=phase, **job_timings(job))
+            print_job_summary(job_id, phase, job)
+            if phase != "COMPLETED":
+                console.print(_("[bold red]Gaia job {job_id} ended in phase {phase}; no results to fetch.[/bold red]").format(job_id=job_id, phase=phase))
+                raise typer.Exit(code=1)
+
+            result_format = record.get("result_format", "votable_gzip")
+            target = output_file or record.get("output_file")
+            if not target:
+                target = f"gaia_{job_id}{GAIA_FORMAT_EXTENSIONS.get(result_format, '.vot.gz')}"
+            download_gaia_job(ctx, job, target, result_format, store)
+        except typer.Exit:
+            raise
+        except Exception as e:
+            handle_astroquery_exception(ctx, e, _("Gaia job fetch"))
+            raise typer.Exit(code=1)
+        finally:
+            if login_user and gaia_logged_in():
+                Gaia.logout()
+
+    app.add_typer(jobs_app, name="jobs")
+
     return app
@@ -8,15 +8,33 @@ from ..utils import (
     display_table,
     handle_astroquery_exception,
     common_output_options,
+    common_cache_options,
+    parse_column_list,
     save_table_to_file,
     global_keyboard_interrupt_handler,
 )
 import os
 import re
+import time
 from io import StringIO
 from contextlib import redirect_stdout
 from astroquery_cli.common_options import setup_debug_context
 from astroquery_cli.debug import debug
+from astroquery_cli.http_session import get_shared_session, use_shared_pool
+from astroquery_cli.heasarc_index import get_catalog_index
+from astroquery_cli.heasarc_tap import (
+    AdqlValidationError,
+    CatalogColumns,
+    build_adql,
+    check_where,
+    cone_query,
+    is_votable_output,
+    order_by_clause,
+    select_list,
+    stream_to_file,
+)
+from astroquery_cli.jobs import FINAL_PHASES, JobStore, wait_for_phase
+from pyvo.dal import AsyncTAPJob
 
 def get_app():
     import builtins
@@ -91,6 +109,50 @@ def get_app():
         # If a subcommand was invoked or -h/--help was provided, let Typer handle it.
         # The options defined in this callback will be part of the full help.
 
+    def resolve_catalog(heasarc: Heasarc, mission: str, refresh: bool) -> Optional[str]:
+        """Exact (case-insensitive) table name, or a unique prefix match; prints suggestions otherwise."""
+        index, _stored = get_catalog_index(heasarc, refresh=refresh)
+        catalog_name = index.resolve(mission)
+        if catalog_name is not None:
+            return catalog_name
+        candidates = index.with_prefix(mission)
+        if len(candidates) == 1:
+            console.print(_("[cyan]Using HEASARC catalog '{catalog}' for '{mission}'.[/cyan]").format(catalog=candidates[0], mission=mission))
+            return candidates[0]
+        console.print(_("[red]Error: Mission '{mission}' not found in HEASARC catalogs. Use 'heasarc list' to see available missions.[/red]").format(mission=mission))
+        suggestions = index.suggest(mission)
+        if suggestions:
+            console.print(_("[yellow]Did you mean: {names}?[/yellow]").format(names=", ".join(suggestions)))
+        return None
+
+    def print_heasarc_job(job_id: str, phase: str, record: Optional[dict] = None):
+        console.print(_("[bold]Job ID:[/bold] {job_id}").format(job_id=job_id))
+        console.print(_("[bold]Phase:[/bold] {phase}").format(phase=phase))
+        if record and record.get("query"):
+            console.print(_("[bold]Query:[/bold] {query}").format(query=record["query"]))
+
+    def wait_for_heasarc_job(job, store: JobStore) -> str:
+        with console.status(_("[cyan]Waiting for HEASARC job {job_id}...[/cyan]").format(job_id=job.job_id)) as status:
+            def on_update(phase: str, elapsed: float):
+                status.update(_("[cyan]HEASARC job {job_id}: {phase} ({elapsed:.0f} s)[/cyan]").format(job_id=job.job_id, phase=phase, elapsed=elapsed))
+                store.save("heasarc", job.job_id, phase=phase)
+            return wait_for_phase(lambda: job.phase, on_update)
+
+    def download_heasarc_job(job, output_file: str, store: JobStore):
+        """Copies the job's VOTable result from the server straight to disk."""
+        path = os.path.abspath(os.path.expanduser(output_file))
+        console.print(_("[cyan]Downloading results of job {job_id} to '{path}'...[/cyan]").format(job_id=job.job_id, path=path))
+        start_time = time.perf_counter()
+        with get_shared_session().get(job.result_uri, stream=True, timeout=300) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            size = stream_to_file(response.raw, path)
+        store.save("heasarc", job.job_id, output_file=path, downloaded=True)
+        report_streamed_file(path, size, time.perf_counter() - start_time)
+
+    def report_streamed_file(path: str, size: int, elapsed: float):
+        console.print(_("[green]Saved {size:.1f} MB to '{path}' in {elapsed:.1f} s.[/green]").format(size=size / (1024 * 1024), path=path, elapsed=elapsed))
+
     @app.command(name="query", help=builtins._("Query a specific HEASARC mission. Use 'heasarc list' to see available missions."))
     @global_keyboard_interrupt_handler
     def query_heasarc_mission(
@@ -99,8 +161,24 @@ def get_app():
         ra: Optional[float] = typer.Option(None, help=builtins._("Right Ascension in degrees.")),
         dec: Optional[float] = typer.Option(None, help=builtins._("Declination in degrees.")),
         radius: Optional[float] = typer.Option(None, help=builtins._("Search radius in degrees (for cone search).")),
+        select_columns: Optional[List[str]] = typer.Option(
+            None, "--columns", help=builtins._("Columns to select on the server (comma-separated or repeated; '*' for all). Checked against the catalog schema.")
+        ),
+        where: Optional[str] = typer.Option(
+            None, "--where", help=builtins._("ADQL predicate applied on the server, e.g. \"flux > 1e-13 AND name LIKE 'PSR%'\". Column names are checked against the catalog schema.")
+        ),
+        order_by: Optional[List[str]] = typer.Option(
+            None, "--order-by", help=builtins._("Sort on the server, e.g. 'flux desc' (comma-separated or repeated).")
+        ),
+        async_mode: bool = typer.Option(
+            False, "--async", help=builtins._("Run as an asynchronous TAP job (recorded in ~/.aqc/jobs). VOTable output is streamed to disk.")
+        ),
+        no_wait: bool = typer.Option(
+            False, "--no-wait", help=builtins._("With --async, submit the job and return immediately. Use 'aqc heasarc jobs status/fetch' later.")
+        ),
         output_file: Optional[str] = common_output_options["output_file"],
         output_format: Optional[str] = common_output_options["output_format"],
+        compression: Optional[str] = common_output_options["compression"],
         max_rows_display: int = typer.Option(
             25, "--max-rows-display", help=builtins._("Maximum number of rows to display. Use -1 for all rows.")
         ),
@@ -110,38 +188,31 @@ def get_app():
         max_rows: int = typer.Option(
             100, "--max-rows", help=builtins._("Maximum number of rows to retrieve from the HEASARC database. Use -1 for all rows.")
         ),
+        refresh: bool = common_cache_options["refresh"],
     ):
+        """
+        Example: aqc heasarc query xmmssc --columns name,ra,dec,ep_8_flux --where "ep_8_flux > 1e-12" --order-by "ep_8_flux desc"
+        Example: aqc heasarc query xmmssc --max-rows -1 --async -o xmmssc.vot
+        """
         # Debug context is set up by the heasarc_callback
-        heasarc = Heasarc() # Instantiate Heasarc here for all operations
+        heasarc = use_shared_pool(Heasarc()) # Instantiate Heasarc here for all operations
 
         console.print(f"[cyan]{_('Querying HEASARC mission: {mission}...').format(mission=mission)}[/cyan]")
 
         try:
-            # Get the actual catalog name from the mission list
-            catalogs = heasarc.list_catalogs()
-            
-            catalog_name = None
-            search_mission_upper = mission.strip().upper()
-
-            # Specific mapping for 'atnfpsr' to 'atnfpulsar'
-            if search_mission_upper == 'ATNFPSR':
-                catalog_name = 'atnfpulsar'
-            else:
-                for row in catalogs:
-                    # Use 'name' as the primary key for catalog/table name
-                    if 'name' in row and row['name'].strip().upper() == search_mission_upper:
-                        catalog_name = row['name']
-                        break
-                    # Fallback to 'Table' or 'CATALOG' if 'name' is not present or doesn't match
-                    elif 'Table' in row and row['Table'].strip().upper() == search_mission_upper:
-                        catalog_name = row['Table']
-                        break
-                    elif 'CATALOG' in row and row['CATALOG'].strip().upper() == search_mission_upper:
-                        catalog_name = row['CATALOG']
-                        break
-            
+            catalog_name = resolve_catalog(heasarc, mission, refresh)
             if catalog_name is None:
-                console.print(_(f"[red]Error: Mission '{mission}' not found in HEASARC catalogs. Use 'heasarc list' to see available missions.[/red]"))
+                raise typer.Exit(code=1)
+
+            # Column names in --columns, --where and --order-by are checked against the stored schema
+            index, _stored = get_catalog_index(heasarc)
+            schema = CatalogColumns(catalog_name, index.columns(catalog_name)) if index.columns(catalog_name) else None
+            try:
+                select = select_list(parse_column_list(select_columns), schema)
+                predicate = check_where(where, schema) if where else None
+                ordering = order_by_clause(order_by, schema)
+            except AdqlValidationError as e:
+                console.print(f"[red]Error: {e}[/red]")
                 raise typer.Exit(code=1)
 
             # Set maxrec for query
@@ -151,23 +222,60 @@ def get_app():
                 if radius is None:
                     console.print(_("[red]Error: --radius is required when --ra and --dec are provided for a cone search.[/red]"))
                     raise typer.Exit(code=1)
-                adql_query = heasarc.query_region(ra=ra, dec=dec, radius=radius, catalog=catalog_name, get_query_payload=True, maxrec=maxrec_value)
-                console.print(f"[debug] ADQL Query (cone): {adql_query}")
-                results = heasarc.query_region(ra=ra, dec=dec, radius=radius, catalog=catalog_name, maxrec=maxrec_value)
+                base_query = cone_query(heasarc, catalog_name, ra, dec, radius, columns=select if select_columns else None)
+            else:
+                base_query = f"SELECT {select} FROM {catalog_name}"
+            adql_query = build_adql(base_query, predicate, ordering)
+            debug(f"HEASARC ADQL: {adql_query}")
+
+            # VOTable output is copied to disk as the server sends it, without parsing
+            stream_to_disk = is_votable_output(output_file, output_format) and not compression
+            if async_mode:
+                store = JobStore()
+                job = heasarc.tap.submit_job(adql_query, maxrec=maxrec_value)
+                job.run()
+                job_id = job.job_id
+                store.save(
+                    "heasarc", job_id,
+                    query=adql_query,
+                    catalog=catalog_name,
+                    url=job.url,
+                    phase=job.phase,
+                    output_file=os.path.abspath(os.path.expanduser(output_file)) if stream_to_disk else None,
+                )
+                console.print(_("[green]Submitted HEASARC async job {job_id}.[/green]").format(job_id=job_id))
+                if no_wait:
+                    console.print(_("[cyan]Check it with 'aqc heasarc jobs status {job_id}' and download with 'aqc heasarc jobs fetch {job_id}'.[/cyan]").format(job_id=job_id))
+                    return
+                phase = wait_for_heasarc_job(job, store)
+                if phase != "COMPLETED":
+                    console.print(_("[bold red]HEASARC job {job_id} ended in phase {phase}.[/bold red]").format(job_id=job_id, phase=phase))
+                    job.raise_if_error()
+                    raise typer.Exit(code=1)
+                if stream_to_disk:
+                    download_heasarc_job(job, output_file, store)
+                    return
+                results = job.fetch_result().to_table()
+            elif stream_to_disk:
+                start_time = time.perf_counter()
+                path = os.path.abspath(os.path.expanduser(output_file))
+                console.print(_("[cyan]Streaming HEASARC results to '{path}'...[/cyan]").format(path=path))
+                size = stream_to_file(heasarc.tap.create_query(adql_query, maxrec=maxrec_value).execute_stream(post=True), path)
+                report_streamed_file(path, size, time.perf_counter() - start_time)
+                return
             else:
-                # Use query_tap for all-sky queries with the correct catalog name
-                adql_query_string = f"SELECT * FROM {catalog_name}"
-                console.print(f"[debug] ADQL Query (all-sky): {adql_query_string}")
-                results = heasarc.query_tap(query=adql_query_string, maxrec=maxrec_value)
+                results = heasarc.query_tap(query=adql_query, maxrec=maxrec_value).to_table()
 
             if results and len(results) > 0:
                 console.print(_("[green]Found {count} result(s) from HEASARC.[/green]").format(count=len(results)))
                 display_table(ctx, results, title=_("HEASARC Query Results"), max_rows=max_rows_display, show_all_columns=show_all_columns)
                 if output_file:
-                    save_table_to_file(ctx, results, output_file, output_format, _("HEASARC query"))
+                    save_table_to_file(ctx, results, output_file, output_format, _("HEASARC query"), compression=compression)
             else:
                 console.print(_("[yellow]No results found for your HEASARC query.[/yellow]"))
 
+        except typer.Exit:
+            raise
         except Exception as e:
             handle_astroquery_exception(ctx, e, _("HEASARC query"))
             raise typer.Exit(code=1)
@@ -185,33 +293,23 @@ def get_app():
         prefix: Optional[str] = typer.Option(
             None, "--prefix", "-p", help=builtins._("Filter missions by a starting prefix (e.g., 'atnfpsr').")
         ),
+        refresh: bool = common_cache_options["refresh"],
     ):
         debug(f"list_heasarc_missions: max_rows_display={max_rows_display}, show_all_columns={show_all_columns}, prefix={prefix}")
-        heasarc = Heasarc()
+        heasarc = use_shared_pool(Heasarc())
         console.print(f"[cyan]{_('Listing HEASARC missions...')}[/cyan]")
         try:
-            missions_table = heasarc.list_catalogs()
-            
+            index, _stored = get_catalog_index(heasarc, refresh=refresh)
             if prefix:
-                original_count = len(missions_table)
-                # Determine the correct column name for filtering
-                mission_name_column = None
-                if 'name' in missions_table.colnames:
-                    mission_name_column = 'name'
-                elif 'Table' in missions_table.colnames:
-                    mission_name_column = 'Table'
-                elif 'CATALOG' in missions_table.colnames:
-                    mission_name_column = 'CATALOG'
-                
-                if mission_name_column:
-                    # Apply the filter using boolean indexing
-                    mask = [str(name).lower().startswith(prefix.lower()) for name in missions_table[mission_name_column]]
-                    missions_table = missions_table[mask]
-                else:
-                    # If no suitable column is found, log a warning or handle appropriately
-                    debug("Could not find a suitable mission name column ('name', 'Table', or 'CATALOG') for filtering.")
-
-                console.print(_("[cyan]Filtered from {original_count} to {filtered_count} missions with prefix \"{prefix}\".[/cyan]").format(original_count=original_count, filtered_count=len(missions_table), prefix=prefix))
+                names = index.with_prefix(prefix)
+                console.print(_("[cyan]Filtered from {original_count} to {filtered_count} missions with prefix \"{prefix}\".[/cyan]").format(original_count=len(index.catalogs), filtered_count=len(names), prefix=prefix))
+                if not names:
+                    suggestions = index.suggest(prefix)
+                    if suggestions:
+                        console.print(_("[yellow]Did you mean: {names}?[/yellow]").format(names=", ".join(suggestions)))
+                missions_table = index.table(names)
+            else:
+                missions_table = index.table()
 
             if missions_table:
                 display_table(ctx, missions_table, title=_("Available HEASARC Missions"), max_rows=max_rows_display, show_all_columns=show_all_columns)
@@ -220,4 +318,88 @@ def get_app():
         except Exception as e:
             handle_astroquery_exception(ctx, e, _("HEASARC list missions"))
             raise typer.Exit(code=1)
+
+    jobs_app = typer.Typer(
+        name="jobs",
+        help=builtins._("Manage asynchronous HEASARC jobs submitted with 'query --async'."),
+        no_args_is_help=True
+    )
+
+    def load_heasarc_job(job_id: str, store: JobStore):
+        record = store.load("heasarc", job_id)
+        if not record or not record.get("url"):
+            console.print(_("[bold red]No record of HEASARC job {job_id}; see 'aqc heasarc jobs list'.[/bold red]").format(job_id=job_id))
+            raise typer.Exit(code=1)
+        return AsyncTAPJob(record["url"], session=get_shared_session(), delete=False), record
+
+    @jobs_app.command(name="list", help=builtins._("List HEASARC jobs recorded in ~/.aqc/jobs."))
+    @global_keyboard_interrupt_handler
+    def list_jobs(ctx: typer.Context,
+        max_rows_display: int = typer.Option(20, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
+    ):
+        records = JobStore().list("heasarc")
+        if not records:
+            console.print(_("[yellow]No HEASARC jobs recorded yet.[/yellow]"))
+            return
+        jobs_table = AstropyTable(
+            rows=[
+                (
+                    r.get("job_id", ""),
+                    r.get("phase", ""),
+                    r.get("created", ""),
+                    r.get("catalog", ""),
+                    r.get("output_file") or "",
+                    (r.get("query", "")[:60] + "...") if len(r.get("query", "")) > 60 else r.get("query", ""),
+                )
+                for r in records
+            ],
+            names=("job_id", "phase", "created", "catalog", "output_file", "query"),
+        )
+        display_table(ctx, jobs_table, title=_("HEASARC Jobs"), max_rows=max_rows_display, show_all_columns=True)
+
+    @jobs_app.command(name="status", help=builtins._("Show the current phase of a HEASARC job."))
+    @global_keyboard_interrupt_handler
+    def job_status(ctx: typer.Context,
+        job_id: str = typer.Argument(..., help=builtins._("Job ID (see 'aqc heasarc jobs list').")),
+    ):
+        store = JobStore()
+        try:
+            job, record = load_heasarc_job(job_id, store)
+            phase = str(job.phase).upper()
+            print_heasarc_job(job_id, phase, store.save("heasarc", job_id, phase=phase))
+        except typer.Exit:
+            raise
+        except Exception as e:
+            handle_astroquery_exception(ctx, e, _("HEASARC job status"))
+            raise typer.Exit(code=1)
+
+    @jobs_app.command(name="fetch", help=builtins._("Wait for a HEASARC job if needed and stream its VOTable result to disk."))
+    @global_keyboard_interrupt_handler
+    def job_fetch(ctx: typer.Context,
+        job_id: str = typer.Argument(..., help=builtins._("Job ID (see 'aqc heasarc jobs list').")),
+        output_file: Optional[str] = typer.Option(None, "--output-file", "-o", help=builtins._("Where to save the results. Default: the file given at submission, or heasarc_<job_id>.vot.")),
+        no_wait: bool = typer.Option(False, "--no-wait", help=builtins._("Do not wait if the job is still running.")),
+    ):
+        store = JobStore()
+        try:
+            job, record = load_heasarc_job(job_id, store)
+            phase = str(job.phase).upper()
+            if phase not in FINAL_PHASES:
+                if no_wait:
+                    print_heasarc_job(job_id, phase, store.save("heasarc", job_id, phase=phase))
+                    console.print(_("[yellow]Job is still running; try again later.[/yellow]"))
+                    return
+                phase = wait_for_heasarc_job(job, store)
+            print_heasarc_job(job_id, phase, store.save("heasarc", job_id, phase=phase))
+            if phase != "COMPLETED":
+                console.print(_("[bold red]HEASARC job {job_id} ended in phase {phase}; no results to fetch.[/bold red]").format(job_id=job_id, phase=phase))
+                raise typer.Exit(code=1)
+            download_heasarc_job(job, output_file or record.get("output_file") or f"heasarc_{job_id}.vot", store)
+        except typer.Exit:
+            raise
+        except Exception as e:
+            handle_astroquery_exception(ctx, e, _("HEASARC job fetch"))
+            raise typer.Exit(code=1)
+
+    app.add_typer(jobs_app, name="jobs")
     return app
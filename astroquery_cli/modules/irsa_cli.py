@@ -15,14 +15,22 @@ from ..utils import (
     display_table,
     handle_astroquery_exception,
     common_output_options,
+    common_batch_options,
     save_table_to_file,
+    open_table_stream,
+    report_table_stream,
+    use_stderr_for_messages,
     parse_coordinates,
+    parse_coordinates_batch,
     parse_angle_str_to_quantity,
     global_keyboard_interrupt_handler
 )
 from ..i18n import get_translator
 from astroquery_cli.common_options import setup_debug_context # Added for dust
 from astroquery_cli.debug import debug # Added for dust
+from astroquery_cli import config
+from astroquery_cli.http_session import use_shared_pool
+from astroquery_cli.batch import resolve_batch_targets, run_batch, call_with_retry, AlignedTableStream
 
 def get_app():
     import builtins
@@ -113,6 +121,9 @@ def get_app():
 
 
     Irsa.ROW_LIMIT = 500
+    use_shared_pool(Irsa)
+    use_shared_pool(IrsaGator)
+    use_shared_pool(IrsaDust)
 
     gator_app = typer.Typer(help=builtins._(
         "IRSA Gator catalog operations.\n\n"
@@ -351,62 +362,124 @@ def get_app():
     @dust_app.command(name="extinction", help=builtins._("Get E(B-V) dust extinction values for one or more coordinates."))
     @global_keyboard_interrupt_handler
     def get_extinction(ctx: typer.Context,
-        targets: List[str] = typer.Argument(..., help=builtins._("Object name(s) or coordinate(s) (e.g., 'M31', '10.68h +41.26d', '160.32 41.45'). Can be specified multiple times.")),
+        targets: Optional[List[str]] = typer.Argument(None, help=builtins._("Object name(s) or coordinate(s) (e.g., 'M31', '10.68h +41.26d', '160.32 41.45'). Can be specified multiple times.")),
         map_name: str = typer.Option("SFD", help=builtins._("Dust map to query ('SFD', 'Planck', 'IRIS'). SFD is Schlegel, Finkbeiner & Davis (1998).")),
         output_file: Optional[str] = common_output_options["output_file"],
         output_format: Optional[str] = common_output_options["output_format"],
+        targets_file: Optional[str] = common_batch_options["targets_file"],
+        from_stdin: bool = common_batch_options["from_stdin"],
+        concurrency: Optional[int] = common_batch_options["concurrency"],
+        rate_limit: Optional[float] = common_batch_options["rate_limit"],
+        retries: Optional[int] = common_batch_options["retries"],
+        stream: bool = typer.Option(False, "--stream", help=builtins._("Write rows to --output-file ('-' for stdout) as each target completes instead of one table at the end.")),
         test: bool = typer.Option(False, "--test", "-t", help=_("Enable test mode and print elapsed time."))
     ):
         import time
         start = time.perf_counter() if test else None
 
-        console.print(_("[cyan]Querying IRSA Dust ({map_name}) for extinction at: {targets_str}...[/cyan]").format(map_name=map_name, targets_str=', '.join(targets)))
+        if stream and not output_file:
+            console.print(_("[red]--stream needs an output target: use -o FILE, or -o - for standard output.[/red]"))
+            raise typer.Exit(code=1)
+        if output_file == "-":
+            use_stderr_for_messages()
 
-        coordinates_list = []
-        for target_str in targets:
-            try:
-                coordinates_list.append(parse_coordinates(ctx, target_str))
-            except typer.Exit:
-                raise
+        all_targets = resolve_batch_targets(targets, targets_file, from_stdin)
 
-        if not coordinates_list:
-            console.print(_("[red]No valid coordinates parsed.[/red]"))
-            raise typer.Exit(code=1)
+        if len(all_targets) <= 5:
+            console.print(_("[cyan]Querying IRSA Dust ({map_name}) for extinction at: {targets_str}...[/cyan]").format(map_name=map_name, targets_str=', '.join(all_targets)))
+        else:
+            console.print(_("[cyan]Querying IRSA Dust ({map_name}) for extinction at {count} targets...[/cyan]").format(map_name=map_name, count=len(all_targets)))
+
+        if len(all_targets) == 1 and not stream:
+            coord = parse_coordinates(ctx, all_targets[0])
+            if coord is None:
+                console.print(_("[red]No valid coordinates parsed.[/red]"))
+                raise typer.Exit(code=1)
+            try:
+                table_result = IrsaDust.get_extinction_table(coord, map_name=map_name)
+                if table_result is not None and len(table_result) > 0:
+                    display_table(ctx, table_result, title=_("IRSA Dust Extinction ({map_name})").format(map_name=map_name))
+                    if output_file:
+                        save_table_to_file(ctx, table_result, output_file, output_format, _("IRSA Dust {map_name} extinction").format(map_name=map_name))
+                else:
+                    console.print(_("[yellow]No extinction data returned by IRSA Dust ({map_name}).[/yellow]").format(map_name=map_name))
+            except Exception as e:
+                handle_astroquery_exception(ctx, e, _("IRSA Dust ({map_name}) get_extinction_table").format(map_name=map_name))
+                raise typer.Exit(code=1)
+            if test:
+                elapsed = time.perf_counter() - start
+                print(f"Elapsed: {elapsed:.3f} s")
+                raise typer.Exit()
+            return
+
+        n_retries = retries if retries is not None else config.get_batch_retries("irsa_dust")
+        batch_coords, failed = parse_coordinates_batch(ctx, all_targets)
+        parsed_targets = {name: batch_coords[i] for i, name in enumerate(all_targets) if not failed[i]}
+
+        def fetch_extinction(target_str: str) -> AstropyTable:
+            # Failures are returned as a row carrying the error message, so they
+            # end up in the output table instead of only being printed.
+            coord = None
+            try:
+                coord = parsed_targets.get(target_str)
+                if coord is None:
+                    raise ValueError(_("could not parse coordinates"))
+                tbl = call_with_retry(
+                    lambda: IrsaDust.get_extinction_table(coord, map_name=map_name),
+                    retries=n_retries,
+                    description=f"IRSA Dust '{target_str}'",
+                )
+                tbl['RA_input'] = coord.ra.deg
+                tbl['Dec_input'] = coord.dec.deg
+                tbl['error'] = ""
+                return tbl
+            except Exception as e:
+                message = f"{type(e).__name__}: {e}"
+                return AstropyTable({
+                    'RA_input': [coord.ra.deg if coord is not None else float('nan')],
+                    'Dec_input': [coord.dec.deg if coord is not None else float('nan')],
+                    'error': [message],
+                })
+
+        writer = None
+        if stream:
+            table_stream = open_table_stream(ctx, output_file, output_format, _("IRSA Dust {map_name} extinction").format(map_name=map_name))
+            if table_stream is None:
+                console.print(_("[red]Format of '{output_file}' cannot be streamed; use csv, ecsv, votable, parquet or arrow.[/red]").format(output_file=output_file))
+                raise typer.Exit(code=1)
+            writer = AlignedTableStream(table_stream)
+
+        def on_result(target_str: str, tbl: AstropyTable):
+            if writer:
+                writer.write(tbl, complete=not tbl['error'][0])
 
         try:
-            if len(coordinates_list) == 1:
-                table_result = IrsaDust.get_extinction_table(coordinates_list[0], map_name=map_name)
-            else:
-                results = []
-                debug(_("Fetching extinction for each target individually..."))
-                for i, coord in enumerate(coordinates_list):
-                    debug(_("  Processing target {current_num}/{total_num}: {target_name}").format(current_num=i+1, total_num=len(coordinates_list), target_name=targets[i]))
-                    try:
-                        tbl = IrsaDust.get_extinction_table(coord, map_name=map_name)
-                        tbl['target_input'] = targets[i]
-                        tbl['RA_input'] = coord.ra.deg
-                        tbl['Dec_input'] = coord.dec.deg
-                        results.append(tbl)
-                    except Exception as e_single:
-                        console.print(_("[yellow]Could not get extinction for '{target_name}': {error}[/yellow]").format(target_name=targets[i], error=e_single))
-                
-                if not results:
-                    console.print(_("[yellow]No extinction data retrieved for any target.[/yellow]"))
-                    raise typer.Exit()
-
-                from astropy.table import vstack
-                table_result = vstack(results)
-
-            if table_result is not None and len(table_result) > 0:
-                display_table(ctx, table_result, title=_("IRSA Dust Extinction ({map_name})").format(map_name=map_name))
-                if output_file:
-                    save_table_to_file(ctx, table_result, output_file, output_format, _("IRSA Dust {map_name} extinction").format(map_name=map_name))
-            else:
-                console.print(_("[yellow]No extinction data returned by IRSA Dust ({map_name}).[/yellow]").format(map_name=map_name))
+            table_result, _failures = run_batch(
+                "irsa_dust", all_targets, fetch_extinction, concurrency, rate_limit,
+                description=_("IRSA Dust ({map_name})").format(map_name=map_name),
+                on_result=on_result,
+            )
+        finally:
+            if writer:
+                writer.close()
 
-        except Exception as e:
-            handle_astroquery_exception(ctx, e, _("IRSA Dust ({map_name}) get_extinction_table").format(map_name=map_name))
-            raise typer.Exit(code=1)
+        if table_result is None or len(table_result) == 0:
+            console.print(_("[yellow]No extinction data retrieved for any target.[/yellow]"))
+            raise typer.Exit()
+
+        failed_set = set(table_result['target_input'][table_result['error'] != ""])
+        failed = [t for t in dict.fromkeys(all_targets) if t in failed_set]
+        for target_str in failed:
+            message = table_result['error'][table_result['target_input'] == target_str][0]
+            console.print(_("[yellow]Could not get extinction for '{target_name}': {error}[/yellow]").format(target_name=target_str, error=message))
+        console.print(_("[cyan]Extinction retrieved for {ok} of {total} target(s).[/cyan]").format(ok=len(all_targets) - len(failed), total=len(all_targets)))
+
+        if stream:
+            report_table_stream(writer.writer)
+        else:
+            display_table(ctx, table_result, title=_("IRSA Dust Extinction ({map_name})").format(map_name=map_name))
+            if output_file:
+                save_table_to_file(ctx, table_result, output_file, output_format, _("IRSA Dust {map_name} extinction").format(map_name=map_name))
 
         if test:
             elapsed = time.perf_counter() - start
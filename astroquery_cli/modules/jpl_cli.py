@@ -7,6 +7,7 @@ from astroquery.jplsbdb import SBDB
 from astropy.time import Time
 from rich.console import Console
 import re
+from collections import OrderedDict
 from io import StringIO
 from contextlib import redirect_stdout
 
@@ -16,9 +17,18 @@ from ..utils import (
     global_keyboard_interrupt_handler,
     console,
     common_output_options,
-    save_table_to_file
+    common_batch_options,
+    common_cache_options,
+    save_table_to_file,
+    suffixed_output_path,
 )
-from .. import i18n
+from ..batch import merge_tables, report_batch_failures, resolve_batch_targets, run_batch, tag_table
+from ..cache import cached_query
+from ..http_session import use_shared_pool
+from ..sbdb_client import check_sbdb_result, flatten_sbdb, rows_to_table
+from ..horizons_client import HORIZONS_MAX_STEPS, epoch_chunks, query_horizons as fetch_horizons, sort_by_epoch, step_minutes
+from ..ephemeris_store import EphemerisStore, epoch_grid
+from .. import config, i18n
 from astroquery_cli.common_options import setup_debug_context
 from astroquery_cli.debug import debug
 
@@ -131,6 +141,122 @@ def get_app():
         _ = i18n.get_translator(lang)
         return "1,2,4,8,9,10,12,13,14,19,20,21,23,24,31"
 
+    auto_majorbodies = {"sun", "mercury", "venus", "earth", "mars", "jupiter", "saturn", "uranus", "neptune", "pluto", "moon"}
+
+    def guess_id_type(target: str, id_type: Optional[IDType]) -> Optional[str]:
+        return id_type.value if id_type else ("majorbody" if target.strip().lower() in auto_majorbodies else None)
+
+    def fetch_epoch_ranges(plan: dict, ephem_type: EphemType, location: str, id_type: Optional[IDType], quantities: Optional[str],
+                           chunk_steps: int, concurrency: Optional[int], rate_limit: Optional[float], retries: Optional[int]):
+        """
+        Runs one request per target and epoch chunk on the batch pool. `plan`
+        maps each target to its epoch specs; start/stop ranges are split into
+        chunks. Returns ({target: [table per chunk]}, failures).
+        """
+        jobs = {}
+        for target, specs in plan.items():
+            chunks = []
+            for spec in specs:
+                ranged = spec and {"start", "stop"} <= set(spec)
+                chunks.extend(epoch_chunks(str(spec["start"]), str(spec["stop"]), str(spec.get("step", "1d")), chunk_steps) if ranged else [spec])
+            for chunk in chunks:
+                label = target if len(chunks) == 1 else f"{target} [{chunk['start']} .. {chunk['stop']}]"
+                jobs[label] = (target, chunk)
+        if not jobs:
+            return {}, []
+        console.print(_("[cyan]Querying JPL Horizons for {targets} target(s) in {requests} request(s)...[/cyan]").format(targets=len(plan), requests=len(jobs)))
+
+        def fetch_one(label: str) -> AstropyTable:
+            target, chunk = jobs[label]
+            return tag_table(fetch_horizons(target, ephem_type.value, location, chunk, guess_id_type(target, id_type), quantities), target)
+
+        pieces = {target: [] for target in plan}
+        _merged, failures = run_batch(
+            "horizons", list(jobs), fetch_one, concurrency, rate_limit, description=_("Horizons requests"),
+            retries=retries if retries is not None else config.get_batch_retries("horizons"), tag=False,
+            on_result=lambda label, table: pieces[jobs[label][0]].append(table),
+        )
+        return pieces, failures
+
+    def run_horizons_batch(targets: List[str], epoch_dict: Optional[dict], ephem_type: EphemType, location: str,
+                           id_type: Optional[IDType], quantities: Optional[str], chunk_steps: int,
+                           concurrency: Optional[int], rate_limit: Optional[float], retries: Optional[int]):
+        """Returns ({target: time-sorted table}, failures)."""
+        pieces, failures = fetch_epoch_ranges({target: [epoch_dict] for target in targets}, ephem_type, location, id_type,
+                                              quantities, chunk_steps, concurrency, rate_limit, retries)
+        return {target: sort_by_epoch(merge_tables(tables)) for target, tables in pieces.items() if tables}, failures
+
+    def run_horizons_from_store(targets: List[str], epoch_dict: dict, ephem_type: EphemType, location: str,
+                                id_type: Optional[IDType], quantities: Optional[str], chunk_steps: int,
+                                concurrency: Optional[int], rate_limit: Optional[float], retries: Optional[int],
+                                refresh: bool, tolerance: float):
+        """
+        Answers a start/stop/step range from the local ephemeris store. Only
+        the uncovered parts of the range (plus a margin for the interpolation
+        stencil) are requested. Requested epochs that fall on stored samples
+        are returned as Horizons sent them; the others are interpolated.
+        Targets whose error estimate exceeds `tolerance` are queried directly.
+        """
+        store = EphemerisStore()
+        degree = config.get_horizons_interp_degree()
+        step = str(epoch_dict.get("step", "1d"))
+        step_days = step_minutes(step) / 1440
+        grid = epoch_grid(Time(str(epoch_dict["start"]), scale="tdb").jd, Time(str(epoch_dict["stop"]), scale="tdb").jd, step_days)
+        margin = (degree + 1) * step_days
+
+        def jd_range(lo: float, hi: float) -> dict:
+            # One extra step so the last node reaches past the gap
+            label = lambda jd: Time(jd, format="jd", scale="tdb", precision=3).iso
+            return {"start": label(lo), "stop": label(max(hi, lo + step_days) + step_days), "step": step}
+
+        series = {t: store.load(t, ephem_type.value, location, guess_id_type(t, id_type), quantities) for t in targets}
+        plan = {}
+        for target, entry in series.items():
+            gaps = [(grid[0] - margin, grid[-1] + margin)] if refresh else entry.missing(grid[0] - margin, grid[-1] + margin)
+            if gaps:
+                plan[target] = [jd_range(lo, hi) for lo, hi in gaps]
+        debug(f"Ephemeris store: {len(targets) - len(plan)} target(s) fully covered, {len(plan)} need data")
+        pieces, failures = fetch_epoch_ranges(plan, ephem_type, location, id_type, quantities, chunk_steps, concurrency, rate_limit, retries)
+        for target, tables in pieces.items():
+            # Chunk by chunk, so a failed chunk leaves a gap in the recorded coverage
+            for table in tables:
+                series[target].insert(table, replace=refresh)
+            if tables:
+                store.save(series[target])
+
+        failed_targets = {label.split(" [")[0] for label, _message in failures}
+        results, direct, interpolated = {}, [], 0
+        for target in targets:
+            entry = series[target]
+            if target in failed_targets or not entry.covers(grid[0], grid[-1]):
+                continue
+            try:
+                table, errors = entry.interpolate(grid, degree)
+            except ValueError as e:
+                debug(f"Ephemeris store: cannot interpolate {target}: {e}")
+                direct.append(target)
+                continue
+            worst = max(errors, key=errors.get) if errors else None
+            if worst and errors[worst] > tolerance:
+                debug(f"Ephemeris store: {target} interpolation error {errors[worst]:.2e} ({worst}) above {tolerance:.0e}; querying directly")
+                direct.append(target)
+                continue
+            results[target] = tag_table(table, target)
+            interpolated += 1
+            debug(f"Ephemeris store: {target} interpolated, worst relative error {errors[worst] if worst else 0:.2e} ({worst})")
+
+        if direct:
+            fetched, more_failures = run_horizons_batch(direct, epoch_dict, ephem_type, location, id_type, quantities,
+                                                        chunk_steps, concurrency, rate_limit, retries)
+            failures += more_failures
+            for target, table in fetched.items():
+                series[target].insert(table)
+                store.save(series[target])
+                results[target] = table
+        if interpolated:
+            console.print(_("[green]{count} target(s) answered from the local ephemeris store (relative error estimate below {tolerance:.0e}).[/green]").format(count=interpolated, tolerance=tolerance))
+        return results, failures
+
     @app.command(name="horizons", help=builtins._("Query ephemerides, orbital elements, or vectors for a target object. (h)"))
     @app.command(name="h", help=builtins._("Alias for horizons."))
     @global_keyboard_interrupt_handler
@@ -174,12 +300,29 @@ def get_app():
             help=builtins._("JPL Horizons server to use. Choices: {server_list}").format(server_list=list(JPL_SERVERS.keys())),
             autocompletion=lambda: list(JPL_SERVERS.keys())
         ),
+        targets_file: Optional[str] = typer.Option(None, "--targets-file", help=builtins._("File with one Horizons target ID per line. Lines starting with '#' are ignored.")),
+        from_stdin: bool = typer.Option(False, "--stdin", help=builtins._("Read Horizons target IDs from standard input, one per line.")),
+        concurrency: Optional[int] = typer.Option(None, "--concurrency", min=1, help=builtins._("Parallel Horizons requests. Default from config.ini [Batch] horizons_concurrency (4).")),
+        rate_limit: Optional[float] = common_batch_options["rate_limit"],
+        retries: Optional[int] = common_batch_options["retries"],
+        chunk_steps: int = typer.Option(HORIZONS_MAX_STEPS, "--chunk-steps", min=2, help=builtins._("Maximum epochs per Horizons request; longer ranges are split.")),
+        per_target: bool = typer.Option(False, "--per-target", help=builtins._("Save one file per target (<output>_<target>.<ext>) instead of one combined table.")),
+        no_cache: bool = typer.Option(False, "--no-cache", help=builtins._("Do not use the local ephemeris store (~/.aqc/cache/ephemeris) for this range query.")),
+        refresh: bool = typer.Option(False, "--refresh", help=builtins._("Re-fetch the whole range and replace the stored samples.")),
+        interp_tolerance: Optional[float] = typer.Option(None, "--interp-tolerance", min=0, help=builtins._("Largest relative interpolation error estimate accepted from the ephemeris store. Default from config.ini [Horizons] interp_tolerance (1e-9).")),
+        output_file: Optional[str] = common_output_options["output_file"],
+        output_format: Optional[str] = common_output_options["output_format"],
         test: bool = typer.Option(False, "--test", "-t", help=_("Enable test mode and print elapsed time."))
     ):
+        """
+        Example: aqc jpl horizons Ceres --ephem-type OBSERVER --start 2025-01-01 --end 2025-12-31 --step 1h
+        Example: aqc jpl horizons --targets-file asteroids.txt --ephem-type VECTORS --start 2025-01-01 --end 2026-01-01 --step 10m -o vectors.parquet
+        """
         import time
         start = time.perf_counter() if test else None
+        batch_mode = bool(targets_file or from_stdin)
 
-        if target is None and not any(arg in ["-h", "--help"] for arg in ctx.args):
+        if target is None and not batch_mode and not any(arg in ["-h", "--help"] for arg in ctx.args):
             help_output_capture = StringIO()
             with redirect_stdout(help_output_capture):
                 try:
@@ -196,8 +339,6 @@ def get_app():
             console.print(full_help_text)
             raise typer.Exit()
 
-        console.print(_("[cyan]Querying JPL Horizons for '{target}'...[/cyan]").format(target=target))
-
         current_server = JPL_SERVERS.get(jpl_server.lower(), jpl_conf.horizons_server)
         if jpl_conf.horizons_server != current_server:
             debug(_("Using JPL server: {server}").format(server=current_server))
@@ -216,8 +357,48 @@ def get_app():
                 except (ValueError, SyntaxError) as e:
                     console.print(_("[red]Error parsing epoch dictionary: {error}. Please ensure it's a valid Python dictionary string.[/red]").format(error=e))
                     raise typer.Exit(code=1)
-        auto_majorbodies = {"sun", "mercury", "venus", "earth", "mars", "jupiter", "saturn", "uranus", "neptune", "pluto", "moon"}
-        auto_id_type = id_type.value if id_type else ("majorbody" if target.strip().lower() in auto_majorbodies else None)
+
+        if per_target and not output_file:
+            console.print(_("[red]--per-target needs --output-file (used as the file name pattern).[/red]"))
+            raise typer.Exit(code=1)
+
+        if batch_mode or (epoch_dict and {"start", "stop"} <= set(epoch_dict)):
+            targets = list(dict.fromkeys(resolve_batch_targets(target, targets_file, from_stdin)))
+            try:
+                step = str(epoch_dict.get("step", "1d")) if epoch_dict else None
+                if (not no_cache and step and step_minutes(step) and {"start", "stop"} <= set(epoch_dict)
+                        and ephem_type in (EphemType.OBSERVER, EphemType.VECTORS)):
+                    tolerance = interp_tolerance if interp_tolerance is not None else config.get_horizons_interp_tolerance()
+                    tables, failures = run_horizons_from_store(targets, epoch_dict, ephem_type, location, id_type, quantities,
+                                                               chunk_steps, concurrency, rate_limit, retries, refresh, tolerance)
+                else:
+                    tables, failures = run_horizons_batch(targets, epoch_dict, ephem_type, location, id_type, quantities,
+                                                          chunk_steps, concurrency, rate_limit, retries)
+            except ValueError as e:
+                console.print(_("[red]{error}[/red]").format(error=e))
+                raise typer.Exit(code=1)
+            for label, message in failures:
+                console.print(_("[yellow]  {target}: {error}[/yellow]").format(target=label, error=message))
+            missing = [t for t in targets if t not in tables]
+            console.print(_("[cyan]Horizons: {ok} of {total} target(s) returned results, {failed} request(s) failed.[/cyan]").format(ok=len(tables), total=len(targets), failed=len(failures)))
+            if not tables:
+                raise typer.Exit(code=1)
+            combined = merge_tables([tables[t] for t in targets if t in tables])
+            display_table(ctx, combined, title=_("{ephem_type} for {count} target(s)").format(ephem_type=ephem_type.value, count=len(tables)), max_rows=max_rows, show_all_columns=show_all_columns)
+            if output_file and per_target:
+                for name, table in tables.items():
+                    save_table_to_file(ctx, table, suffixed_output_path(output_file, name), output_format, _("JPL Horizons {target}").format(target=name))
+            elif output_file:
+                save_table_to_file(ctx, combined, output_file, output_format, _("JPL Horizons batch"))
+            if missing:
+                console.print(_("[yellow]No results for: {targets}[/yellow]").format(targets=", ".join(missing)))
+            if test:
+                print(f"Elapsed: {time.perf_counter() - start:.3f} s")
+                raise typer.Exit()
+            return
+
+        console.print(_("[cyan]Querying JPL Horizons for '{target}'...[/cyan]").format(target=target))
+        auto_id_type = guess_id_type(target, id_type)
         query_params = {
             "id": target,
             "location": location,
@@ -260,6 +441,8 @@ def get_app():
             
             if result_table is not None and len(result_table) > 0:
                 display_table(ctx, result_table, title=table_title, max_rows=max_rows, show_all_columns=show_all_columns)
+                if output_file:
+                    save_table_to_file(ctx, result_table, output_file, output_format, _("JPL Horizons query"))
             else:
                 console.print(_("[yellow]No results found for '{target}' with the specified parameters.[/yellow]").format(target=target))
 
@@ -287,14 +470,66 @@ def get_app():
         orb_el: bool = typer.Option(False, "--orb-el", help=builtins._("Include orbital elements.")),
         close_approach: bool = typer.Option(False, "--ca-data", help=builtins._("Include close-approach data.")),
         radar_obs: bool = typer.Option(False, "--radar-obs", help=builtins._("Include radar observation data.")),
+        discovery: bool = typer.Option(False, "--discovery", help=builtins._("Include discovery circumstances.")),
+        targets_file: Optional[str] = typer.Option(None, "--targets-file", help=builtins._("File with one small body per line (bulk mode: one flattened table row per body). Lines starting with '#' are ignored.")),
+        from_stdin: bool = typer.Option(False, "--stdin", help=builtins._("Read small bodies from standard input, one per line (bulk mode).")),
+        concurrency: Optional[int] = common_batch_options["concurrency"],
+        rate_limit: Optional[float] = common_batch_options["rate_limit"],
+        retries: Optional[int] = common_batch_options["retries"],
+        no_cache: bool = common_cache_options["no_cache"],
+        refresh: bool = common_cache_options["refresh"],
         output_file: Optional[str] = common_output_options["output_file"],
         output_format: Optional[str] = common_output_options["output_format"],
+        output_columns: Optional[List[str]] = common_output_options["columns"],
         max_rows_display: int = typer.Option(20, help=builtins._("Maximum number of rows to display for tables. Use -1 for all rows.")),
         show_all_columns: bool = typer.Option(False, "--show-all-cols", help=builtins._("Show all columns in output tables.")),
         test: bool = typer.Option(False, "--test", "-t", help=_("Enable test mode and print elapsed time."))
     ):
+        """
+        Example: aqc jpl sbdb Ceres --phys-par
+        Example: aqc jpl sbdb --targets-file neos.txt --phys-par --discovery -o neos.parquet
+        """
         import time
         start = time.perf_counter() if test else None
+        batch_mode = bool(targets_file or from_stdin)
+
+        def fetch_sbdb(name: str):
+            query_kwargs = {"id_type": id_type} if id_type else {}
+            flags = {"phys": phys_par, "close_approach": close_approach, "radar": radar_obs, "discovery": discovery}
+            return cached_query(
+                "sbdb", "query", dict(target=name, full_precision=True, **query_kwargs, **flags),
+                lambda: use_shared_pool(SBDB).query(name, full_precision=True, **query_kwargs, **flags),
+                no_cache=no_cache, refresh=refresh
+            )
+
+        if batch_mode:
+            targets = list(dict.fromkeys(resolve_batch_targets(target, targets_file, from_stdin)))
+            if close_approach or radar_obs:
+                console.print(_("[yellow]Close-approach and radar data have several rows per body; they are not included in bulk mode.[/yellow]"))
+            console.print(_("[cyan]Querying JPL SBDB for {count} small bodies...[/cyan]").format(count=len(targets)))
+            rows = {}
+
+            def fetch_row(name: str):
+                row = OrderedDict(target_input=name)
+                row.update(flatten_sbdb(check_sbdb_result(name, fetch_sbdb(name))))
+                return row
+
+            _merged, failures = run_batch(
+                "sbdb", targets, fetch_row, concurrency, rate_limit, description=_("SBDB bodies"),
+                retries=retries if retries is not None else config.get_batch_retries("sbdb"), tag=False, merge=False,
+                on_result=lambda name, row: rows.__setitem__(name, row),
+            )
+            report_batch_failures(failures, len(targets))
+            if not rows:
+                raise typer.Exit(code=1)
+            result_table = rows_to_table(rows[name] for name in targets if name in rows)
+            display_table(ctx, result_table, title=_("JPL SBDB data for {count} bodies").format(count=len(result_table)), max_rows=max_rows_display, show_all_columns=show_all_columns)
+            if output_file:
+                save_table_to_file(ctx, result_table, output_file, output_format, _("JPL SBDB bulk query"), columns=output_columns)
+            if test:
+                print(f"Elapsed: {time.perf_counter() - start:.3f} s")
+                raise typer.Exit()
+            return
 
         if target is None and not any(arg in ["-h", "--help"] for arg in ctx.args):
             # If no target is provided and not asking for help, show help for this command
@@ -313,14 +548,7 @@ def get_app():
 
         console.print(_("[cyan]Querying JPL SBDB for target: '{target}'...[/cyan]").format(target=target))
         try:
-            query_kwargs = {}
-            if id_type:
-                query_kwargs['id_type'] = id_type
-            sbdb_query = SBDB.query(
-                target,
-                **query_kwargs,
-                full_precision=True
-            )
+            sbdb_query = fetch_sbdb(target)
 
             if sbdb_query:
                 console.print(_("[green]Data found for '{target}'.[/green]").format(target=target))
@@ -457,6 +685,35 @@ def get_app():
             print(f"Elapsed: {elapsed:.3f} s")
             raise typer.Exit()
 
+    ephem_cache_app = typer.Typer(
+        name="ephem-cache",
+        help=builtins._("Manage the local Horizons ephemeris store."),
+        no_args_is_help=True,
+    )
+
+    @ephem_cache_app.command(name="list", help=builtins._("List stored Horizons series and their time coverage."))
+    def list_ephem_cache(ctx: typer.Context):
+        store = EphemerisStore()
+        entries = store.entries()
+        if not entries:
+            console.print(_("[yellow]The ephemeris store is empty.[/yellow]"))
+            return
+        table = AstropyTable({
+            "target": [e.get("target", "") for e in entries],
+            "ephem_type": [e.get("ephem_type", "") for e in entries],
+            "location": [str(e.get("location") or "") for e in entries],
+            "samples": [e["samples"] for e in entries],
+            "coverage": ["; ".join(f"{Time(lo, format='jd').iso[:16]} .. {Time(hi, format='jd').iso[:16]}" for lo, hi in e.get("coverage", [])) for e in entries],
+            "size_kb": [round(e["size"] / 1024, 1) for e in entries],
+        })
+        display_table(ctx, table, title=_("Ephemeris store ({path})").format(path=store.directory), max_rows=-1)
+
+    @ephem_cache_app.command(name="clear", help=builtins._("Remove all stored Horizons series."))
+    def clear_ephem_cache(ctx: typer.Context):
+        count = EphemerisStore().clear()
+        console.print(_("[green]Removed {count} stored series.[/green]").format(count=count))
+
+    app.add_typer(ephem_cache_app, name="ephem-cache")
     app.add_typer(sbdb_app, name="sbdb")
     app.add_typer(sbdb_app, name="s") # Alias for sbdb
     return app
@@ -8,15 +8,32 @@ from ..utils import (
     display_table,
     handle_astroquery_exception,
     common_output_options,
+    common_batch_options,
     save_table_to_file,
+    open_table_stream,
+    report_table_stream,
+    parse_column_list,
+    project_columns,
     parse_coordinates,
     parse_angle_str_to_quantity,
     global_keyboard_interrupt_handler,
 )
+from ..batch import merge_tables, resolve_batch_targets
+from ..mast_client import MAST_PAGESIZE, MAST_TIMEOUT, MastQuery
+from ..name_resolver import resolve_name
+from ..downloader import DownloadItem, Manifest, download_all, parse_byte_rate
+from .. import config
+import os
+import time
+from urllib.parse import quote
+import numpy as np
+import astropy.units as u
 import re # Import re
 from io import StringIO # Import StringIO
 from contextlib import redirect_stdout # Import redirect_stdout
 from astroquery_cli.common_options import setup_debug_context # Import setup_debug_context
+from astroquery_cli.http_session import use_shared_pool
+from astroquery_cli.debug import debug
 
 def get_app():
     import builtins
@@ -98,48 +115,118 @@ def get_app():
     ]
     # ============================================================
 
-    Observations.TIMEOUT = 120
-    Observations.PAGESIZE = 2000
+    use_shared_pool(Observations)
+
+    criteria_options = {
+        "obs_collection": typer.Option(None, "--collection", help=builtins._("Observation collection(s) (e.g., 'HST', 'TESS'). '*' wildcards are allowed.")),
+        "instrument_name": typer.Option(None, "--instrument", help=builtins._("Instrument name(s) (e.g., 'WFC3/IR', 'ACS*'). '*' wildcards are allowed.")),
+        "filters": typer.Option(None, "--filters", help=builtins._("Filter/grating name(s) (e.g., 'F160W', 'G*').")),
+        "dataproduct_type": typer.Option(None, "--dataproduct-type", help=builtins._("Data product type(s) (e.g., 'image', 'spectrum', 'timeseries', 'cube').")),
+        "min_exptime": typer.Option(None, "--min-exptime", min=0, help=builtins._("Minimum exposure time (t_exptime) in seconds.")),
+        "max_exptime": typer.Option(None, "--max-exptime", min=0, help=builtins._("Maximum exposure time (t_exptime) in seconds.")),
+        "concurrency": typer.Option(None, "--concurrency", min=1, help=builtins._("Result pages fetched in parallel. Default from config.ini [Batch] mast_concurrency (4).")),
+        "page_size": typer.Option(MAST_PAGESIZE, "--page-size", min=1, help=builtins._("Rows per result page.")),
+        "timeout": typer.Option(MAST_TIMEOUT, "--timeout", min=1, help=builtins._("Seconds to wait for each result page.")),
+    }
+
+    def observation_criteria(obs_collection, instrument_name, filters, dataproduct_type, min_exptime, max_exptime) -> dict:
+        """CAOM criteria applied by the MAST server, before any rows are transferred."""
+        criteria = {
+            "obs_collection": list(obs_collection or []),
+            "instrument_name": list(instrument_name or []),
+            "filters": list(filters or []),
+            "dataproduct_type": [t.lower() for t in dataproduct_type or []],
+        }
+        if min_exptime is not None or max_exptime is not None:
+            # Float columns take a [min, max] range
+            criteria["t_exptime"] = [min_exptime or 0.0, max_exptime if max_exptime is not None else 1e12]
+        return criteria
+
+    def run_observation_query(ctx: typer.Context, coord, rad_quantity, criteria: dict, title: str, query_type: str, empty_message: str,
+                              output_file, output_format, output_columns, compression, concurrency, page_size, timeout,
+                              max_rows_display: int, show_all_columns: bool):
+        """
+        Fetches the result pages concurrently and in order. With an output file
+        each page is written as it arrives; in any case only the pages needed
+        for the displayed rows are kept in memory.
+        """
+        columns = parse_column_list(output_columns)
+        query = MastQuery(coord, rad_quantity.to(u.deg).value, criteria, columns=columns, pagesize=page_size, timeout=timeout)
+        if columns and not query.server_columns:
+            debug("MAST: no criteria given; selecting --columns locally")
+        writer = open_table_stream(ctx, output_file, output_format, query_type, compression=compression) if output_file else None
+        if output_file and writer is None:
+            console.print(_("[red]Format of '{output_file}' cannot be streamed; use csv, ecsv, votable, parquet or arrow.[/red]").format(output_file=output_file))
+            raise typer.Exit(code=1)
+        kept, kept_rows, total_rows, selected = [], 0, 0, None
+        try:
+            for page in query.iter_pages(concurrency or config.get_batch_concurrency("mast")):
+                if columns and not query.server_columns:
+                    selected = selected or project_columns(page, columns).colnames
+                    page = page[[c for c in selected if c in page.colnames]]
+                total_rows += len(page)
+                if writer:
+                    writer.write(page)
+                if max_rows_display >= 0 and kept_rows >= max_rows_display:
+                    continue
+                kept.append(page)
+                kept_rows += len(page)
+        finally:
+            if writer:
+                writer.close()
+
+        if total_rows == 0:
+            console.print(empty_message)
+            return
+        result_table = merge_tables(kept)
+        if max_rows_display >= 0:
+            result_table = result_table[:max_rows_display]
+        console.print(_("[green]Found {count} observation(s).[/green]").format(count=total_rows))
+        display_table(ctx, result_table, title=title, max_rows=max_rows_display, show_all_columns=show_all_columns)
+        if writer:
+            report_table_stream(writer)
 
     @app.command(name="object", help=builtins._("Query MAST for observations of an object."))
     @global_keyboard_interrupt_handler
     def query_object(ctx: typer.Context,
         object_name: str = typer.Argument(..., help=builtins._("Name of the astronomical object.")),
         radius: Optional[str] = typer.Option("0.2 deg", help=builtins._("Search radius around the object.")),
-        obs_collection: Optional[List[str]] = typer.Option(None, "--collection", help=builtins._("Observation collection (e.g., 'HST', 'TESS').")),
-        instrument_name: Optional[List[str]] = typer.Option(None, "--instrument", help=builtins._("Instrument name (e.g., 'WFC3', 'ACS').")),
+        obs_collection: Optional[List[str]] = criteria_options["obs_collection"],
+        instrument_name: Optional[List[str]] = criteria_options["instrument_name"],
+        filters: Optional[List[str]] = criteria_options["filters"],
+        dataproduct_type: Optional[List[str]] = criteria_options["dataproduct_type"],
+        min_exptime: Optional[float] = criteria_options["min_exptime"],
+        max_exptime: Optional[float] = criteria_options["max_exptime"],
+        concurrency: Optional[int] = criteria_options["concurrency"],
+        page_size: int = criteria_options["page_size"],
+        timeout: float = criteria_options["timeout"],
         output_file: Optional[str] = common_output_options["output_file"],
         output_format: Optional[str] = common_output_options["output_format"],
+        output_columns: Optional[List[str]] = common_output_options["columns"],
+        compression: Optional[str] = common_output_options["compression"],
         max_rows_display: int = typer.Option(20, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
         show_all_columns: bool = typer.Option(False, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
 test: bool = typer.Option(False, "--test", "-t", help=builtins._("Enable test mode and print elapsed time."))
     ):
-        import time
+        """
+        Example: aqc mast object M101 --collection HST --dataproduct-type image --min-exptime 500 --columns obsid,instrument_name,filters,t_exptime
+        """
         start = time.perf_counter() if test else None
 
         console.print(_("[cyan]Querying MAST for object: '{object_name}'...[/cyan]").format(object_name=object_name))
         try:
-            rad_quantity = parse_angle_str_to_quantity(ctx, radius) if radius else None
-            result_table: Optional[AstropyTable] = Observations.query_object(
-                object_name,
-                radius=rad_quantity
+            rad_quantity = parse_angle_str_to_quantity(ctx, radius) if radius else 0.2 * u.deg
+            coord = resolve_name(object_name)
+            run_observation_query(
+                ctx, coord, rad_quantity,
+                observation_criteria(obs_collection, instrument_name, filters, dataproduct_type, min_exptime, max_exptime),
+                _("MAST Observations for {object_name}").format(object_name=object_name), _("MAST object query"),
+                _("[yellow]No observations found for object '{object_name}' with specified criteria.[/yellow]").format(object_name=object_name),
+                output_file, output_format, output_columns, compression, concurrency, page_size, timeout,
+                max_rows_display, show_all_columns,
             )
-
-            if result_table and obs_collection:
-                mask = [any(coll.upper() in str(item).upper() for coll in obs_collection) for item in result_table['obs_collection']]
-                result_table = result_table[mask]
-            if result_table and instrument_name:
-                mask = [any(inst.upper() in str(item).upper() for inst in instrument_name) for item in result_table['instrument_name']]
-                result_table = result_table[mask]
-
-
-            if result_table and len(result_table) > 0:
-                console.print(_("[green]Found {count} observation(s) for '{object_name}'.[/green]").format(count=len(result_table), object_name=object_name))
-                display_table(ctx, result_table, title=_("MAST Observations for {object_name}").format(object_name=object_name), max_rows=max_rows_display, show_all_columns=show_all_columns)
-                if output_file:
-                    save_table_to_file(ctx, result_table, output_file, output_format, _("MAST object query"))
-            else:
-                console.print(_("[yellow]No observations found for object '{object_name}' with specified criteria.[/yellow]").format(object_name=object_name))
+        except typer.Exit:
+            raise
         except Exception as e:
             handle_astroquery_exception(ctx, e, "MAST object")
             raise typer.Exit(code=1)
@@ -154,40 +241,44 @@ test: bool = typer.Option(False, "--test", "-t", help=builtins._("Enable test mo
     def query_region(ctx: typer.Context,
         coordinates: str = typer.Argument(..., help=builtins._("Coordinates (e.g., '10.68h +41.26d', 'M101').")),
         radius: str = typer.Argument(..., help=builtins._("Search radius (e.g., '0.1deg', '5arcmin').")),
-        obs_collection: Optional[List[str]] = typer.Option(None, "--collection", help=builtins._("Observation collection.")),
-        instrument_name: Optional[List[str]] = typer.Option(None, "--instrument", help=builtins._("Instrument name.")),
+        obs_collection: Optional[List[str]] = criteria_options["obs_collection"],
+        instrument_name: Optional[List[str]] = criteria_options["instrument_name"],
+        filters: Optional[List[str]] = criteria_options["filters"],
+        dataproduct_type: Optional[List[str]] = criteria_options["dataproduct_type"],
+        min_exptime: Optional[float] = criteria_options["min_exptime"],
+        max_exptime: Optional[float] = criteria_options["max_exptime"],
+        concurrency: Optional[int] = criteria_options["concurrency"],
+        page_size: int = criteria_options["page_size"],
+        timeout: float = criteria_options["timeout"],
         output_file: Optional[str] = common_output_options["output_file"],
         output_format: Optional[str] = common_output_options["output_format"],
+        output_columns: Optional[List[str]] = common_output_options["columns"],
+        compression: Optional[str] = common_output_options["compression"],
         max_rows_display: int = typer.Option(20, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
         show_all_columns: bool = typer.Option(False, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
 test: bool = typer.Option(False, "--test", "-t", help=builtins._("Enable test mode and print elapsed time."))
     ):
-        import time
+        """
+        Example: aqc mast region "202.47 47.19" 1deg --instrument "WFC3*" --filters F814W --columns obsid,obs_id,s_ra,s_dec -o hst.parquet
+        """
         start = time.perf_counter() if test else None
 
         console.print(_("[cyan]Querying MAST for region: '{coordinates}' with radius '{radius}'...[/cyan]").format(coordinates=coordinates, radius=radius))
         try:
             coord = parse_coordinates(ctx, coordinates)
+            if coord is None:
+                raise typer.Exit(code=1)
             rad_quantity = parse_angle_str_to_quantity(ctx, radius)
-
-            result_table: Optional[AstropyTable] = Observations.query_region(
-                coord,
-                radius=rad_quantity
+            run_observation_query(
+                ctx, coord, rad_quantity,
+                observation_criteria(obs_collection, instrument_name, filters, dataproduct_type, min_exptime, max_exptime),
+                _("MAST Observations for Region"), _("MAST region query"),
+                _("[yellow]No observations found for the specified region with given criteria.[/yellow]"),
+                output_file, output_format, output_columns, compression, concurrency, page_size, timeout,
+                max_rows_display, show_all_columns,
             )
-            if result_table and obs_collection:
-                mask = [any(coll.upper() in str(item).upper() for coll in obs_collection) for item in result_table['obs_collection']]
-                result_table = result_table[mask]
-            if result_table and instrument_name:
-                mask = [any(inst.upper() in str(item).upper() for inst in instrument_name) for item in result_table['instrument_name']]
-                result_table = result_table[mask]
-
-            if result_table and len(result_table) > 0:
-                console.print(_("[green]Found {count} observation(s) in the region.[/green]").format(count=len(result_table)))
-                display_table(ctx, result_table, title=_("MAST Observations for Region"), max_rows=max_rows_display, show_all_columns=show_all_columns)
-                if output_file:
-                    save_table_to_file(ctx, result_table, output_file, output_format, _("MAST region query"))
-            else:
-                console.print(_("[yellow]No observations found for the specified region with given criteria.[/yellow]"))
+        except typer.Exit:
+            raise
         except Exception as e:
             handle_astroquery_exception(ctx, e, _("MAST region"))
             raise typer.Exit(code=1)
@@ -197,35 +288,73 @@ test: bool = typer.Option(False, "--test", "-t", help=builtins._("Enable test mo
             print(f"Elapsed: {elapsed:.3f} s")
             raise typer.Exit()
 
-    @app.command(name="get-products", help=builtins._("Get data product URLs for given observation IDs."))
+    # Product table columns that may carry a checksum, with their hash algorithm
+    PRODUCT_CHECKSUM_COLUMNS = {"md5": "md5", "md5sum": "md5", "checksum": "md5", "sha256": "sha256"}
+
+    def fetch_product_list(obs_ids: List[str], product_type: Optional[List[str]], extensions: Optional[List[str]],
+                           calib_levels: Optional[List[int]], subgroups: Optional[List[str]], mrp_only: bool) -> AstropyTable:
+        """Product list for the observations, filtered locally before anything is downloaded."""
+        products = Observations.get_product_list(obs_ids)
+        if products is None or len(products) == 0:
+            return AstropyTable()
+        filters = {}
+        if product_type:
+            filters["productType"] = [t.upper() for t in product_type]
+        if calib_levels:
+            filters["calib_level"] = list(calib_levels)
+        if subgroups:
+            filters["productSubGroupDescription"] = [g.upper() for g in subgroups]
+        extension = [e if e.startswith((".", "_")) else f".{e}" for e in extensions] if extensions else None
+        products = Observations.filter_products(products, mrp_only=mrp_only, extension=extension, **filters)
+        if len(products) > 0:
+            # The same product can belong to several observations
+            _uris, first = np.unique(np.asarray(products["dataURI"], dtype=str), return_index=True)
+            products = products[np.sort(first)]
+        return products
+
+    def product_download_url(data_uri: str) -> str:
+        return f"{Observations._portal_api_connection.MAST_DOWNLOAD_URL}?uri={quote(str(data_uri), safe=':/')}"
+
+    product_filter_options = {
+        "product_type": typer.Option(None, "--type", help=builtins._("Product type(s) (e.g., 'SCIENCE', 'PREVIEW', 'AUXILIARY').")),
+        "extensions": typer.Option(None, "--extension", "-e", help=builtins._("File name ending(s) to keep (e.g., 'fits', '_cal.fits', '_i2d.fits').")),
+        "calib_levels": typer.Option(None, "--calib-level", help=builtins._("Calibration level(s) to keep (0-4).")),
+        "subgroups": typer.Option(None, "--subgroup", help=builtins._("Product subgroup(s) (e.g., 'CAL', 'DRZ', 'X1D').")),
+        "mrp_only": typer.Option(False, "--mrp-only", help=builtins._("Only 'Minimum Recommended Products'.")),
+    }
+
+    @app.command(name="get-products", help=builtins._("List the data products (with download URLs) of observations."))
     def get_products(ctx: typer.Context,
-        obs_ids: List[str] = typer.Argument(..., help=builtins._("List of observation IDs.")),
-        product_type: Optional[List[str]] = typer.Option(None, "--type", help=builtins._("Product type(s) (e.g., 'SCIENCE', 'PREVIEW').")),
+        obs_ids: List[str] = typer.Argument(..., help=builtins._("MAST observation IDs ('obsid' column of 'aqc mast object/region').")),
+        product_type: Optional[List[str]] = product_filter_options["product_type"],
+        extensions: Optional[List[str]] = product_filter_options["extensions"],
+        calib_levels: Optional[List[int]] = product_filter_options["calib_levels"],
+        subgroups: Optional[List[str]] = product_filter_options["subgroups"],
+        mrp_only: bool = product_filter_options["mrp_only"],
         output_file: Optional[str] = common_output_options["output_file"],
         output_format: Optional[str] = common_output_options["output_format"],
+        output_columns: Optional[List[str]] = common_output_options["columns"],
+        compression: Optional[str] = common_output_options["compression"],
         max_rows_display: int = typer.Option(50, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
         show_all_columns: bool = typer.Option(True, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
 test: bool = typer.Option(False, "--test", "-t", help=builtins._("Enable test mode and print elapsed time."))
     ):
-        import time
         start = time.perf_counter() if test else None
 
         console.print(_("[cyan]Fetching product list for obs ID(s): {obs_id_list}...[/cyan]").format(obs_id_list=', '.join(obs_ids)))
         try:
-            products_table: Optional[AstropyTable] = Observations.get_product_urls(
-                obs_ids,
-                productType=product_type if product_type else None
-            )
-            if products_table and len(products_table) > 0:
+            products_table = fetch_product_list(obs_ids, product_type, extensions, calib_levels, subgroups, mrp_only)
+            if len(products_table) > 0:
+                products_table["download_url"] = [product_download_url(uri) for uri in products_table["dataURI"]]
                 console.print(_("[green]Found {count} data products.[/green]").format(count=len(products_table)))
                 display_table(ctx, products_table, title=_("MAST Data Products"), max_rows=max_rows_display, show_all_columns=show_all_columns)
                 if output_file:
-                    save_table_to_file(ctx, products_table, output_file, output_format, _("MAST products list"))
-                console.print(_("[info]Use 'aqc mast download-products <obs_id> ...' or 'astroquery.mast.Observations.download_products()' to download.[/info]"))
+                    save_table_to_file(ctx, products_table, output_file, output_format, _("MAST products list"), columns=output_columns, compression=compression)
+                console.print(_("[info]Use 'aqc mast download-products <obs_id> ...' with the same filters to download them.[/info]"))
             else:
                 console.print(_("[yellow]No data products found for the given observation ID(s) and criteria.[/yellow]"))
         except Exception as e:
-            handle_astroquery_exception(ctx, e, _("MAST get_product_urls"))
+            handle_astroquery_exception(ctx, e, _("MAST get_product_list"))
             raise typer.Exit(code=1)
 
         if test:
@@ -233,4 +362,85 @@ test: bool = typer.Option(False, "--test", "-t", help=builtins._("Enable test mo
             print(f"Elapsed: {elapsed:.3f} s")
             raise typer.Exit()
 
+    @app.command(name="download-products", help=builtins._("Download the data products of observations (parallel, resumable)."))
+    @global_keyboard_interrupt_handler
+    def download_products(ctx: typer.Context,
+        obs_ids: Optional[List[str]] = typer.Argument(None, help=builtins._("MAST observation IDs ('obsid' column of 'aqc mast object/region').")),
+        targets_file: Optional[str] = typer.Option(None, "--obs-ids-file", help=builtins._("File with one observation ID per line. Lines starting with '#' are ignored.")),
+        from_stdin: bool = common_batch_options["from_stdin"],
+        product_type: Optional[List[str]] = product_filter_options["product_type"],
+        extensions: Optional[List[str]] = product_filter_options["extensions"],
+        calib_levels: Optional[List[int]] = product_filter_options["calib_levels"],
+        subgroups: Optional[List[str]] = product_filter_options["subgroups"],
+        mrp_only: bool = product_filter_options["mrp_only"],
+        download_dir: str = typer.Option("mastDownload", "--download-dir", "-d", help=builtins._("Directory to download into.")),
+        flat: bool = typer.Option(False, "--flat", help=builtins._("Put all files directly in the download directory (no <collection>/<obs_id> subdirectories).")),
+        concurrency: Optional[int] = typer.Option(None, "--concurrency", min=1, help=builtins._("Number of parallel downloads. Default from config.ini [Batch] mast_download_concurrency (4).")),
+        max_rate: Optional[str] = typer.Option(None, "--max-rate", help=builtins._("Total bandwidth cap in bytes per second (e.g., '20M', '500K').")),
+        retries: Optional[int] = common_batch_options["retries"],
+        overwrite: bool = typer.Option(False, "--overwrite", help=builtins._("Download again even if a complete file already exists.")),
+        dry_run: bool = typer.Option(False, "--dry-run", help=builtins._("Only list the files that would be downloaded.")),
+        max_rows_display: int = typer.Option(20, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
+    ):
+        """
+        Example: aqc mast download-products 24842191 --type SCIENCE --calib-level 3 --extension _i2d.fits
+        Example: aqc mast download-products --obs-ids-file obsids.txt --subgroup CAL --concurrency 8 --max-rate 50M
+        """
+        obs_ids = resolve_batch_targets(obs_ids, targets_file, from_stdin)
+        try:
+            rate = parse_byte_rate(max_rate)
+        except ValueError as e:
+            console.print(_("[bold red]{error}[/bold red]").format(error=e))
+            raise typer.Exit(code=1)
+
+        console.print(_("[cyan]Fetching product list for {count} observation(s)...[/cyan]").format(count=len(obs_ids)))
+        try:
+            products = fetch_product_list(obs_ids, product_type, extensions, calib_levels, subgroups, mrp_only)
+        except Exception as e:
+            handle_astroquery_exception(ctx, e, _("MAST get_product_list"))
+            raise typer.Exit(code=1)
+        if len(products) == 0:
+            console.print(_("[yellow]No data products match the given observation ID(s) and filters.[/yellow]"))
+            raise typer.Exit(code=1)
+
+        checksum_col = next((c for c in PRODUCT_CHECKSUM_COLUMNS if c in products.colnames), None)
+        items = []
+        for row in products:
+            directory = download_dir if flat else os.path.join(download_dir, str(row["obs_collection"]), str(row["obs_id"]))
+            size = row["size"] if "size" in products.colnames and not np.ma.is_masked(row["size"]) else None
+            checksum = row[checksum_col] if checksum_col and not np.ma.is_masked(row[checksum_col]) else None
+            items.append(DownloadItem(
+                url=product_download_url(row["dataURI"]),
+                path=os.path.join(directory, os.path.basename(str(row["productFilename"]))),
+                size=int(size) if size is not None and int(size) > 0 else None,
+                checksum=(PRODUCT_CHECKSUM_COLUMNS[checksum_col], str(checksum)) if checksum else None,
+            ))
+        total_bytes = sum(item.size or 0 for item in items)
+        console.print(_("[cyan]{count} product file(s) after filtering, {size:.1f} MB in total.[/cyan]").format(count=len(items), size=total_bytes / 1e6))
+        if dry_run:
+            columns = [c for c in ("obs_id", "productFilename", "productType", "productSubGroupDescription", "calib_level", "size") if c in products.colnames]
+            display_table(ctx, products[columns], title=_("MAST products to download"), max_rows=max_rows_display, show_all_columns=True)
+            return
+
+        manifest = Manifest(download_dir)
+        started = time.perf_counter()
+        results = download_all(
+            items, use_shared_pool(Observations)._session, manifest,
+            concurrency=concurrency or config.get_batch_concurrency("mast_download"),
+            max_rate=rate,
+            retries=retries if retries is not None else config.get_batch_retries("mast_download"),
+            overwrite=overwrite,
+            manifest_key=lambda item: os.path.relpath(item.path, download_dir),
+        )
+        elapsed = time.perf_counter() - started
+
+        counts = {status: sum(1 for r in results if r["status"] == status) for status in ("downloaded", "resumed", "skipped", "failed")}
+        transferred = sum(r["bytes"] for r in results)
+        console.print(_("[green]{downloaded} downloaded, {resumed} resumed, {skipped} already complete, {failed} failed.[/green]").format(**counts))
+        console.print(_("[cyan]{size:.1f} MB transferred in {elapsed:.1f} s ({rate:.1f} MB/s). Manifest: {manifest}[/cyan]").format(
+            size=transferred / 1e6, elapsed=elapsed, rate=transferred / 1e6 / elapsed if elapsed else 0.0, manifest=manifest.path))
+        if counts["failed"]:
+            console.print(_("[yellow]Run the same command again to resume the failed downloads.[/yellow]"))
+            raise typer.Exit(code=1)
+
     return app
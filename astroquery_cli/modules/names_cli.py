@@ -0,0 +1,118 @@
+import time
+from datetime import datetime
+from typing import Optional, List
+
+import typer
+from astropy.table import Table as AstropyTable
+
+from ..utils import console, display_table, common_output_options, common_batch_options, save_table_to_file, global_keyboard_interrupt_handler
+from ..batch import resolve_batch_targets
+from ..name_resolver import get_name_resolver, normalize_name
+from astroquery_cli.common_options import setup_debug_context
+from astroquery_cli.debug import debug
+
+def get_app():
+    import builtins
+    _ = builtins._
+    app = typer.Typer(
+        name="names",
+        help=builtins._("Manage the local object name resolution cache."),
+        no_args_is_help=True,
+    )
+
+    @app.callback()
+    def names_callback(
+        ctx: typer.Context,
+        debug_flag: bool = typer.Option(False, "-t", "--debug", help=builtins._("Enable debug mode with verbose output."), envvar="AQC_DEBUG"),
+        verbose: bool = typer.Option(False, "-v", "--verbose", help=builtins._("Enable verbose output.")),
+    ):
+        setup_debug_context(ctx, debug_flag, verbose)
+
+    def resolve_to_table(names: List[str], concurrency: Optional[int]) -> AstropyTable:
+        resolver = get_name_resolver()
+        results = resolver.resolve_many(names, concurrency=concurrency)
+        entries = resolver.entries()
+        rows = {"name": [], "ra": [], "dec": [], "main_id": [], "error": []}
+        for name in dict.fromkeys(names):
+            result = results.get(name)
+            entry = entries.get(normalize_name(name), {})
+            ok = not isinstance(result, Exception)
+            rows["name"].append(name)
+            rows["ra"].append(float(result.ra.deg) if ok else float("nan"))
+            rows["dec"].append(float(result.dec.deg) if ok else float("nan"))
+            rows["main_id"].append(entry.get("name", "") if ok else "")
+            rows["error"].append("" if ok else str(result))
+        table = AstropyTable(rows)
+        table["ra"].unit = "deg"
+        table["dec"].unit = "deg"
+        return table
+
+    @app.command(name="resolve", help=builtins._("Resolve object names to ICRS positions (cached)."))
+    @global_keyboard_interrupt_handler
+    def resolve(ctx: typer.Context,
+        names: Optional[List[str]] = typer.Argument(None, help=builtins._("Object names (e.g., 'M31', 'NGC 224').")),
+        targets_file: Optional[str] = common_batch_options["targets_file"],
+        from_stdin: bool = common_batch_options["from_stdin"],
+        concurrency: Optional[int] = common_batch_options["concurrency"],
+        output_file: Optional[str] = common_output_options["output_file"],
+        output_format: Optional[str] = common_output_options["output_format"],
+        max_rows_display: int = typer.Option(20, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
+    ):
+        """
+        Example: aqc names resolve M31 "NGC 224" "Crab Nebula"
+        """
+        targets = resolve_batch_targets(names or [], targets_file, from_stdin)
+        table = resolve_to_table(targets, concurrency)
+        display_table(ctx, table, title=_("Resolved names"), max_rows=max_rows_display)
+        if output_file:
+            save_table_to_file(ctx, table, output_file, output_format, _("Name resolution"))
+        failed = int((table["error"] != "").sum())
+        if failed:
+            console.print(_("[yellow]{count} name(s) could not be resolved.[/yellow]").format(count=failed))
+            raise typer.Exit(code=1)
+
+    @app.command(name="warm", help=builtins._("Pre-resolve a list of names into the cache (for later offline use)."))
+    @global_keyboard_interrupt_handler
+    def warm(ctx: typer.Context,
+        targets_file: Optional[str] = common_batch_options["targets_file"],
+        from_stdin: bool = common_batch_options["from_stdin"],
+        concurrency: Optional[int] = common_batch_options["concurrency"],
+    ):
+        """
+        Example: aqc names warm --targets-file targets.txt
+        Example: cat targets.txt | aqc names warm --stdin
+        """
+        targets = resolve_batch_targets(None, targets_file, from_stdin)
+        console.print(_("[cyan]Resolving {count} name(s)...[/cyan]").format(count=len(targets)))
+        started = time.perf_counter()
+        table = resolve_to_table(targets, concurrency)
+        failed = table[table["error"] != ""]
+        for row in failed:
+            console.print(_("[yellow]  {name}: {error}[/yellow]").format(name=row["name"], error=row["error"]))
+        console.print(_("[green]{ok} of {total} name(s) cached in {elapsed:.1f} s.[/green]").format(ok=len(table) - len(failed), total=len(table), elapsed=time.perf_counter() - started))
+
+    @app.command(name="list", help=builtins._("List cached names."))
+    def list_names(ctx: typer.Context,
+        max_rows_display: int = typer.Option(50, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
+    ):
+        resolver = get_name_resolver()
+        entries = resolver.entries()
+        if not entries:
+            console.print(_("[yellow]The name cache is empty.[/yellow]"))
+            return
+        table = AstropyTable({
+            "key": list(entries),
+            "main_id": [e.get("name", "") for e in entries.values()],
+            "ra": [e["ra"] for e in entries.values()],
+            "dec": [e["dec"] for e in entries.values()],
+            "resolved": [datetime.fromtimestamp(e.get("resolved", 0)).isoformat(timespec="seconds") for e in entries.values()],
+        })
+        display_table(ctx, table, title=_("Cached names ({path})").format(path=resolver.path), max_rows=max_rows_display)
+
+    @app.command(name="clear", help=builtins._("Remove all cached names."))
+    def clear(ctx: typer.Context):
+        count = get_name_resolver().clear()
+        debug(f"Cleared name cache at {get_name_resolver().path}")
+        console.print(_("[green]Removed {count} cached name key(s).[/green]").format(count=count))
+
+    return app
@@ -8,6 +8,8 @@ from ..utils import (
     display_table,
     handle_astroquery_exception,
     common_output_options,
+    common_cache_options,
+    common_batch_options,
     save_table_to_file,
     parse_coordinates,
     parse_angle_str_to_quantity,
@@ -17,6 +19,10 @@ import re # Import re
 from io import StringIO # Import StringIO
 from contextlib import redirect_stdout # Import redirect_stdout
 from astroquery_cli.common_options import setup_debug_context # Import setup_debug_context
+from astroquery_cli.http_session import use_shared_pool
+from astroquery_cli.cache import cached_query
+from astroquery_cli.batch import resolve_batch_targets, run_batch, report_batch_failures
+from astroquery_cli import config
 
 def get_app():
     import builtins
@@ -89,23 +95,54 @@ def get_app():
     # ============================================================
 
     Ned.TIMEOUT = 120
+    use_shared_pool(Ned)
 
     @app.command(name="object", help=builtins._("Query NED for an object by name."))
     @global_keyboard_interrupt_handler
     def query_object(ctx: typer.Context,
-        object_name: str = typer.Argument(..., help=builtins._("Name of the extragalactic object.")),
+        object_name: Optional[str] = typer.Argument(None, help=builtins._("Name of the extragalactic object. Optional with --targets-file/--stdin.")),
         output_file: Optional[str] = common_output_options["output_file"],
         output_format: Optional[str] = common_output_options["output_format"],
         max_rows_display: int = typer.Option(1, help=builtins._("Maximum number of objects to display (usually 1 for direct name).")),
         show_all_columns: bool = typer.Option(True, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
+        no_cache: bool = common_cache_options["no_cache"],
+        refresh: bool = common_cache_options["refresh"],
+        targets_file: Optional[str] = common_batch_options["targets_file"],
+        from_stdin: bool = common_batch_options["from_stdin"],
+        concurrency: Optional[int] = common_batch_options["concurrency"],
+        rate_limit: Optional[float] = common_batch_options["rate_limit"],
+        retries: Optional[int] = common_batch_options["retries"],
         test: bool = typer.Option(False, "--test", "-t", help=_("Enable test mode and print elapsed time."))
     ):
         import time
         start = time.perf_counter() if test else None
 
+        targets = resolve_batch_targets(object_name, targets_file, from_stdin)
+
+        def fetch_object(name: str) -> Optional[AstropyTable]:
+            return cached_query(
+                "ned", "query_object", {"object_name": name},
+                lambda: Ned.query_object(name),
+                no_cache=no_cache, refresh=refresh
+            )
+
+        if targets_file or from_stdin:
+            console.print(_("[cyan]Querying NED for {count} object(s)...[/cyan]").format(count=len(targets)))
+            result_table, failures = run_batch("ned", targets, fetch_object, concurrency, rate_limit, description=_("NED objects"), retries=retries if retries is not None else config.get_batch_retries("ned"))
+            report_batch_failures(failures, len(targets))
+            if result_table is not None and len(result_table) > 0:
+                display_table(ctx, result_table, title=_("NED Data for {count} object(s)").format(count=len(targets)), max_rows=max(max_rows_display, 20), show_all_columns=show_all_columns)
+                if output_file:
+                    save_table_to_file(ctx, result_table, output_file, output_format, _( "NED object query"))
+            if test:
+                elapsed = time.perf_counter() - start
+                print(f"Elapsed: {elapsed:.3f} s")
+                raise typer.Exit()
+            return
+
         console.print(_("[cyan]Querying NED for object: '{object_name}'...[/cyan]").format(object_name=object_name))
         try:
-            result_table: Optional[AstropyTable] = Ned.query_object(object_name)
+            result_table: Optional[AstropyTable] = fetch_object(object_name)
 
             if result_table and len(result_table) > 0:
                 console.print(_("[green]Found information for '{object_name}'.[/green]").format(object_name=object_name))
@@ -133,6 +170,8 @@ def get_app():
         output_format: Optional[str] = common_output_options["output_format"],
         max_rows_display: int = typer.Option(20, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
         show_all_columns: bool = typer.Option(False, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
+        no_cache: bool = common_cache_options["no_cache"],
+        refresh: bool = common_cache_options["refresh"],
         test: bool = typer.Option(False, "--test", "-t", help=_("Enable test mode and print elapsed time."))
     ):
         import time
@@ -143,10 +182,11 @@ def get_app():
             coord = parse_coordinates(ctx, coordinates)
             rad_quantity = parse_angle_str_to_quantity(ctx, radius)
 
-            result_table: Optional[AstropyTable] = Ned.query_region(
-                coord,
-                radius=rad_quantity,
-                equinox=equinox
+            result_table: Optional[AstropyTable] = cached_query(
+                "ned", "query_region",
+                {"coordinates": coord, "radius": rad_quantity, "equinox": equinox},
+                lambda: Ned.query_region(coord, radius=rad_quantity, equinox=equinox),
+                no_cache=no_cache, refresh=refresh
             )
 
             if result_table and len(result_table) > 0:
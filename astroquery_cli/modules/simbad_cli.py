@@ -4,8 +4,12 @@ import typer
 from astroquery.simbad import Simbad, SimbadClass
 from astropy.table import Table
 from rich.console import Console
-from astroquery_cli.utils import display_table, handle_astroquery_exception, common_output_options, save_table_to_file, add_common_fields, console
+from astroquery_cli.utils import display_table, handle_astroquery_exception, common_output_options, common_cache_options, common_batch_options, save_table_to_file, add_common_fields, console
+from astroquery_cli.cache import cached_query
+from astroquery_cli.batch import resolve_batch_targets, run_batch, report_batch_failures
+from astroquery_cli import config
 from astroquery_cli.common_options import setup_debug_context
+from astroquery_cli.http_session import use_shared_pool
 from ..i18n import get_translator
 from ..utils import global_keyboard_interrupt_handler
 import re # Import re
@@ -83,7 +87,7 @@ def get_app():
     @app.command(name="object", help=builtins._("Query basic data for an astronomical object."))
     @global_keyboard_interrupt_handler
     def query_object(ctx: typer.Context,
-        object_name: str = typer.Argument(..., help=builtins._("Name of the object to query (e.g., 'M101', 'HD12345').")),
+        object_name: Optional[str] = typer.Argument(None, help=builtins._("Name of the object to query (e.g., 'M101', 'HD12345'). Optional with --targets-file/--stdin.")),
         wildcard: bool = typer.Option(False, "--wildcard", "-w", help=builtins._("Enable wildcard searching for the object name.")),
         add_fields: Optional[List[str]] = typer.Option(None, "--add-field", help=builtins._("Additional VOTable fields to retrieve (e.g., 'otype', 'sptype'). Can be specified multiple times.")),
         remove_fields: Optional[List[str]] = typer.Option(None, "--remove-field", help=builtins._("Default VOTable fields to remove (e.g., 'coo_bibcode'). Can be specified multiple times.")),
@@ -92,15 +96,26 @@ def get_app():
         output_format: Optional[str] = common_output_options["output_format"],
         max_rows_display: int = typer.Option(10, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
         show_all_columns: bool = typer.Option(False, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
+        no_cache: bool = common_cache_options["no_cache"],
+        refresh: bool = common_cache_options["refresh"],
+        targets_file: Optional[str] = common_batch_options["targets_file"],
+        from_stdin: bool = common_batch_options["from_stdin"],
+        concurrency: Optional[int] = common_batch_options["concurrency"],
+        rate_limit: Optional[float] = common_batch_options["rate_limit"],
+        retries: Optional[int] = common_batch_options["retries"],
     ):
         """
         Retrieves information about a specific astronomical object from SIMBAD.
         Example: aqc simbad query-object M31
         Example: aqc simbad query-object "HD 1*" --wildcard --add-field sptype
+        Example: aqc simbad object --targets-file targets.txt -o results.ecsv
         """
+        targets = resolve_batch_targets(object_name, targets_file, from_stdin)
+        batch_mode = bool(targets_file or from_stdin)
 
-        console.print(_("[cyan]Querying SIMBAD for object: '{object_name}'...[/cyan]").format(object_name=object_name))
-        s = Simbad()
+        if not batch_mode:
+            console.print(_("[cyan]Querying SIMBAD for object: '{object_name}'...[/cyan]").format(object_name=object_name))
+        s = use_shared_pool(Simbad())
         if include_common_fields:
             add_common_fields(ctx, s)
         if add_fields:
@@ -110,8 +125,32 @@ def get_app():
             for field in remove_fields:
                 s.remove_votable_fields(field)
 
+        def fetch_object(name: str) -> Optional[Table]:
+            cache_params = {
+                "object_name": name,
+                "wildcard": wildcard,
+                "include_common_fields": include_common_fields,
+                "add_fields": add_fields,
+                "remove_fields": remove_fields,
+            }
+            return cached_query(
+                "simbad", "query_object", cache_params,
+                lambda: s.query_object(name, wildcard=wildcard),
+                no_cache=no_cache, refresh=refresh
+            )
+
+        if batch_mode:
+            console.print(_("[cyan]Querying SIMBAD for {count} object(s)...[/cyan]").format(count=len(targets)))
+            result_table, failures = run_batch("simbad", targets, fetch_object, concurrency, rate_limit, description=_("SIMBAD objects"), retries=retries if retries is not None else config.get_batch_retries("simbad"))
+            report_batch_failures(failures, len(targets))
+            if result_table is not None and len(result_table) > 0:
+                display_table(ctx, result_table, title=_("SIMBAD Data for {count} object(s)").format(count=len(targets)), max_rows=max_rows_display, show_all_columns=show_all_columns)
+                if output_file:
+                    save_table_to_file(ctx, result_table, output_file, output_format, _("SIMBAD object query"))
+            return
+
         try:
-            result_table: Optional[Table] = s.query_object(object_name, wildcard=wildcard)
+            result_table: Optional[Table] = fetch_object(object_name)
 
             if result_table:
                 console.print(_("[green]Found {count} match(es) for '{object_name}'.[/green]").format(count=len(result_table), object_name=object_name))
@@ -139,7 +178,7 @@ def get_app():
         Example: aqc simbad query-ids M51
         """
         console.print(_("[cyan]Querying SIMBAD for identifiers of: '{object_name}'...[/cyan]").format(object_name=object_name))
-        s = Simbad()
+        s = use_shared_pool(Simbad())
         try:
             result_table: Optional[Table] = s.query_objectids(object_name)
             if result_table:
@@ -169,7 +208,7 @@ def get_app():
         """
         bibcodes_str = ', '.join(bibcodes)
         console.print(_("[cyan]Querying SIMBAD for objects in bibcode(s): {bibcodes_list}...[/cyan]").format(bibcodes_list=bibcodes_str))
-        s = Simbad()
+        s = use_shared_pool(Simbad())
         add_common_fields(ctx, s)
         try:
             result_table: Optional[Table] = s.query_bibcode(bibcodes)
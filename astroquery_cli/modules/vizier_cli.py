@@ -1,4 +1,4 @@
-from typing import Optional, List, Tuple
+from typing import Callable, Optional, List, Tuple
 
 import typer
 from astroquery.vizier import Vizier, conf as vizier_conf
@@ -6,12 +6,26 @@ from astropy.coordinates import SkyCoord
 import astropy.units as u
 
 from ..i18n import get_translator
-from ..utils import console, display_table, handle_astroquery_exception, global_keyboard_interrupt_handler
+from ..utils import console, display_table, handle_astroquery_exception, global_keyboard_interrupt_handler, common_cache_options, common_output_options, common_batch_options, save_table_to_file, open_table_stream, report_table_stream, suffixed_output_path
+from ..utils import parse_coordinates_batch
+from ..cache import cached_query
+from ..batch import run_batch, iter_completed, merge_tables
+from ..name_resolver import resolve_name
+from ..vizier_index import VizierIndex, get_vizier_index, fetch_table_ucds
+from ..crossmatch import read_local_table, table_skycoord, upload_chunks, nearest_per_row, join_matches, MATCH_MODES, UPLOAD_ROW_COLUMN, UPLOAD_RA_COLUMN, UPLOAD_DEC_COLUMN
+from .. import config
+import hashlib
+import os
+import time
+from datetime import datetime
+from astropy.table import Table as AstropyTable
+import numpy as np
 import re # Import re
 from io import StringIO # Import StringIO
 from contextlib import redirect_stdout # Import redirect_stdout
 from astroquery_cli.common_options import setup_debug_context # Import setup_debug_context
 from astroquery_cli.debug import debug # Import debug function
+from astroquery_cli.http_session import use_shared_pool
 
 def get_app():
     import builtins
@@ -109,7 +123,7 @@ def get_app():
                     return SkyCoord(ra, dec, frame='icrs', unit='deg')
                 except ValueError:
                     pass
-            return SkyCoord.from_name(coords_str)
+            return resolve_name(coords_str)
         except Exception:
             try:
                 return SkyCoord(coords_str, frame='icrs', unit=(u.deg, u.deg))
@@ -136,6 +150,122 @@ def get_app():
         "vizier_nao": "vizier.nao.ac.jp",
         "vizier_adac": "vizier.china-vo.org",
     }
+    use_shared_pool(Vizier)
+
+    def save_result_tables(ctx: typer.Context, result_tables, output_file: Optional[str], output_format: Optional[str],
+                           output_columns: Optional[List[str]], compression: Optional[str], query_type: str,
+                           suffix: bool = False):
+        """
+        Saves each non-empty catalog table; with several catalogs the name gets a
+        per-catalog suffix. On stdout ('-o -') several tables are stacked into one
+        with a leading '_catalog' column, or refused if their columns conflict.
+        """
+        if not output_file:
+            return
+        tables = [(name, result_tables[name]) for name in result_tables.keys()
+                  if result_tables[name] is not None and len(result_tables[name]) > 0]
+        if output_file == "-" and len(tables) > 1:
+            tagged = []
+            for table_name, table_data in tables:
+                table_data = table_data.copy(copy_data=False)
+                table_data.add_column([table_name] * len(table_data), name="_catalog", index=0)
+                tagged.append(table_data)
+            try:
+                combined = merge_tables(tagged)
+            except Exception as e:
+                console.print(_("[bold red]The {count} result tables cannot be combined on standard output ({error}). Write them to a file instead; each table then gets its own file.[/bold red]").format(count=len(tables), error=e))
+                raise typer.Exit(code=1)
+            save_table_to_file(ctx, combined, output_file, output_format, query_type, columns=output_columns, compression=compression)
+            return
+        for table_name, table_data in tables:
+            target_file = output_file
+            if (suffix or len(tables) > 1) and output_file != "-":
+                target_file = suffixed_output_path(output_file, table_name)
+            save_table_to_file(ctx, table_data, target_file, output_format, query_type, columns=output_columns, compression=compression)
+
+    def query_catalogs(ctx: typer.Context, catalogs: Optional[List[str]], build_vizier: Callable[[Optional[str]], Vizier],
+                       run_query: Callable[[Vizier], object], title: Callable[[str], str], query_type: str,
+                       concurrency: Optional[int], max_rows_display: int, show_all_columns: bool,
+                       output_file: Optional[str], output_format: Optional[str], output_columns: Optional[List[str]],
+                       compression: Optional[str], cache_endpoint: Optional[str] = None, cache_params: Optional[dict] = None,
+                       no_cache: bool = False, refresh: bool = False, max_tables_display: Optional[int] = None):
+        """
+        Queries every catalog with its own Vizier instance on a thread pool. Each
+        catalog's tables are displayed and saved as soon as its query returns, so
+        a slow catalog does not hold back the others, and a failing one is only
+        reported in the closing summary. `catalogs=None` runs one unsplit query.
+        """
+        jobs = list(dict.fromkeys(catalogs)) if catalogs else [None]
+
+        def fetch(catalog: Optional[str]):
+            viz = use_shared_pool(build_vizier(catalog))
+            if cache_endpoint:
+                params = dict(cache_params or {}, catalogs=[catalog] if catalog else None)
+                return cached_query("vizier", cache_endpoint, params, lambda: run_query(viz), no_cache=no_cache, refresh=refresh)
+            return run_query(viz)
+
+        summary = {"catalog": [], "tables": [], "rows": [], "seconds": [], "status": []}
+        errors = []
+        # Standard output takes one table, so results are collected and written at the end
+        stdout_results = {}
+        displayed = 0
+        workers = min(len(jobs), concurrency or config.get_batch_concurrency("vizier_catalogs"))
+        debug(f"VizieR: {len(jobs)} catalog quer(ies), concurrency={workers}")
+        for catalog, result_tables, error, elapsed in iter_completed(jobs, fetch, workers):
+            label = catalog or _("all catalogs")
+            summary["catalog"].append(label)
+            summary["seconds"].append(round(elapsed, 2))
+            if error is not None:
+                errors.append(error)
+                summary["tables"].append(0)
+                summary["rows"].append(0)
+                summary["status"].append(_("failed ({error_type})").format(error_type=type(error).__name__))
+                console.print(_("[bold red]Catalog '{catalog}' failed: {error}[/bold red]").format(catalog=label, error=error))
+                continue
+            names = list(result_tables.keys()) if result_tables else []
+            summary["tables"].append(len(names))
+            summary["rows"].append(sum(len(result_tables[name]) for name in names if result_tables[name] is not None))
+            summary["status"].append("ok" if names else "no results")
+            if not names:
+                console.print(_("[yellow]No results returned from VizieR for catalog '{catalog}'.[/yellow]").format(catalog=label))
+                continue
+            for table_name in names:
+                table_data = result_tables[table_name]
+                if table_data is None or len(table_data) == 0:
+                    console.print(_("[yellow]No data found in catalog '{catalog_name}' for the given criteria.[/yellow]").format(catalog_name=table_name))
+                elif max_tables_display is None or displayed < max_tables_display:
+                    display_table(ctx, table_data, title=title(table_name), max_rows=max_rows_display, show_all_columns=show_all_columns)
+                    displayed += 1
+            if output_file == "-":
+                stdout_results[catalog] = [(name, result_tables[name]) for name in names]
+            else:
+                save_result_tables(ctx, result_tables, output_file, output_format, output_columns, compression, query_type, suffix=len(jobs) > 1)
+
+        if len(jobs) > 1:
+            order = {catalog or _("all catalogs"): i for i, catalog in enumerate(jobs)}
+            summary_table = AstropyTable(summary)
+            summary_table["order"] = [order[name] for name in summary_table["catalog"]]
+            summary_table.sort("order")
+            summary_table.remove_column("order")
+            display_table(ctx, summary_table, title=_("VizieR catalog summary"), max_rows=-1, show_all_columns=True)
+        if len(errors) == len(jobs):
+            handle_astroquery_exception(ctx, errors[0], query_type)
+            raise typer.Exit(code=1)
+        if stdout_results:
+            stdout_tables = {name: table for catalog in jobs for name, table in stdout_results.get(catalog, [])}
+            save_result_tables(ctx, stdout_tables, output_file, output_format, output_columns, compression, query_type)
+
+    def open_catalog_index(ctx: typer.Context, remote_fallback: bool) -> Optional[VizierIndex]:
+        """Returns the local catalog index, or None (with a hint) when it has not been built yet."""
+        index = get_vizier_index()
+        if not index.exists():
+            if remote_fallback:
+                console.print(_("[yellow]No local VizieR catalog index yet; searching VizieR remotely. Run 'aqc vizier index update' once for instant offline searches.[/yellow]"))
+            return None
+        age = index.age_days()
+        if age is not None and age > config.get_vizier_index_max_age_days():
+            console.print(_("[yellow]The local VizieR catalog index is {days:.0f} days old; refresh it with 'aqc vizier index update'.[/yellow]").format(days=age))
+        return index
 
     @app.command(name="find-catalogs", help=builtins._("Find VizieR catalogs based on keywords, UCDs, or source names."))
     def find_catalogs(ctx: typer.Context,
@@ -144,6 +274,7 @@ def get_app():
         source_name: Optional[str] = typer.Option(None, "--source", help=builtins._("Source name or pattern (e.g., 'Gaia DR3', '2MASS').")),
         max_catalogs: int = typer.Option(20, help=builtins._("Maximum number of catalogs to list.")),
         show_all_columns: bool = typer.Option(False, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
+        remote: bool = typer.Option(False, "--remote", help=builtins._("Search VizieR online instead of the local catalog index.")),
         vizier_server: str = typer.Option(
             "vizier_cds",
             help=builtins._("VizieR server to use. Choices: {server_list}").format(server_list=list(VIZIER_SERVERS.keys())),
@@ -151,7 +282,6 @@ def get_app():
         ),
         test: bool = typer.Option(False, "--test", "-t", help=_("Enable test mode and print elapsed time."))
     ):
-        import time
         start = time.perf_counter() if test else None
 
         console.print(_("[cyan]Searching for VizieR catalogs...[/cyan]"))
@@ -174,12 +304,26 @@ def get_app():
             console.print(_("Example: `aqc vizier find-catalogs --keyword photometry --keyword M31`"))
             raise typer.Exit(code=1)
 
+        terms = list(keywords or []) + ([source_name] if source_name else [])
+        index = None if remote else open_catalog_index(ctx, remote_fallback=True)
         try:
-            result_tables = Vizier.find_catalogs(**query_params)
-            if result_tables and len(result_tables) > 0 and 0 in result_tables.keys():
+            if index is not None:
+                found = index.search(terms, ucd=ucd, limit=max_catalogs)
+            else:
+                if config.get_offline_mode():
+                    console.print(_("[bold red]Offline mode: no local VizieR catalog index to search. Run 'aqc vizier index update' while online.[/bold red]"))
+                    raise typer.Exit(code=1)
+                if ucd:
+                    console.print(_("[yellow]The remote VizieR search does not filter by UCD; build the local index to use --ucd.[/yellow]"))
+                resources = Vizier.find_catalogs(" ".join(terms), max_catalogs=max_catalogs) if terms else {}
+                found = AstropyTable({
+                    "catalog": list(resources.keys()),
+                    "description": [getattr(resource, "description", "") or "" for resource in resources.values()],
+                }) if resources else AstropyTable()
+            if len(found) > 0:
                 display_table(
                     ctx,
-                    result_tables[0],
+                    found,
                     title=_("Found VizieR Catalogs"),
                     max_rows=max_catalogs,
                     show_all_columns=show_all_columns
@@ -188,6 +332,8 @@ def get_app():
                 console.print(_("[yellow]No catalogs found matching your criteria.[/yellow]"))
                 return
 
+        except typer.Exit:
+            raise
         except Exception as e:
             handle_astroquery_exception(ctx, e, _("VizieR find_catalogs"))
             raise typer.Exit(code=1)
@@ -200,60 +346,79 @@ def get_app():
     @app.command(
         name="list",
         help=builtins._(
-            "List all available VizieR catalogs. "
-            "Note: VizieR API does not support listing all catalogs at once. "
-            "If no catalogs are found, try 'find-catalogs' with keywords. "
-            "Common keywords: 'photometry', 'galaxy', 'quasar', 'gaia', '2mass', 'sdss', 'star', 'cluster', 'radio', 'infrared', 'xray', 'survey', 'variable', 'proper motion', 'catalog'. "
-            "Example: aqc vizier find-catalogs --keyword photometry --keyword galaxy"
+            "List VizieR catalogs from the local catalog index (build it with 'aqc vizier index update'). "
+            "Use --prefix to browse a collection, e.g. 'J/ApJ' or 'II/'."
         )
     )
     @global_keyboard_interrupt_handler
     def list_catalogs(ctx: typer.Context,
-        max_catalogs: int = typer.Option(20, help=builtins._("Maximum number of catalogs to list.")),
+        prefix: Optional[str] = typer.Option(None, "--prefix", help=builtins._("Only catalogs whose ID starts with this prefix (e.g., 'J/ApJ', 'I/')."), show_default=False),
+        max_catalogs: int = typer.Option(20, help=builtins._("Maximum number of catalogs to list. Use -1 for all.")),
         show_all_columns: bool = typer.Option(False, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
-        vizier_server: str = typer.Option(
-            "vizier_cds",
-            help=builtins._("VizieR server to use. Choices: {server_list}").format(server_list=list(VIZIER_SERVERS.keys())),
-            autocompletion=lambda: list(VIZIER_SERVERS.keys())
-        )
+        output_file: Optional[str] = common_output_options["output_file"],
+        output_format: Optional[str] = common_output_options["output_format"],
     ):
-        console.print(_("[cyan]Attempting to list all VizieR catalogs...[/cyan]"))
-        console.print(_("[yellow]Note: If this returns no catalogs, the VizieR service might not support listing all catalogs directly, or there might be a network issue. Consider using 'find-catalogs' with specific keywords instead.[/yellow]"))
-        vizier_conf.server = VIZIER_SERVERS.get(vizier_server.lower(), vizier_conf.server)
-        debug(_("Using VizieR server: {server_url}").format(server_url=vizier_conf.server))
+        index = open_catalog_index(ctx, remote_fallback=False)
+        if index is None:
+            console.print(_("[yellow]VizieR cannot list all catalogs in one request; 'list' reads the local catalog index instead.[/yellow]"))
+            console.print(_("[yellow]Build it once with: aqc vizier index update[/yellow]"))
+            raise typer.Exit(code=1)
+        catalogs_table = index.list_catalogs(prefix=prefix, limit=max_catalogs)
+        if len(catalogs_table) == 0:
+            console.print(_("[yellow]No catalogs in the local index match '{prefix}'.[/yellow]").format(prefix=prefix))
+            return
+        display_table(ctx, catalogs_table, title=_("VizieR Catalogs"), max_rows=max_catalogs, show_all_columns=show_all_columns)
+        if output_file:
+            save_table_to_file(ctx, catalogs_table, output_file, output_format, _("VizieR catalog list"))
+
+    index_app = typer.Typer(
+        name="index",
+        help=builtins._("Manage the local VizieR catalog metadata index used by 'find-catalogs' and 'list'."),
+        no_args_is_help=True
+    )
 
-        try:
-            # Attempt to get all catalogs. If this fails or returns empty,
-            # we will fall back to a keyword search and provide suggestions.
-            all_catalogs = Vizier.get_catalogs(catalog=[])
-            
-            if all_catalogs:
-                display_table(
-                    ctx,
-                    all_catalogs[0],
-                    title=_("All Available VizieR Catalogs"),
-                    max_rows=max_catalogs,
-                    show_all_columns=show_all_columns
-                )
-            else:
-                console.print(_(
-                    "[yellow]No catalogs found using direct listing. "
-                    "VizieR API does not support listing all catalogs at once. "
-                    "Please use keyword search. "
-                    "Common keywords: 'photometry', 'galaxy', 'quasar', 'gaia', '2mass', 'sdss', 'star', 'cluster', 'radio', 'infrared', 'xray', 'survey', 'variable', 'proper motion', 'catalog'.[/yellow]"
-                ))
-                console.print(_("[yellow]Example: aqc vizier find-catalogs --keyword photometry --keyword galaxy[/yellow]"))
-                return
+    @index_app.command(name="update", help=builtins._("Download or incrementally refresh the local catalog index from TAPVizieR."))
+    @global_keyboard_interrupt_handler
+    def index_update(ctx: typer.Context,
+        full: bool = typer.Option(False, "--full", help=builtins._("Re-fetch column UCDs for every table, not only new ones.")),
+        with_ucds: bool = typer.Option(True, "--ucds/--no-ucds", help=builtins._("Index column UCDs (needed for find-catalogs --ucd).")),
+        concurrency: Optional[int] = common_batch_options["concurrency"],
+    ):
+        index = get_vizier_index()
+        console.print(_("[cyan]Updating the VizieR catalog index at {path}...[/cyan]").format(path=index.path))
+        started = time.perf_counter()
+
+        def fetch_ucds(chunks):
+            labels = [str(i) for i in range(len(chunks))]
+            merged, failures = run_batch(
+                "vizier_index", labels,
+                # Tables without UCDs get one empty row so they count as fetched
+                lambda label: AstropyTable(rows=[(name, ucd) for name, ucds in fetch_table_ucds(chunks[int(label)]).items() for ucd in ucds or [""]], names=("table_name", "ucd"), dtype=(str, str)),
+                concurrency=concurrency, description=_("Column UCDs"), tag=False,
+            )
+            for label, message in failures:
+                console.print(_("[yellow]UCDs of {count} table(s) could not be fetched: {error}[/yellow]").format(count=len(chunks[int(label)]), error=message))
+            ucds = {}
+            for row in merged if merged is not None else []:
+                ucds.setdefault(str(row["table_name"]), []).append(str(row["ucd"]))
+            return ucds
 
+        try:
+            counts = index.update(full=full, with_ucds=with_ucds, fetch_ucds=fetch_ucds)
         except Exception as e:
-            handle_astroquery_exception(ctx, e, _("VizieR list_catalogs"))
-            console.print(_(
-                "[yellow]VizieR API does not support listing all catalogs at once. "
-                "Please use keyword search. "
-                "Common keywords: 'photometry', 'galaxy', 'quasar', 'gaia', '2mass', 'sdss', 'star', 'cluster', 'radio', 'infrared', 'xray', 'survey', 'variable', 'proper motion', 'catalog'.[/yellow]"
-            ))
-            console.print(_("[yellow]Example: aqc vizier find-catalogs --keyword photometry --keyword galaxy[/yellow]"))
+            handle_astroquery_exception(ctx, e, _("VizieR index update"))
+            raise typer.Exit(code=1)
+        console.print(_("[green]Indexed {tables} table(s): {added} new, {removed} removed, UCDs fetched for {ucd_tables} ({elapsed:.1f} s).[/green]").format(elapsed=time.perf_counter() - started, **counts))
+
+    @index_app.command(name="status", help=builtins._("Show the size and age of the local catalog index."))
+    def index_status(ctx: typer.Context):
+        status = get_vizier_index().status()
+        if not status.get("tables"):
+            console.print(_("[yellow]No local VizieR catalog index yet. Build it with 'aqc vizier index update'.[/yellow]"))
             return
+        updated = datetime.fromtimestamp(status["updated"]).isoformat(timespec="seconds") if status.get("updated") else "?"
+        console.print(_("[cyan]{catalogs} catalog(s), {tables} table(s), updated {updated}[/cyan]").format(catalogs=status["catalogs"], tables=status["tables"], updated=updated))
+        console.print(_("[cyan]Path: {path}[/cyan]").format(path=status["path"]))
 
     @app.command(name="object", help=builtins._("Query catalogs around an object name or specific coordinates."))
     @global_keyboard_interrupt_handler
@@ -270,7 +435,14 @@ def get_app():
             "vizier_cds",
             help=builtins._("VizieR server to use. Choices: {server_list}").format(server_list=list(VIZIER_SERVERS.keys())),
             autocompletion=lambda: list(VIZIER_SERVERS.keys())
-        )
+        ),
+        output_file: Optional[str] = common_output_options["output_file"],
+        output_format: Optional[str] = common_output_options["output_format"],
+        output_columns: Optional[List[str]] = common_output_options["columns"],
+        compression: Optional[str] = common_output_options["compression"],
+        concurrency: Optional[int] = typer.Option(None, "--concurrency", help=builtins._("Number of catalogs queried in parallel (default from config, 6).")),
+        no_cache: bool = common_cache_options["no_cache"],
+        refresh: bool = common_cache_options["refresh"],
     ):
         catalogs_to_query = catalogs if catalogs is not None else ['I/261/gaiadr3']
         console.print(_("[cyan]Querying VizieR for object '{target_name}' in catalog(s): {catalog_list}...[/cyan]").format(target_name=target, catalog_list=', '.join(catalogs_to_query)))
@@ -284,28 +456,23 @@ def get_app():
         # Process column_filters to be a dictionary as expected by Vizier
         processed_column_filters = parse_constraints_list(ctx, column_filters)
 
-        viz = Vizier(columns=columns if columns else ["*"], catalog=catalogs_to_query, column_filters=processed_column_filters, row_limit=row_limit)
-
-        try:
-            result_tables = viz.query_object(
-                coords,
-                radius=rad_quantity,
-            )
-
-            if not result_tables:
-                console.print(_("[yellow]No results returned from VizieR for this query.[/yellow]"))
-                return
-
-            for table_name in result_tables.keys():
-                table_data = result_tables[table_name]
-                if table_data is not None and len(table_data) > 0:
-                    display_table(ctx, table_data, title=_("Results from {catalog_name} for {target_name}").format(catalog_name=table_name, target_name=target), max_rows=max_rows_display, show_all_columns=show_all_columns)
-                else:
-                    console.print(_("[yellow]No data found in catalog '{catalog_name}' for the given criteria.[/yellow]").format(catalog_name=table_name))
-
-        except Exception as e:
-            handle_astroquery_exception(ctx, e, _("Vizier object"))
-            raise typer.Exit(code=1)
+        cache_params = {
+            "coordinates": coords,
+            "radius": rad_quantity,
+            "columns": columns,
+            "column_filters": processed_column_filters,
+            "row_limit": row_limit,
+            "server": vizier_conf.server,
+        }
+        query_catalogs(
+            ctx, catalogs_to_query,
+            lambda catalog: Vizier(columns=columns if columns else ["*"], catalog=catalog, column_filters=processed_column_filters, row_limit=row_limit),
+            lambda viz: viz.query_object(coords, radius=rad_quantity),
+            lambda table_name: _("Results from {catalog_name} for {target_name}").format(catalog_name=table_name, target_name=target),
+            _("VizieR object query"), concurrency, max_rows_display, show_all_columns,
+            output_file, output_format, output_columns, compression,
+            cache_endpoint="query_object", cache_params=cache_params, no_cache=no_cache, refresh=refresh,
+        )
 
 
     @app.command(name="region", help=builtins._("Query catalogs within a sky region (cone or box)."))
@@ -325,7 +492,14 @@ def get_app():
             "vizier_cds",
             help=builtins._("VizieR server to use. Choices: {server_list}").format(server_list=list(VIZIER_SERVERS.keys())),
             autocompletion=lambda: list(VIZIER_SERVERS.keys())
-        )
+        ),
+        output_file: Optional[str] = common_output_options["output_file"],
+        output_format: Optional[str] = common_output_options["output_format"],
+        output_columns: Optional[List[str]] = common_output_options["columns"],
+        compression: Optional[str] = common_output_options["compression"],
+        concurrency: Optional[int] = typer.Option(None, "--concurrency", help=builtins._("Number of catalogs queried in parallel (default from config, 6).")),
+        no_cache: bool = common_cache_options["no_cache"],
+        refresh: bool = common_cache_options["refresh"],
     ):
         catalogs_to_query = catalogs if catalogs is not None else ['I/261/gaiadr3']
         console.print(_(f"[cyan]Querying VizieR region around '{coordinates}' in catalog(s): {', '.join(catalogs_to_query)}...[/cyan]"))
@@ -351,33 +525,31 @@ def get_app():
         # Process column_filters to be a dictionary as expected by Vizier
         processed_column_filters = parse_constraints_list(ctx, column_filters)
 
-        viz = Vizier(columns=columns if columns else ["*"], catalog=catalogs, column_filters=processed_column_filters, row_limit=row_limit)
-
-        try:
-            result_tables = viz.query_region(
+        cache_params = {
+            "coordinates": coords_obj,
+            "radius": rad_quantity,
+            "width": width_quantity,
+            "height": height_quantity,
+            "columns": columns,
+            "column_filters": processed_column_filters,
+            "row_limit": row_limit,
+            "server": vizier_conf.server,
+        }
+        query_catalogs(
+            ctx, catalogs,
+            lambda catalog: Vizier(columns=columns if columns else ["*"], catalog=catalog, column_filters=processed_column_filters, row_limit=row_limit),
+            lambda viz: viz.query_region(
                 coordinates=coords_obj,
                 radius=rad_quantity,
                 width=width_quantity,
                 height=height_quantity,
-            )
-
-            if not result_tables:
-                console.print(_("[yellow]No results returned from VizieR for this query.[/yellow]"))
-                return
-
-            max_tables_display = 5
-            for idx, table_name in enumerate(result_tables.keys()):
-                if idx >= max_tables_display:
-                    break
-                table_data = result_tables[table_name]
-                if table_data is not None and len(table_data) > 0:
-                    display_table(ctx, table_data, title=_(f"Results from {table_name} for region around {coordinates}"), max_rows=max_rows_display, show_all_columns=show_all_columns)
-                else:
-                    console.print(_(f"[yellow]No data found in catalog '{table_name}' for the given criteria.[/yellow]"))
-
-        except Exception as e:
-            handle_astroquery_exception(ctx, e, _("Vizier region"))
-            raise typer.Exit(code=1)
+            ),
+            lambda table_name: _(f"Results from {table_name} for region around {coordinates}"),
+            _("VizieR region query"), concurrency, max_rows_display, show_all_columns,
+            output_file, output_format, output_columns, compression,
+            cache_endpoint="query_region", cache_params=cache_params, no_cache=no_cache, refresh=refresh,
+            max_tables_display=5,
+        )
 
 
     @app.command(name="constraints", help=builtins._("Query catalogs based on specific column constraints or keywords."))
@@ -394,7 +566,12 @@ def get_app():
             "vizier_cds",
             help=builtins._("VizieR server to use. Choices: {server_list}").format(server_list=list(VIZIER_SERVERS.keys())),
             autocompletion=lambda: list(VIZIER_SERVERS.keys())
-        )
+        ),
+        output_file: Optional[str] = common_output_options["output_file"],
+        output_format: Optional[str] = common_output_options["output_format"],
+        output_columns: Optional[List[str]] = common_output_options["columns"],
+        compression: Optional[str] = common_output_options["compression"],
+        concurrency: Optional[int] = typer.Option(None, "--concurrency", help=builtins._("Number of catalogs queried in parallel (default from config, 6).")),
     ):
         console.print(_(f"[cyan]Querying VizieR with constraints in catalog(s): {', '.join(catalogs)}...[/cyan]"))
         vizier_conf.server = VIZIER_SERVERS.get(vizier_server.lower(), vizier_conf.server)
@@ -415,25 +592,139 @@ def get_app():
             debug(_(f"Using keywords: {query_kwargs['keywords']}"))
 
 
-        viz = Vizier(columns=columns if columns else ["*"], row_limit=row_limit)
-        viz.catalog = catalogs
+        query_catalogs(
+            ctx, catalogs,
+            lambda catalog: Vizier(columns=columns if columns else ["*"], catalog=catalog, row_limit=row_limit),
+            lambda viz: viz.query_constraints(**query_kwargs),
+            lambda table_name: _(f"Constraint Query Results from {table_name}"),
+            _("VizieR constraints query"), concurrency, max_rows_display, show_all_columns,
+            output_file, output_format, output_columns, compression,
+        )
 
-        try:
-            result_tables = viz.query_constraints(**query_kwargs)
+    # CDS XMatch accepts at most this match radius
+    XMATCH_MAX_RADIUS = 180 * u.arcsec
 
-            if not result_tables:
-                console.print(_("[yellow]No results returned from VizieR for this query.[/yellow]"))
-                return
+    @app.command(name="xmatch", help=builtins._("Cross-match an uploaded list of positions against a VizieR catalog (CDS XMatch)."))
+    @global_keyboard_interrupt_handler
+    def xmatch(ctx: typer.Context,
+        upload: str = typer.Option(..., "--upload", "-u", help=builtins._("Local table of positions (CSV, ECSV, VOTable, FITS, Parquet), or '-' for CSV on stdin.")),
+        catalog: str = typer.Option(..., "--catalog", "-c", help=builtins._("VizieR table to match against (e.g., 'I/355/gaiadr3').")),
+        radius: str = typer.Option("2arcsec", "--radius", "-r", help=builtins._("Match radius, at most 180arcsec (e.g., '2arcsec').")),
+        mode: str = typer.Option("all", "--mode", "-m", help=builtins._("'all': every counterpart within the radius; 'best': nearest counterpart per uploaded row."), autocompletion=lambda: list(MATCH_MODES)),
+        ra_col: Optional[str] = typer.Option(None, "--ra-col", help=builtins._("RA column of the uploaded table (default: detected).")),
+        dec_col: Optional[str] = typer.Option(None, "--dec-col", help=builtins._("Dec column of the uploaded table (default: detected).")),
+        coord_col: Optional[str] = typer.Option(None, "--coord-col", help=builtins._("Single coordinate-string column of the uploaded table.")),
+        chunk_size: Optional[int] = typer.Option(None, "--chunk-size", min=1, help=builtins._("Positions per upload (default: xmatch_chunk_rows in config.ini, 20000). Larger lists are split and the chunks sent concurrently.")),
+        concurrency: Optional[int] = common_batch_options["concurrency"],
+        retries: Optional[int] = common_batch_options["retries"],
+        max_rows_display: int = typer.Option(20, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
+        show_all_columns: bool = typer.Option(False, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
+        output_file: Optional[str] = common_output_options["output_file"],
+        output_format: Optional[str] = common_output_options["output_format"],
+        output_columns: Optional[List[str]] = common_output_options["columns"],
+        compression: Optional[str] = common_output_options["compression"],
+        no_cache: bool = common_cache_options["no_cache"],
+        refresh: bool = common_cache_options["refresh"],
+    ):
+        """
+        Example: aqc vizier xmatch --upload targets.csv --catalog I/355/gaiadr3 --radius 2arcsec -o matched.parquet
+        """
+        from astroquery.xmatch import XMatch
+
+        mode = mode.lower()
+        if mode not in MATCH_MODES:
+            console.print(_("[bold red]Invalid --mode '{mode}'. Choose from: {choices}.[/bold red]").format(mode=mode, choices=", ".join(MATCH_MODES)))
+            raise typer.Exit(code=1)
+        rad_quantity = parse_angle_str_to_quantity(ctx, radius)
+        if rad_quantity > XMATCH_MAX_RADIUS:
+            console.print(_("[bold red]CDS XMatch accepts a radius of at most 180arcsec.[/bold red]"))
+            raise typer.Exit(code=1)
 
-            for table_name in result_tables.keys():
-                table_data = result_tables[table_name]
-                if table_data is not None and len(table_data) > 0:
-                    display_table(ctx, table_data, title=_(f"Constraint Query Results from {table_name}"), max_rows=max_rows_display, show_all_columns=show_all_columns)
-                else:
-                    console.print(_(f"[yellow]No data found in catalog '{table_name}' for the given criteria.[/yellow]"))
+        try:
+            local_table = read_local_table(upload)
+            coords, valid, described = table_skycoord(
+                local_table, ra_col=ra_col, dec_col=dec_col, coord_col=coord_col,
+                parse_many=lambda strings: parse_coordinates_batch(ctx, strings),
+            )
+        except KeyError as e:
+            console.print(_("[bold red]No usable coordinate column in '{path}' ({error}). Use --ra-col/--dec-col or --coord-col.[/bold red]").format(path=upload, error=e))
+            raise typer.Exit(code=1)
+        except Exception as e:
+            console.print(_("[bold red]Could not read '{path}': {error}[/bold red]").format(path=upload, error=e))
+            raise typer.Exit(code=1)
+        invalid = int((~valid).sum())
+        if invalid:
+            console.print(_("[yellow]{count} row(s) have no valid coordinates and are not uploaded.[/yellow]").format(count=invalid))
+        debug(f"Upload positions from {described}")
 
+        xmatch_service = use_shared_pool(XMatch.__class__())
+        cat2 = catalog if catalog.startswith("vizier:") else f"vizier:{catalog}"
+        try:
+            if not xmatch_service.is_table_available(cat2):
+                console.print(_("[bold red]'{catalog}' is not available on the CDS XMatch server (only VizieR tables with positions are).[/bold red]").format(catalog=catalog))
+                raise typer.Exit(code=1)
+        except typer.Exit:
+            raise
         except Exception as e:
-            handle_astroquery_exception(ctx, e, _("Vizier constraints"))
+            handle_astroquery_exception(ctx, e, _("VizieR xmatch"))
             raise typer.Exit(code=1)
 
+        chunks = upload_chunks(coords, valid, chunk_size or config.get_xmatch_chunk_rows())
+        labels = [_("chunk {index}").format(index=i + 1) for i in range(len(chunks))]
+        chunk_by_label = dict(zip(labels, chunks))
+        console.print(_("[cyan]Cross-matching {count} position(s) against {catalog} within {radius} in {chunks} upload(s)...[/cyan]").format(count=int(valid.sum()), catalog=catalog, radius=rad_quantity, chunks=len(chunks)))
+
+        def fetch_chunk(label: str):
+            chunk = chunk_by_label[label]
+            digest = hashlib.sha1(np.ascontiguousarray(chunk[UPLOAD_ROW_COLUMN]).tobytes()
+                                  + np.ascontiguousarray(chunk[UPLOAD_RA_COLUMN]).tobytes()
+                                  + np.ascontiguousarray(chunk[UPLOAD_DEC_COLUMN]).tobytes()).hexdigest()
+            cache_params = {"catalog": cat2, "radius": rad_quantity, "positions": digest}
+            matches = cached_query(
+                "vizier", "xmatch", cache_params,
+                lambda: xmatch_service.query(cat1=chunk, cat2=cat2, max_distance=rad_quantity,
+                                             colRA1=UPLOAD_RA_COLUMN, colDec1=UPLOAD_DEC_COLUMN, cache=False),
+                no_cache=no_cache, refresh=refresh
+            )
+            if matches is None or len(matches) == 0:
+                return None
+            if mode == "best":
+                matches = nearest_per_row(matches, UPLOAD_ROW_COLUMN, "angDist")
+            counterpart = matches.copy(copy_data=False)
+            counterpart.remove_columns([c for c in (UPLOAD_ROW_COLUMN, UPLOAD_RA_COLUMN, UPLOAD_DEC_COLUMN, "angDist") if c in counterpart.colnames])
+            return join_matches(
+                local_table, counterpart, np.asarray(matches[UPLOAD_ROW_COLUMN], dtype=int), np.arange(len(matches)),
+                np.asarray(matches["angDist"], dtype=float) * u.arcsec,
+            )
+
+        writer = open_table_stream(ctx, output_file, output_format, _("VizieR xmatch"), columns=output_columns, compression=compression) if output_file else None
+        try:
+            result_table, failures = run_batch(
+                "vizier_xmatch", labels, fetch_chunk, concurrency=concurrency,
+                retries=retries if retries is not None else config.get_batch_retries("vizier_xmatch"),
+                description=_("XMatch uploads"), tag=False,
+                on_result=(lambda label, table: writer.write(table)) if writer else None,
+            )
+        finally:
+            if writer:
+                writer.close()
+
+        for label, message in failures:
+            console.print(_("[bold red]Upload {label} failed: {error}[/bold red]").format(label=label, error=message))
+        if result_table is None or len(result_table) == 0:
+            console.print(_("[yellow]No counterparts found in {catalog} within {radius}.[/yellow]").format(catalog=catalog, radius=rad_quantity))
+            raise typer.Exit(code=1 if failures else 0)
+
+        console.print(_("[green]{pairs} match(es) for {count} uploaded position(s).[/green]").format(pairs=len(result_table), count=int(valid.sum())))
+        display_table(ctx, result_table, title=_("XMatch results against {catalog}").format(catalog=catalog), max_rows=max_rows_display, show_all_columns=show_all_columns)
+        if writer:
+            report_table_stream(writer)
+        elif output_file:
+            save_table_to_file(ctx, result_table, output_file, output_format, _("VizieR xmatch"), columns=output_columns, compression=compression)
+        if failures:
+            console.print(_("[yellow]{count} upload(s) failed; results are incomplete.[/yellow]").format(count=len(failures)))
+            raise typer.Exit(code=1)
+
+    app.add_typer(index_app, name="index")
+
     return app
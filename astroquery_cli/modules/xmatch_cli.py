@@ -0,0 +1,104 @@
+from typing import Optional, List
+
+import typer
+import numpy as np
+import astropy.units as u
+
+from ..utils import console, display_table, handle_astroquery_exception, parse_coordinates_batch, parse_angle_str_to_quantity, common_output_options, save_table_to_file
+from ..crossmatch import read_local_table, table_skycoord, crossmatch, join_matches, MATCH_MODES
+from ..utils import global_keyboard_interrupt_handler
+from astroquery_cli.common_options import setup_debug_context
+from astroquery_cli.debug import debug
+
+def get_app():
+    import builtins
+    _ = builtins._
+    app = typer.Typer(
+        name="xmatch",
+        help=builtins._("Cross-match two local tables by sky position."),
+        no_args_is_help=True,
+    )
+
+    def load_side(ctx, path, table_format, ra_col, dec_col, coord_col, label):
+        try:
+            table = read_local_table(path, table_format)
+        except Exception as e:
+            console.print(_("[bold red]Could not read {label} table '{path}': {error}[/bold red]").format(label=label, path=path, error=e))
+            raise typer.Exit(code=1)
+        try:
+            coords, valid, described = table_skycoord(
+                table, ra_col=ra_col, dec_col=dec_col, coord_col=coord_col,
+                parse_many=lambda strings: parse_coordinates_batch(ctx, strings),
+            )
+        except KeyError as e:
+            console.print(_("[bold red]No usable coordinate column in {label} table '{path}' ({error}). Use --{side}-ra/--{side}-dec or --{side}-coord.[/bold red]").format(label=label, path=path, error=e, side=label))
+            console.print(_("[yellow]Available columns: {columns}[/yellow]").format(columns=", ".join(table.colnames)))
+            raise typer.Exit(code=1)
+        invalid = int((~valid).sum())
+        debug(f"{label}: {len(table)} row(s) from '{path}', coordinates from {described}")
+        if invalid:
+            console.print(_("[yellow]{count} row(s) of the {label} table have no valid coordinates and are skipped.[/yellow]").format(count=invalid, label=label))
+        return table, coords, valid
+
+    @app.command(name="xmatch", help=builtins._("Cross-match two local tables by sky position."))
+    @global_keyboard_interrupt_handler
+    def xmatch(ctx: typer.Context,
+        left_file: str = typer.Argument(..., help=builtins._("Local table (your source list), or '-' for CSV on stdin.")),
+        right_file: str = typer.Argument(..., help=builtins._("Table to match against, e.g. the output of 'aqc vizier region' or 'aqc gaia cone-search'.")),
+        radius: str = typer.Option("1arcsec", "--radius", "-r", help=builtins._("Match radius (e.g., '1arcsec', '0.5arcmin').")),
+        mode: str = typer.Option("best", "--mode", "-m", help=builtins._("'best': nearest match per left row; 'all': every pair within the radius."), autocompletion=lambda: list(MATCH_MODES)),
+        keep_unmatched: bool = typer.Option(False, "--keep-unmatched", help=builtins._("Keep left rows without a match (right-hand columns masked).")),
+        left_ra: Optional[str] = typer.Option(None, "--left-ra", help=builtins._("RA column of the left table (default: detected).")),
+        left_dec: Optional[str] = typer.Option(None, "--left-dec", help=builtins._("Dec column of the left table (default: detected).")),
+        left_coord: Optional[str] = typer.Option(None, "--left-coord", help=builtins._("Single coordinate-string column of the left table, e.g. '10.68 41.27' or '00h42m44s +41d16m09s'.")),
+        right_ra: Optional[str] = typer.Option(None, "--right-ra", help=builtins._("RA column of the right table (default: detected).")),
+        right_dec: Optional[str] = typer.Option(None, "--right-dec", help=builtins._("Dec column of the right table (default: detected).")),
+        right_coord: Optional[str] = typer.Option(None, "--right-coord", help=builtins._("Single coordinate-string column of the right table.")),
+        left_format: Optional[str] = typer.Option(None, "--left-format", help=builtins._("Astropy format of the left table (default: guessed).")),
+        right_format: Optional[str] = typer.Option(None, "--right-format", help=builtins._("Astropy format of the right table (default: guessed).")),
+        output_file: Optional[str] = common_output_options["output_file"],
+        output_format: Optional[str] = common_output_options["output_format"],
+        output_columns: Optional[List[str]] = common_output_options["columns"],
+        compression: Optional[str] = common_output_options["compression"],
+        max_rows_display: int = typer.Option(20, help=builtins._("Maximum number of rows to display. Use -1 for all rows.")),
+        show_all_columns: bool = typer.Option(False, "--show-all-cols", help=builtins._("Show all columns in the output table.")),
+        debug_flag: bool = typer.Option(False, "-t", "--debug", help=_("Enable debug mode with verbose output."), envvar="AQC_DEBUG"),
+        verbose: bool = typer.Option(False, "-v", "--verbose", help=_("Enable verbose output.")),
+    ):
+        """
+        Example: aqc xmatch my_sources.csv gaia_field.ecsv --radius 1arcsec -o matched.ecsv
+        Example: aqc xmatch targets.csv vizier_region.vot --mode all --radius 5arcsec --keep-unmatched
+        """
+        setup_debug_context(ctx, debug_flag, verbose)
+        mode = mode.lower()
+        if mode not in MATCH_MODES:
+            console.print(_("[bold red]Invalid --mode '{mode}'. Choose from: {choices}.[/bold red]").format(mode=mode, choices=", ".join(MATCH_MODES)))
+            raise typer.Exit(code=1)
+        rad_quantity = parse_angle_str_to_quantity(ctx, radius)
+        if rad_quantity is None:
+            console.print(_("[bold red]Invalid radius provided.[/bold red]"))
+            raise typer.Exit(code=1)
+
+        left, left_coords, left_valid = load_side(ctx, left_file, left_format, left_ra, left_dec, left_coord, "left")
+        right, right_coords, right_valid = load_side(ctx, right_file, right_format, right_ra, right_dec, right_coord, "right")
+        console.print(_("[cyan]Cross-matching {left} against {right} row(s) within {radius} ({mode})...[/cyan]").format(left=len(left), right=len(right), radius=rad_quantity, mode=mode))
+
+        try:
+            left_idx, right_idx, separation = crossmatch(left_coords, right_coords, rad_quantity, mode, left_valid, right_valid)
+            result_table = join_matches(left, right, left_idx, right_idx, separation, keep_unmatched=keep_unmatched)
+        except Exception as e:
+            handle_astroquery_exception(ctx, e, _("Cross-match"))
+            raise typer.Exit(code=1)
+
+        matched_left = len(np.unique(left_idx))
+        console.print(_("[green]{matched} of {total} left row(s) matched ({pairs} pair(s)).[/green]").format(matched=matched_left, total=len(left), pairs=len(left_idx)))
+        if len(separation):
+            console.print(_("[cyan]Separation: median {median:.3f}\", max {max:.3f}\".[/cyan]").format(median=np.median(separation.to_value(u.arcsec)), max=separation.to_value(u.arcsec).max()))
+        if len(result_table) == 0:
+            console.print(_("[yellow]No matches found within {radius}.[/yellow]").format(radius=rad_quantity))
+            return
+        display_table(ctx, result_table, title=_("Cross-match Results"), max_rows=max_rows_display, show_all_columns=show_all_columns)
+        if output_file:
+            save_table_to_file(ctx, result_table, output_file, output_format, _("Cross-match"), columns=output_columns, compression=compression)
+
+    return app
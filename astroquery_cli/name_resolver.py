@@ -0,0 +1,205 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+from astropy.coordinates import SkyCoord
+import astropy.units as u
+
+from astroquery_cli import config
+from astroquery_cli.debug import debug
+
+# Sesame resolves through SIMBAD, NED and VizieR (in this order) and lists all aliases
+SESAME_URL = "https://cds.unistra.fr/cgi-bin/nph-sesame/-oxI/SNV?{name}"
+
+
+class NameNotResolved(LookupError):
+    pass
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalizes an object name for lookups: case-folded, whitespace and
+    underscores dropped, so 'M 31', 'm31' and 'M_31' share one entry.
+    Separators between digits are kept ('HD 1 2' differs from 'HD 12').
+    """
+    text = " ".join(str(name).replace("_", " ").split()).casefold()
+    return re.sub(r"(?<!\d) | (?!\d)", "", text)
+
+
+def _parse_sesame(xml_text: str) -> Tuple[float, float, str, List[str]]:
+    """Returns (ra, dec, main name, aliases) from a Sesame XML answer."""
+    root = ET.fromstring(xml_text)
+    for resolver in root.iter("Resolver"):
+        ra = resolver.findtext("jradeg")
+        dec = resolver.findtext("jdedeg")
+        if ra is None or dec is None:
+            continue
+        main_name = " ".join((resolver.findtext("oname") or "").split())
+        aliases = [a.text.strip() for a in resolver.findall("alias") if a.text]
+        return float(ra), float(dec), main_name, aliases
+    raise NameNotResolved("Sesame returned no position")
+
+
+class NameResolver:
+    """
+    Persistent name -> ICRS position cache shared by all commands.
+
+    Entries live in one JSON file (<cache_dir>/names.json) keyed by the
+    normalized name. A resolved name is stored together with its main
+    identifier and all aliases Sesame reports, so looking up 'NGC 224' after
+    'M31' needs no request. Entries older than the TTL are refreshed; in
+    offline mode stale entries are still used and misses fail immediately.
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttl: Optional[int] = None, offline: Optional[bool] = None):
+        self.path = Path(path) if path else config.get_cache_dir() / "names.json"
+        self.ttl = ttl if ttl is not None else config.get_name_cache_ttl()
+        self.offline = offline if offline is not None else config.get_offline_mode()
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, dict]] = None
+        self._dirty = False
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, ValueError) as e:
+                debug(f"Ignoring unreadable name cache {self.path}: {e}")
+                self._entries = {}
+        return self._entries
+
+    def save(self):
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            self._dirty = False
+
+    def _fresh(self, entry: dict) -> bool:
+        return self.ttl < 0 or time.time() - entry.get("resolved", 0) <= self.ttl
+
+    def lookup(self, name: str) -> Optional[SkyCoord]:
+        """Returns the cached position of `name`, or None (no network access)."""
+        with self._lock:
+            entry = self._load().get(normalize_name(name))
+        if entry and (self.offline or self._fresh(entry)):
+            return SkyCoord(ra=entry["ra"] * u.deg, dec=entry["dec"] * u.deg, frame="icrs")
+        return None
+
+    def store(self, name: str, ra: float, dec: float, main_name: str = "", aliases: Iterable[str] = ()):
+        entry = {"ra": ra, "dec": dec, "name": main_name or name, "resolved": time.time()}
+        with self._lock:
+            entries = self._load()
+            for key in {normalize_name(n) for n in [name, main_name, *aliases] if n}:
+                entries[key] = entry
+            self._dirty = True
+
+    def _fetch(self, name: str) -> Tuple[float, float, str, List[str]]:
+        from astroquery_cli.http_session import get_shared_session
+        try:
+            response = get_shared_session().get(SESAME_URL.format(name=quote(name)), timeout=30)
+            response.raise_for_status()
+            return _parse_sesame(response.text)
+        except NameNotResolved:
+            raise
+        except Exception as e:
+            # Sesame mirror or XML problem: fall back to astropy's resolver
+            debug(f"Sesame lookup for '{name}' failed ({e}); trying astropy name resolver")
+            from astropy.coordinates.name_resolve import NameResolveError, get_icrs_coordinates
+            try:
+                coord = get_icrs_coordinates(name)
+            except NameResolveError as err:
+                raise NameNotResolved(str(err)) from err
+            return float(coord.ra.deg), float(coord.dec.deg), "", []
+
+    def resolve(self, name: str) -> SkyCoord:
+        """Returns the ICRS position of `name`, resolving it online on a cache miss."""
+        coord = self.lookup(name)
+        if coord is not None:
+            debug(f"Name cache hit for '{name}'")
+            return coord
+        if self.offline:
+            raise NameNotResolved(f"'{name}' is not in the local name cache (offline mode)")
+        ra, dec, main_name, aliases = self._fetch(name)
+        debug(f"Resolved '{name}' -> {ra:.6f} {dec:+.6f} ({main_name or name}, {len(aliases)} aliases)")
+        self.store(name, ra, dec, main_name, aliases)
+        return SkyCoord(ra=ra * u.deg, dec=dec * u.deg, frame="icrs")
+
+    def resolve_many(self, names: Iterable[str], concurrency: Optional[int] = None) -> Dict[str, object]:
+        """
+        Resolves many names; cache misses are fetched concurrently. Returns
+        name -> SkyCoord, or the exception raised for that name.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        results: Dict[str, object] = {}
+        misses = []
+        for name in dict.fromkeys(names):
+            coord = self.lookup(name)
+            if coord is not None:
+                results[name] = coord
+            else:
+                misses.append(name)
+        if misses:
+            debug(f"Name cache: {len(results)} hit(s), {len(misses)} miss(es)")
+
+            def attempt(name):
+                try:
+                    return self.resolve(name)
+                except Exception as e:
+                    return e
+
+            with ThreadPoolExecutor(max_workers=max(1, concurrency or config.get_batch_concurrency("names"))) as executor:
+                for name, result in zip(misses, executor.map(attempt, misses)):
+                    results[name] = result
+            self.save()
+        return results
+
+    def entries(self) -> Dict[str, dict]:
+        with self._lock:
+            return dict(self._load())
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._load())
+            self._entries = {}
+            self._dirty = True
+        self.save()
+        return count
+
+
+_resolver: Optional[NameResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_name_resolver() -> NameResolver:
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            import atexit
+            _resolver = NameResolver()
+            atexit.register(_resolver.save)
+        return _resolver
+
+
+def resolve_name(name: str) -> SkyCoord:
+    """Resolves an object name through the shared, persistent name cache."""
+    return get_name_resolver().resolve(name)
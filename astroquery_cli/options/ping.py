@@ -4,6 +4,7 @@ import socket
 from urllib.parse import urlparse
 
 from ..i18n import get_translator
+from ..http_session import get_shared_session
 import builtins
 
 URLS = [
@@ -53,7 +54,7 @@ def run_ping():
         http_status = _("Unknown")
         availability_message = _("Service Unavailable")
         try:
-            response = requests.get(url, timeout=5)
+            response = get_shared_session().get(url, timeout=5)
             http_status = _("HTTP Status: {status_code}").format(status_code=response.status_code)
             if response.status_code == 200:
                 availability_message = _("Service Available")
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import astropy.units as u
+from astropy.table import MaskedColumn, Table as AstropyTable
+
+# Column name prefix per SBDB section; orbit elements and physical
+# parameters keep their plain names ('e', 'a', 'H', 'diameter', ...)
+SECTION_PREFIXES = OrderedDict([
+    ("object", ""),
+    ("orbit", "orbit_"),
+    ("phys_par", ""),
+    ("discovery", "discovery_"),
+])
+_UNPREFIXED_SUBSECTIONS = {("orbit", "elements")}
+
+
+class SbdbLookupError(LookupError):
+    pass
+
+
+def check_sbdb_result(target: str, result: Any) -> dict:
+    """Raises SbdbLookupError for 'not found' and 'several matches' answers."""
+    if not hasattr(result, "get"):
+        raise SbdbLookupError(f"unexpected SBDB answer for '{target}'")
+    if "object" in result:
+        return result
+    if "list" in result:
+        names = result["list"].get("name") or result["list"].get("pdes") or []
+        names = [names] if isinstance(names, str) else list(names)
+        raise SbdbLookupError(f"'{target}' matches {len(names)} bodies ({', '.join(map(str, names[:5]))}...)")
+    raise SbdbLookupError(result.get("message") or f"'{target}' not found in SBDB")
+
+
+def _scalar(value: Any) -> Any:
+    if isinstance(value, u.Quantity):
+        return value if value.isscalar else "; ".join(str(v) for v in value.value)
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return "; ".join(str(_scalar(v)) for v in value)
+    return value
+
+
+def flatten_sbdb(result: dict) -> "OrderedDict[str, Any]":
+    """
+    Flattens one SBDB answer into name -> scalar: object identification,
+    orbit (elements under their plain names, other fields as 'orbit_*'),
+    physical parameters and discovery circumstances. Nested groups such as
+    object.orbit_class become 'orbit_class_name'; lists are joined with '; '.
+    """
+    flat: "OrderedDict[str, Any]" = OrderedDict()
+
+    def walk(section: str, prefix: str, node: dict):
+        for key, value in node.items():
+            if isinstance(value, dict):
+                sub_prefix = "" if (section, key) in _UNPREFIXED_SUBSECTIONS else f"{prefix}{key}_"
+                walk(section, sub_prefix, value)
+                continue
+            name = f"{prefix}{key}"
+            if name in flat:
+                name = f"{section}_{name}"
+            flat[name] = _scalar(value)
+
+    for section, prefix in SECTION_PREFIXES.items():
+        node = result.get(section)
+        if isinstance(node, dict):
+            walk(section, prefix, node)
+    return flat
+
+
+def _column(name: str, values: List[Any]):
+    present = [v for v in values if v is not None and not (isinstance(v, str) and v == "")]
+    mask = [v is None or (isinstance(v, str) and v == "") for v in values]
+    quantities = [v for v in present if isinstance(v, u.Quantity)]
+    if quantities and len(quantities) == len(present):
+        unit = quantities[0].unit
+        try:
+            data = [v.to_value(unit) if v is not None and not m else np.nan for v, m in zip(values, mask)]
+            return MaskedColumn(np.asarray(data, dtype=float), name=name, mask=mask, unit=unit)
+        except u.UnitConversionError:
+            pass
+    if present and all(isinstance(v, (bool, np.bool_)) for v in present):
+        return MaskedColumn([bool(v) if not m else False for v, m in zip(values, mask)], name=name, mask=mask)
+    if present and all(isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool) for v in present):
+        kind = int if all(isinstance(v, (int, np.integer)) for v in present) else float
+        data = [kind(v) if not m else 0 for v, m in zip(values, mask)]
+        return MaskedColumn(np.asarray(data, dtype=kind), name=name, mask=mask)
+    if quantities:
+        values = [v.to_string() if isinstance(v, u.Quantity) else v for v in values]
+    return MaskedColumn(["" if m else str(v) for v, m in zip(values, mask)], name=name, mask=mask)
+
+
+def rows_to_table(rows: Iterable[Dict[str, Any]], names: Optional[List[str]] = None) -> AstropyTable:
+    """One typed column per field over all bodies; fields a body lacks are masked."""
+    rows = list(rows)
+    if names is None:
+        names = list(OrderedDict.fromkeys(name for row in rows for name in row))
+    return AstropyTable([_column(name, [row.get(name) for row in rows]) for name in names])
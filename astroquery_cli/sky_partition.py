@@ -0,0 +1,152 @@
+import math
+import threading
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+from astropy.table import Table as AstropyTable
+
+from astroquery_cli.debug import debug
+
+# Gaia source_id = HEALPix level-12 nested pixel index * 2**35 + running number
+GAIA_SOURCE_ID_HEALPIX_LEVEL = 12
+GAIA_SOURCE_ID_HEALPIX_FACTOR = 2 ** 35
+
+
+def auto_partition_count(radius_deg: float, threshold_deg: float, max_partitions: int) -> int:
+    """
+    Number of partitions for a cone: 1 up to `threshold_deg`, then growing with
+    the cone area (radius squared), capped at `max_partitions`.
+    """
+    if threshold_deg <= 0 or radius_deg <= threshold_deg:
+        return 1
+    return max(1, min(max_partitions, math.ceil((radius_deg / threshold_deg) ** 2)))
+
+
+def _group_ranges(ranges: List[Tuple[int, int]], n: int) -> List[List[Tuple[int, int]]]:
+    """Splits a sorted list of ranges into at most `n` consecutive groups of similar total width."""
+    if len(ranges) <= n:
+        return [[r] for r in ranges]
+    total = sum(hi - lo + 1 for lo, hi in ranges)
+    target = total / n
+    groups: List[List[Tuple[int, int]]] = [[]]
+    width = 0
+    for lo, hi in ranges:
+        if groups[-1] and width >= target and len(groups) < n:
+            groups.append([])
+            width = 0
+        groups[-1].append((lo, hi))
+        width += hi - lo + 1
+    return groups
+
+
+def healpix_source_id_conditions(ra_deg: float, dec_deg: float, radius_deg: float, n: int) -> Optional[List[str]]:
+    """
+    ADQL conditions on Gaia `source_id` ranges, one per partition, covering the
+    HEALPix pixels that overlap the cone. These use the source_id primary key
+    index on the server. Returns None if astropy-healpix is not installed.
+    """
+    try:
+        from astropy_healpix import HEALPix
+    except ImportError:
+        return None
+    import astropy.units as u
+
+    # Smallest level that yields at least n overlapping pixels
+    pixels = None
+    level = 0
+    for level in range(0, GAIA_SOURCE_ID_HEALPIX_LEVEL + 1):
+        hp = HEALPix(nside=2 ** level, order="nested")
+        pixels = np.sort(hp.cone_search_lonlat(ra_deg * u.deg, dec_deg * u.deg, radius_deg * u.deg))
+        if len(pixels) >= n:
+            break
+
+    # Merge consecutive nested pixels into contiguous source_id ranges
+    scale = GAIA_SOURCE_ID_HEALPIX_FACTOR * 4 ** (GAIA_SOURCE_ID_HEALPIX_LEVEL - level)
+    ranges: List[Tuple[int, int]] = []
+    for pix in pixels.tolist():
+        lo, hi = pix * scale, (pix + 1) * scale - 1
+        if ranges and ranges[-1][1] + 1 == lo:
+            ranges[-1] = (ranges[-1][0], hi)
+        else:
+            ranges.append((lo, hi))
+    debug(f"HEALPix level {level}: {len(pixels)} pixel(s), {len(ranges)} source_id range(s)")
+
+    conditions = []
+    for group in _group_ranges(ranges, n):
+        parts = [f"source_id BETWEEN {lo} AND {hi}" for lo, hi in group]
+        conditions.append(parts[0] if len(parts) == 1 else "(" + " OR ".join(parts) + ")")
+    return conditions
+
+
+def _disk_fraction_below(h: float) -> float:
+    """Fraction of a unit disk's area below height h (-1 <= h <= 1)."""
+    return (h * math.sqrt(max(0.0, 1 - h * h)) + math.asin(h)) / math.pi + 0.5
+
+
+def declination_conditions(dec_deg: float, radius_deg: float, n: int) -> List[str]:
+    """
+    ADQL conditions splitting a cone into `n` declination stripes holding
+    roughly equal areas of the cone. Stripes are half-open, so they do not overlap.
+    """
+    bounds = []
+    for i in range(1, n):
+        target = i / n
+        lo, hi = -1.0, 1.0
+        for _ in range(50):
+            mid = (lo + hi) / 2
+            if _disk_fraction_below(mid) < target:
+                lo = mid
+            else:
+                hi = mid
+        bounds.append(dec_deg + radius_deg * (lo + hi) / 2)
+    edges = [None] + [min(90.0, max(-90.0, b)) for b in bounds] + [None]
+    conditions = []
+    for lower, upper in zip(edges[:-1], edges[1:]):
+        parts = []
+        if lower is not None:
+            parts.append(f"dec >= {lower:.10f}")
+        if upper is not None:
+            parts.append(f"dec < {upper:.10f}")
+        conditions.append(" AND ".join(parts))
+    return conditions
+
+
+def cone_partition_conditions(ra_deg: float, dec_deg: float, radius_deg: float, n: int,
+                              use_source_id: bool = True) -> Tuple[str, List[str]]:
+    """
+    Returns (method, conditions) for splitting a cone search into `n` partitions.
+    HEALPix source_id ranges are used when possible, declination stripes otherwise.
+    """
+    if n <= 1:
+        return "none", [""]
+    if use_source_id:
+        conditions = healpix_source_id_conditions(ra_deg, dec_deg, radius_deg, n)
+        if conditions:
+            return "healpix", conditions
+        debug("astropy-healpix not installed; partitioning by declination stripes")
+    return "declination", declination_conditions(dec_deg, radius_deg, n)
+
+
+class Deduplicator:
+    """Thread-safe filter dropping rows whose key was already seen in an earlier partition."""
+
+    def __init__(self, key: str = "source_id"):
+        self.key = key
+        self._seen: Set = set()
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def __call__(self, table: AstropyTable) -> AstropyTable:
+        if self.key not in table.colnames or len(table) == 0:
+            return table
+        keys = np.asarray(table[self.key])
+        with self._lock:
+            keep = np.array([k not in self._seen for k in keys.tolist()], dtype=bool)
+            # Also drop duplicates within the same partition
+            _, first = np.unique(keys, return_index=True)
+            unique_mask = np.zeros(len(keys), dtype=bool)
+            unique_mask[first] = True
+            keep &= unique_mask
+            self._seen.update(keys[keep].tolist())
+            self.dropped += int((~keep).sum())
+        return table[keep] if not keep.all() else table
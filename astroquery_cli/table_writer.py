@@ -0,0 +1,317 @@
+import io
+import json
+import os
+import sys
+from typing import IO, Callable, Iterable, Iterator, Optional
+
+import numpy as np
+from astropy.table import Table as AstropyTable
+
+# Formats that can be written incrementally, chunk by chunk
+STREAMING_FORMATS = {
+    "csv": "csv",
+    "ascii.csv": "csv",
+    "ecsv": "ecsv",
+    "ascii.ecsv": "ecsv",
+    "parquet": "parquet",
+    "votable": "votable",
+    "vot": "votable",
+    "xml": "votable",
+    "arrow": "arrow",
+    "ipc": "arrow",
+    "feather": "arrow",
+}
+
+# Formats written through pyarrow, which also carry units/UCDs as field metadata
+ARROW_FORMATS = ("parquet", "arrow")
+
+PARQUET_COMPRESSIONS = ("snappy", "zstd", "gzip", "brotli", "lz4", "none")
+ARROW_COMPRESSIONS = ("lz4", "zstd", "none")
+
+STDOUT_NAMES = ("-",)
+
+# Formats that hold several named tables in one file
+CONTAINER_FORMATS = {
+    "fits": "fits",
+    "fit": "fits",
+    "hdf5": "hdf5",
+    "h5": "hdf5",
+}
+
+
+def normalize_container_format(file_format: Optional[str]) -> Optional[str]:
+    if not file_format:
+        return None
+    return CONTAINER_FORMATS.get(file_format.lower())
+
+
+def normalize_stream_format(file_format: Optional[str]) -> Optional[str]:
+    """Maps a user-facing format name to the streaming writer handling it, or None."""
+    if not file_format:
+        return None
+    return STREAMING_FORMATS.get(file_format.lower())
+
+
+def iter_table_chunks(table: AstropyTable, chunk_rows: int) -> Iterator[AstropyTable]:
+    """Yields consecutive row slices of `table` with at most `chunk_rows` rows each."""
+    chunk_rows = max(1, chunk_rows)
+    if len(table) == 0:
+        yield table
+        return
+    for start in range(0, len(table), chunk_rows):
+        yield table[start:start + chunk_rows]
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Writing Parquet/Arrow requires the 'pyarrow' package (pip install pyarrow).") from e
+    return pyarrow
+
+
+def _column_to_arrow(col, pa):
+    """
+    Converts an astropy column to a pyarrow array. Contiguous numeric data is
+    handed to pyarrow as the existing numpy buffer (no copy); masks become the
+    validity bitmap.
+    """
+    data = getattr(col, "value", col)  # Quantity columns -> plain ndarray
+    data = np.ma.getdata(data)
+    mask = np.ma.getmaskarray(col) if getattr(col, "mask", None) is not None else None
+    if mask is not None and not mask.any():
+        mask = None
+    data = np.asarray(data)
+    if data.dtype.kind == "S":
+        data = np.char.decode(data, "utf-8", errors="replace")
+    if data.ndim > 1 or data.dtype.kind == "O":
+        return pa.array(data.tolist(), mask=mask)
+    return pa.array(data, mask=mask)
+
+
+def _field_metadata(col) -> dict:
+    """Collects unit, UCD and description of a column as Arrow field metadata."""
+    meta = {}
+    unit = getattr(col, "unit", None)
+    if unit is not None:
+        meta["unit"] = unit.to_string()
+    col_meta = getattr(col, "meta", None) or {}
+    if col_meta.get("ucd"):
+        meta["ucd"] = str(col_meta["ucd"])
+    description = getattr(col, "description", None) or col_meta.get("description")
+    if description:
+        meta["description"] = str(description)
+    return meta
+
+
+def table_to_arrow(table: AstropyTable):
+    """
+    Converts an astropy table to a pyarrow.Table, keeping units, UCDs and
+    descriptions as field metadata and the table meta as JSON schema metadata.
+    """
+    pa = _import_pyarrow()
+    fields = []
+    arrays = []
+    for name in table.colnames:
+        col = table[name]
+        array = _column_to_arrow(col, pa)
+        arrays.append(array)
+        fields.append(pa.field(name, array.type, metadata=_field_metadata(col) or None))
+    schema_meta = {}
+    if table.meta:
+        schema_meta["astropy_meta"] = json.dumps(dict(table.meta), default=str)
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields, metadata=schema_meta or None))
+
+
+def _strip_ascii_header(text: str) -> str:
+    """Drops '#' comment lines and the column name line from an astropy ascii dump."""
+    lines = text.splitlines(keepends=True)
+    i = 0
+    while i < len(lines) and lines[i].startswith("#"):
+        i += 1
+    return "".join(lines[i + 1:])
+
+
+class StreamingTableWriter:
+    """
+    Writes a result table incrementally as row chunks arrive, so large results
+    never need to be held (or formatted) in memory all at once.
+
+    The schema is taken from the first chunk. Supported formats are CSV, ECSV,
+    VOTable (TABLEDATA serialization), Parquet and Arrow IPC/Feather (the last
+    two require pyarrow). Passing '-' as the output file writes to stdout.
+    """
+
+    def __init__(self, output_file: str, file_format: str, compression: Optional[str] = None,
+                 transform: Optional[Callable[[AstropyTable], AstropyTable]] = None):
+        self.output_file = output_file
+        self.transform = transform
+        self.file_format = normalize_stream_format(file_format)
+        if self.file_format is None:
+            raise ValueError(f"Format '{file_format}' cannot be written as a stream.")
+        self.compression = compression.lower() if compression else None
+        if self.compression:
+            allowed = PARQUET_COMPRESSIONS if self.file_format == "parquet" else ARROW_COMPRESSIONS if self.file_format == "arrow" else ()
+            if self.compression not in allowed:
+                raise ValueError(f"Compression '{compression}' is not supported for {self.file_format} output.")
+        self.to_stdout = output_file in STDOUT_NAMES
+        self.rows_written = 0
+        self._handle: Optional[IO] = None
+        self._started = False
+        self._votable_suffix = ""
+        self._arrow_writer = None
+        self._arrow_schema = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def started(self) -> bool:
+        """True once a chunk (possibly empty) has been written, i.e. the output exists."""
+        return self._started
+
+    def _open(self, binary: bool) -> IO:
+        if self.to_stdout:
+            return sys.stdout.buffer if binary else sys.stdout
+        path = os.path.expanduser(self.output_file)
+        return open(path, "wb") if binary else open(path, "w", encoding="utf-8", newline="")
+
+    def write(self, chunk: AstropyTable):
+        if self.transform:
+            chunk = self.transform(chunk)
+        if self.file_format in ARROW_FORMATS:
+            self._write_arrow(chunk)
+        elif self.file_format == "votable":
+            self._write_votable(chunk)
+        else:
+            self._write_ascii(chunk)
+        self.rows_written += len(chunk)
+        self._handle.flush()
+
+    def _write_ascii(self, chunk: AstropyTable):
+        if self._handle is None:
+            self._handle = self._open(binary=False)
+        buffer = io.StringIO()
+        chunk.write(buffer, format=f"ascii.{self.file_format}")
+        text = buffer.getvalue()
+        self._handle.write(text if not self._started else _strip_ascii_header(text))
+        self._started = True
+
+    def _write_votable(self, chunk: AstropyTable):
+        from astropy.io.votable import from_table
+
+        votable = from_table(chunk)
+        if not self._started:
+            # Later chunks may hold longer strings than the first one
+            for field in votable.get_first_table().fields:
+                if field.datatype in ("char", "unicodeChar") and field.arraysize not in (None, "*"):
+                    field.arraysize = "*"
+        buffer = io.BytesIO()
+        votable.to_xml(buffer, tabledata_format="tabledata")
+        xml = buffer.getvalue().decode("utf-8")
+        if "<TABLEDATA>" in xml:
+            head, rest = xml.split("<TABLEDATA>", 1)
+            rows, tail = rest.rsplit("</TABLEDATA>", 1)
+        else:
+            # Empty chunk: astropy omits the DATA element entirely
+            head, tail = xml.rsplit("</TABLE>", 1)
+            head += "<DATA>\n"
+            rows = ""
+            tail = "</DATA>\n</TABLE>" + tail
+        if self._handle is None:
+            self._handle = self._open(binary=False)
+        if not self._started:
+            self._handle.write(head + "<TABLEDATA>")
+            self._votable_suffix = "</TABLEDATA>" + tail
+            self._started = True
+        self._handle.write(rows)
+
+    def _write_arrow(self, chunk: AstropyTable):
+        pa = _import_pyarrow()
+        batch = table_to_arrow(chunk)
+        if self._arrow_writer is None:
+            self._handle = self._open(binary=True)
+            if self.file_format == "parquet":
+                import pyarrow.parquet as pq
+                self._arrow_writer = pq.ParquetWriter(self._handle, batch.schema, compression=self.compression or "snappy")
+            else:
+                compression = None if self.compression == "none" else self.compression
+                options = pa.ipc.IpcWriteOptions(compression=compression)
+                self._arrow_writer = pa.ipc.new_file(self._handle, batch.schema, options=options)
+            self._arrow_schema = batch.schema
+            self._started = True
+        else:
+            batch = batch.cast(self._arrow_schema)
+        self._arrow_writer.write_table(batch)
+
+    def close(self):
+        if self._arrow_writer is not None:
+            self._arrow_writer.close()
+            self._arrow_writer = None
+        if self._handle is not None:
+            if self._votable_suffix:
+                self._handle.write(self._votable_suffix)
+                self._votable_suffix = ""
+            self._handle.flush()
+            if not self.to_stdout:
+                self._handle.close()
+            self._handle = None
+
+
+def write_table_chunks(chunks: Iterable[AstropyTable], output_file: str, file_format: str, compression: Optional[str] = None) -> int:
+    """Streams `chunks` to `output_file` (or stdout for '-') and returns the number of rows written."""
+    with StreamingTableWriter(output_file, file_format, compression=compression) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+        return writer.rows_written
+
+
+class MultiTableFileWriter:
+    """
+    Writes named tables one at a time into a single container file: one FITS
+    binary table extension per table (EXTNAME = name), or one HDF5 dataset
+    per table. Tables can be added as they arrive; the file is valid after
+    every `add()`.
+    """
+
+    def __init__(self, output_file: str, file_format: str):
+        self.output_file = output_file
+        self.file_format = normalize_container_format(file_format)
+        if self.file_format is None:
+            raise ValueError(f"Format '{file_format}' cannot hold several tables; use fits or hdf5.")
+        if self.file_format == "hdf5":
+            try:
+                import h5py  # noqa: F401
+            except ImportError as e:
+                raise ImportError("HDF5 output requires the 'h5py' package (pip install h5py).") from e
+        self.names = []
+        self.rows_written = 0
+        if os.path.exists(output_file):
+            os.remove(output_file)
+
+    def _unique_name(self, name: str) -> str:
+        base = "".join(c if c.isalnum() or c in "-_.+" else "_" for c in name) or "TABLE"
+        candidate, n = base, 2
+        while candidate.upper() in (existing.upper() for existing in self.names):
+            candidate, n = f"{base}_{n}", n + 1
+        return candidate
+
+    def add(self, name: str, table: AstropyTable) -> str:
+        name = self._unique_name(name)
+        if self.file_format == "fits":
+            from astropy.io import fits
+            hdu = fits.table_to_hdu(table)
+            hdu.name = name
+            if not self.names:
+                fits.HDUList([fits.PrimaryHDU(), hdu]).writeto(self.output_file)
+            else:
+                with fits.open(self.output_file, mode="append") as hdul:
+                    hdul.append(hdu)
+        else:
+            table.write(self.output_file, path=name, append=True, serialize_meta=True)
+        self.names.append(name)
+        self.rows_written += len(table)
+        return name
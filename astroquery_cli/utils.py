@@ -1,10 +1,11 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 import functools
 
 import typer
 from astropy.table import Table as AstropyTable
 from astropy.coordinates import SkyCoord
 import astropy.units as u
+import numpy as np
 from rich.console import Console
 from rich.table import Table as RichTable
 from rich.padding import Padding
@@ -13,6 +14,7 @@ import os
 import re
 import builtins
 import astroquery_cli.i18n as i18n
+from astroquery_cli.debug import debug
 from pyvo.dal.tap import TAPResults # Import TAPResults
 
 console = Console()
@@ -40,6 +42,14 @@ def suggest_web_view(ctx: typer.Context, result_url: str, reason: str = ""):
     except Exception:
         pass
 
+# Two plain numbers: RA and Dec in decimal degrees
+_DECIMAL_PAIR_RE = re.compile(r"^\s*[\d\.\-+]+\s+[\d\.\-+]+\s*$")
+# 'HHhMMmSS.Ss +DDdMMmSS.Ss' or 'HH:MM:SS.S +DD:MM:SS.S' (RA in hours, Dec in degrees)
+_SEXAGESIMAL_RE = re.compile(
+    r"^\s*(\d{1,2})(?:h|:)\s*(\d{1,2})(?:m|:)\s*(\d{1,2}(?:\.\d*)?)s?"
+    r"\s+([+-]?)(\d{1,2})(?:d|:)\s*(\d{1,2})(?:m|:)\s*(\d{1,2}(?:\.\d*)?)s?\s*$"
+)
+
 def parse_coordinates(ctx: typer.Context, coords_str: str) -> Optional[SkyCoord]:
     """
     Parses a coordinate string into an Astropy SkyCoord object.
@@ -49,18 +59,137 @@ def parse_coordinates(ctx: typer.Context, coords_str: str) -> Optional[SkyCoord]
         console.print("[bold red]Error: Coordinate string cannot be empty.[/bold red]")
         raise typer.Exit(code=1)
     try:
-        if re.match(r"^\s*[\d\.\-+]+\s+[\d\.\-+]+\s*$", coords_str):
+        if _DECIMAL_PAIR_RE.match(coords_str):
              parts = coords_str.split()
              if len(parts) == 2:
                  return SkyCoord(ra=float(parts[0]), dec=float(parts[1]), unit=(u.deg, u.deg), frame='icrs')
         return SkyCoord(coords_str, frame='icrs')
     except Exception as e1:
+        # Not a coordinate: try it as an object name (shared, cached resolver)
+        if _looks_like_name(coords_str):
+            from astroquery_cli.name_resolver import resolve_name
+            try:
+                return resolve_name(coords_str)
+            except Exception as e2:
+                debug(f"Name resolution for '{coords_str}' failed: {e2}")
         # Do not exit here, just print error and return None
         console.print(f"[bold red]Error: Could not parse coordinates '{coords_str}'.[/bold red]")
         console.print(f"[yellow]Details: {e1}[/yellow]")
         console.print(f"[yellow]Ensure format is recognized by Astropy (e.g., '10.68h +41.26d', '10d30m0s 20d0m0s', '150.0 2.0' for deg).[/yellow]")
         return None
 
+def _looks_like_name(text: str) -> bool:
+    return bool(re.search(r"[A-Za-z]", text)) and not _SEXAGESIMAL_RE.match(text)
+
+# Only digits, separators and angle unit letters ('10.68h +41.26d', '10d30m0s 20d0m0s')
+_COORD_TEXT_RE = re.compile(r"^[\d\s.,+\-:hmsd°'\"]+$")
+
+def _is_plain_name(text: str) -> bool:
+    """Object names such as 'M31' or 'NGC 253', as opposed to coordinates written with unit letters."""
+    return _looks_like_name(text) and not _COORD_TEXT_RE.match(text)
+
+def parse_coordinates_batch(ctx: typer.Context, values: Iterable[Any], resolve_names: bool = True) -> Tuple[SkyCoord, np.ndarray]:
+    """
+    Parses many coordinate strings at once into one array-valued ICRS SkyCoord.
+
+    Decimal-degree pairs and regular HMS/DMS strings are converted with NumPy
+    in a single pass. With `resolve_names`, plain object names ('M31') go
+    straight to the shared name cache. Any other format goes through one array
+    SkyCoord call, instead of one scalar SkyCoord per string, and strings it
+    cannot parse that look like names are then looked up as well. Returns
+    (coords, failed) where `failed` marks entries that could not be parsed;
+    their coordinates are set to 0, 0.
+    """
+    strings = [("" if v is None or v is np.ma.masked else str(v)).strip() for v in values]
+    n = len(strings)
+    ra = np.zeros(n)
+    dec = np.zeros(n)
+    failed = np.ones(n, dtype=bool)
+
+    decimal = np.array([bool(_DECIMAL_PAIR_RE.match(text)) for text in strings], dtype=bool)
+    decimal_rows = np.flatnonzero(decimal)
+    if len(decimal_rows):
+        try:
+            pairs = np.array(" ".join(strings[i] for i in decimal_rows).split(), dtype=float).reshape(-1, 2)
+        except ValueError:
+            # Something like '1.2.3 4': fall back to parsing the pairs one by one
+            pairs = np.array([[_to_float(p) for p in strings[i].split()] for i in decimal_rows])
+        ok = np.isfinite(pairs).all(axis=1) & (np.abs(pairs[:, 1]) <= 90)
+        ra[decimal_rows[ok]] = np.mod(pairs[ok, 0], 360.0)
+        dec[decimal_rows[ok]] = pairs[ok, 1]
+        failed[decimal_rows[ok]] = False
+
+    # Regular sexagesimal strings: split with one regex each, convert with NumPy
+    sexagesimal_rows = []
+    fields = []
+    for i in np.flatnonzero(~decimal):
+        match = _SEXAGESIMAL_RE.match(strings[i])
+        if match:
+            sexagesimal_rows.append(i)
+            fields.append(match.groups())
+    if sexagesimal_rows:
+        rows = np.array(sexagesimal_rows)
+        parts = np.array(fields)
+        hms = parts[:, 0:3].astype(float)
+        dms = parts[:, 4:7].astype(float)
+        sign = np.where(parts[:, 3] == "-", -1.0, 1.0)
+        ra_deg = 15.0 * (hms[:, 0] + hms[:, 1] / 60 + hms[:, 2] / 3600)
+        dec_deg = sign * (dms[:, 0] + dms[:, 1] / 60 + dms[:, 2] / 3600)
+        ok = (ra_deg < 360) & (np.abs(dec_deg) <= 90) & (hms[:, 1:] < 60).all(axis=1) & (dms[:, 1:] < 60).all(axis=1)
+        ra[rows[ok]] = ra_deg[ok]
+        dec[rows[ok]] = dec_deg[ok]
+        failed[rows[ok]] = False
+        decimal[rows] = True  # handled (a bad value stays failed)
+
+    # Plain object names: straight to the name cache, without trying SkyCoord first
+    named = set()
+    if resolve_names:
+        name_rows = [i for i in np.flatnonzero(~decimal) if strings[i] and _is_plain_name(strings[i])]
+        _resolve_name_rows(strings, name_rows, ra, dec, failed)
+        named.update(name_rows)
+
+    # Everything else goes through one array SkyCoord call
+    other_rows = np.array([i for i in np.flatnonzero(~decimal) if strings[i] and failed[i]], dtype=int)
+    if len(other_rows):
+        try:
+            coords = SkyCoord([strings[i] for i in other_rows], frame='icrs')
+            ra[other_rows] = coords.ra.deg
+            dec[other_rows] = coords.dec.deg
+            failed[other_rows] = False
+        except Exception:
+            # At least one string is bad; isolate it by parsing this group one by one
+            for i in other_rows:
+                try:
+                    coord = SkyCoord(strings[i], frame='icrs')
+                    ra[i], dec[i], failed[i] = coord.ra.deg, coord.dec.deg, False
+                except Exception as e:
+                    debug(f"Could not parse coordinates '{strings[i]}': {e}")
+
+    # Remaining strings that look like object names go through the name cache
+    if resolve_names:
+        _resolve_name_rows(strings, [i for i in np.flatnonzero(failed) if strings[i] and i not in named and _looks_like_name(strings[i])], ra, dec, failed)
+
+    return SkyCoord(ra=ra * u.deg, dec=dec * u.deg, frame='icrs'), failed
+
+def _resolve_name_rows(strings: List[str], rows: List[int], ra: np.ndarray, dec: np.ndarray, failed: np.ndarray):
+    """Fills in the rows whose strings the shared name cache resolves."""
+    if not rows:
+        return
+    from astroquery_cli.name_resolver import get_name_resolver
+    resolved = get_name_resolver().resolve_many(strings[i] for i in rows)
+    for i in rows:
+        coord = resolved.get(strings[i])
+        if isinstance(coord, SkyCoord):
+            ra[i], dec[i], failed[i] = coord.ra.deg, coord.dec.deg, False
+        else:
+            debug(f"Could not resolve '{strings[i]}': {coord}")
+
+def _to_float(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        return float("nan")
+
 def parse_angle_str_to_quantity(ctx: typer.Context, angle_str: str) -> u.Quantity:
     """
     Parses a string representing an angle with units (e.g., "10arcsec", "0.5deg")
@@ -261,20 +390,74 @@ common_output_options = {
         None,
         "--output-file",
         "-o",
-        help=builtins._("Path to save the output table (e.g., data.csv, results.ecsv, table.fits). Format inferred from extension.")
+        help=builtins._("Path to save the output table (e.g., data.csv, results.ecsv, table.fits). Format inferred from extension. Use '-' to write to stdout.")
     ),
     "output_format": typer.Option(
         None,
         "--output-format",
         "-f",
-        help=builtins._("Astropy table format for saving (e.g., 'csv', 'ecsv', 'fits', 'votable'). Overrides inference from filename extension.")
+        help=builtins._("Astropy table format for saving (e.g., 'csv', 'ecsv', 'fits', 'votable', 'parquet', 'arrow'/'feather'). Overrides inference from filename extension.")
+    ),
+    "columns": typer.Option(
+        None,
+        "--columns",
+        help=builtins._("Only keep these columns in the saved table (comma-separated or repeated, e.g. 'ra,dec,phot_g_mean_mag').")
+    ),
+    "compression": typer.Option(
+        None,
+        "--compression",
+        help=builtins._("Compression for Parquet (snappy, zstd, gzip, brotli, lz4, none) or Arrow/Feather (lz4, zstd, none) output.")
     ),
 }
 
-def save_table_to_file(ctx: typer.Context, table: AstropyTable, output_file: str, output_format: Optional[str], query_type: str):
-    lang = ctx.obj.get("lang", "en") if ctx.obj else "en"
-    if not output_file:
-        return
+common_cache_options = {
+    "no_cache": typer.Option(
+        False,
+        "--no-cache",
+        help=builtins._("Bypass the local query result cache (~/.aqc/cache) for this query.")
+    ),
+    "refresh": typer.Option(
+        False,
+        "--refresh",
+        help=builtins._("Ignore any cached result, re-run the query and update the cache.")
+    ),
+}
+
+common_batch_options = {
+    "targets_file": typer.Option(
+        None,
+        "--targets-file",
+        help=builtins._("File with one target (name or coordinates) per line. Lines starting with '#' are ignored.")
+    ),
+    "from_stdin": typer.Option(
+        False,
+        "--stdin",
+        help=builtins._("Read targets from standard input, one per line.")
+    ),
+    "concurrency": typer.Option(
+        None,
+        "--concurrency",
+        min=1,
+        help=builtins._("Number of parallel queries in batch mode. Default from config.ini [Batch] concurrency (8).")
+    ),
+    "rate_limit": typer.Option(
+        None,
+        "--rate-limit",
+        min=0,
+        help=builtins._("Maximum queries per second in batch mode (0 for no limit). Default depends on the service.")
+    ),
+    "retries": typer.Option(
+        None,
+        "--retries",
+        min=0,
+        help=builtins._("Retries per target with exponential backoff on transient errors. Default from config.ini [Batch] retries (3).")
+    ),
+}
+
+def _resolve_output_target(output_file: str, output_format: Optional[str]):
+    """Returns (filename, format) for an output option; '-' means stdout."""
+    if output_file == "-":
+        return output_file, output_format or "csv"
     filename = os.path.expanduser(output_file)
     file_format = output_format
     if not file_format:
@@ -285,6 +468,139 @@ def save_table_to_file(ctx: typer.Context, table: AstropyTable, output_file: str
             file_format = 'ecsv'
             filename += f".{file_format}"
             console.print(f"[yellow]No file extension or format specified, saving as '{filename}' (ECSV format).[/yellow]")
+    return filename, file_format
+
+def suffixed_output_path(output_file: str, suffix: str) -> str:
+    """'out/res.v2.csv' + 'GAIA-DR3' -> 'out/res.v2_GAIA-DR3.csv' (only the file name's last extension moves)."""
+    directory, name = os.path.split(output_file)
+    stem, ext = os.path.splitext(name)
+    safe = re.sub(r'[^A-Za-z0-9_.+-]+', '_', suffix).strip('_') or "table"
+    return os.path.join(directory, f"{stem}_{safe}{ext}")
+
+def use_stderr_for_messages():
+    """Sends all console output to stderr so stdout carries only table data (for '-o -')."""
+    console.stderr = True
+    from astroquery_cli.debug import debug_manager
+    debug_manager.console.stderr = True
+
+def parse_column_list(columns: Optional[Iterable[str]]) -> List[str]:
+    """Flattens repeated and/or comma-separated --columns values."""
+    names = []
+    for item in columns or []:
+        names.extend(name.strip() for name in item.split(",") if name.strip())
+    return names
+
+def project_columns(table: AstropyTable, columns: Optional[Iterable[str]]) -> AstropyTable:
+    """
+    Returns a view of `table` with only the requested columns, in the requested
+    order. Names match case-insensitively; unknown names are reported and skipped.
+    """
+    names = parse_column_list(columns)
+    if not names:
+        return table
+    by_lower = {name.lower(): name for name in table.colnames}
+    selected = []
+    missing = []
+    for name in names:
+        actual = name if name in table.colnames else by_lower.get(name.lower())
+        if actual is None:
+            missing.append(name)
+        elif actual not in selected:
+            selected.append(actual)
+    if missing:
+        console.print(f"[yellow]Ignoring unknown column(s): {', '.join(missing)}[/yellow]")
+    if not selected:
+        console.print("[bold red]None of the requested columns exist in the result table.[/bold red]")
+        raise typer.Exit(code=1)
+    return table[selected]
+
+def save_table_chunks(ctx: typer.Context, chunks: Iterable[AstropyTable], output_file: str, output_format: Optional[str], query_type: str,
+                      columns: Optional[Iterable[str]] = None, compression: Optional[str] = None) -> int:
+    """
+    Writes table chunks (e.g. result pages as they arrive) incrementally to a
+    CSV, ECSV, VOTable, Parquet or Arrow IPC/Feather file, or to stdout when
+    output_file is '-'. Returns the number of rows written.
+    """
+    if not output_file:
+        return 0
+    writer = open_table_stream(ctx, output_file, output_format, query_type, columns=columns, compression=compression)
+    if writer is None:
+        file_format = _resolve_output_target(output_file, output_format)[1]
+        console.print(f"[bold red]Format '{file_format}' cannot be streamed. Use csv, ecsv, votable, parquet or arrow.[/bold red]")
+        raise typer.Exit(code=1)
+    try:
+        with writer:
+            for chunk in chunks:
+                writer.write(chunk)
+    except Exception as e:
+        console.print(f"[bold red]Error streaming table to '{writer.output_file}' (format: {writer.file_format}): {e}[/bold red]")
+        raise typer.Exit(code=1)
+    report_table_stream(writer)
+    return writer.rows_written
+
+def open_table_stream(ctx: typer.Context, output_file: str, output_format: Optional[str], query_type: str,
+                      columns: Optional[Iterable[str]] = None, compression: Optional[str] = None):
+    """
+    Opens a StreamingTableWriter for results that arrive in pieces (pages,
+    partitions, batch targets). Returns None if the format cannot be streamed.
+    """
+    from astroquery_cli.table_writer import StreamingTableWriter, normalize_stream_format
+    filename, file_format = _resolve_output_target(output_file, output_format)
+    if normalize_stream_format(file_format) is None:
+        return None
+    if filename != "-":
+        console.print(f"[cyan]Streaming {query_type} results to '{filename}' as {file_format}...[/cyan]")
+    transform = (lambda chunk: project_columns(chunk, columns)) if columns else None
+    return StreamingTableWriter(filename, file_format, compression=compression, transform=transform)
+
+def open_table_container(ctx: typer.Context, output_file: str, output_format: Optional[str], query_type: str):
+    """
+    Opens a MultiTableFileWriter that collects several named tables (e.g. one
+    per catalog) into one FITS or HDF5 file. Exits with a message otherwise.
+    """
+    from astroquery_cli.table_writer import MultiTableFileWriter
+    filename, file_format = _resolve_output_target(output_file, output_format)
+    if filename == "-":
+        console.print("[bold red]A multi-table file cannot be written to stdout.[/bold red]")
+        raise typer.Exit(code=1)
+    try:
+        writer = MultiTableFileWriter(filename, file_format)
+    except (ValueError, ImportError) as e:
+        console.print(f"[bold red]{e}[/bold red]")
+        raise typer.Exit(code=1)
+    console.print(f"[cyan]Writing {query_type} results to '{filename}' as {writer.file_format}, one table per catalog...[/cyan]")
+    return writer
+
+def report_table_stream(writer):
+    if not writer.started:
+        target = "standard output" if writer.to_stdout else f"'{writer.output_file}'"
+        console.print(f"[yellow]No rows to save; nothing was written to {target}.[/yellow]")
+    elif not writer.to_stdout:
+        console.print(f"[green]Successfully saved {writer.rows_written} rows to '{writer.output_file}'.[/green]")
+
+def save_table_to_file(ctx: typer.Context, table: AstropyTable, output_file: str, output_format: Optional[str], query_type: str,
+                       columns: Optional[Iterable[str]] = None, compression: Optional[str] = None):
+    lang = ctx.obj.get("lang", "en") if ctx.obj else "en"
+    if not output_file:
+        return
+    from astroquery_cli.table_writer import ARROW_FORMATS, iter_table_chunks, normalize_stream_format
+    from astroquery_cli import config
+    filename, file_format = _resolve_output_target(output_file, output_format)
+    table = project_columns(table, columns)
+
+    # Large tables, stdout and the Arrow-based formats go through the streaming
+    # writer, which formats one chunk at a time instead of building the whole
+    # serialized file in memory.
+    chunk_rows = config.get_stream_chunk_rows()
+    stream_format = normalize_stream_format(file_format)
+    if stream_format and (filename == "-" or len(table) > chunk_rows or stream_format in ARROW_FORMATS):
+        save_table_chunks(ctx, iter_table_chunks(table, chunk_rows), filename, file_format, query_type, compression=compression)
+        return
+    if filename == "-":
+        console.print(f"[bold red]Format '{file_format}' cannot be written to stdout. Use csv, ecsv, votable, parquet or arrow.[/bold red]")
+        raise typer.Exit(code=1)
+    if compression:
+        console.print(f"[yellow]--compression only applies to Parquet and Arrow output; ignoring it for {file_format}.[/yellow]")
 
     console.print(f"[cyan]Saving {query_type} results to '{filename}' as {file_format}...[/cyan]")
     try:
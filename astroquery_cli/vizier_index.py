@@ -0,0 +1,249 @@
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from astropy.table import Table as AstropyTable
+
+from astroquery_cli import config
+from astroquery_cli.debug import debug
+
+# TAPVizieR exposes the metadata of every VizieR catalog through TAP_SCHEMA
+VIZIER_TAP_URL = "https://tapvizier.cds.unistra.fr/TAPVizieR/tap"
+
+# Table names per TAP_SCHEMA.columns request when collecting UCDs
+UCD_CHUNK_TABLES = 400
+
+# Non-standard TAP_SCHEMA.tables columns that carry the row count, by preference
+_NROWS_COLUMNS = ("nrows", "table_rows", "size", "rows")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS catalogs (catalog TEXT PRIMARY KEY, title TEXT);
+CREATE TABLE IF NOT EXISTS tables (
+    table_name TEXT PRIMARY KEY,
+    catalog TEXT,
+    description TEXT,
+    nrows INTEGER,
+    ucds TEXT
+);
+CREATE INDEX IF NOT EXISTS tables_catalog ON tables (catalog);
+CREATE VIRTUAL TABLE IF NOT EXISTS tables_fts USING fts5(table_name, title, description, ucds, tokenize='unicode61');
+"""
+
+# bm25 column weights: table name, catalog title, table description, UCDs
+_RANK = "bm25(tables_fts, 8.0, 4.0, 2.0, 1.0)"
+
+
+def catalog_of(table_name: str) -> str:
+    """'J/ApJ/710/1776/table1' -> 'J/ApJ/710/1776'; single-table catalogs are their own catalog."""
+    return table_name.rsplit("/", 1)[0] if table_name.count("/") >= 2 else table_name
+
+
+def _fts_query(terms: List[str]) -> str:
+    """Each search term becomes a quoted prefix phrase; all terms must match."""
+    phrases = []
+    for term in terms:
+        words = re.findall(r"\w+", term)
+        if words:
+            phrases.append('"' + " ".join(words) + '"*')
+    return " AND ".join(phrases)
+
+
+def run_tap(query: str) -> AstropyTable:
+    import pyvo
+    from astroquery_cli.http_session import get_shared_session
+    service = pyvo.dal.TAPService(VIZIER_TAP_URL, session=get_shared_session())
+    debug(f"TAPVizieR: {query[:200]}")
+    return service.run_sync(query, maxrec=10_000_000).to_table()
+
+
+class VizierIndex:
+    """
+    Local SQLite index of VizieR catalog metadata (<cache_dir>/vizier_index.sqlite).
+
+    One row per VizieR table with its catalog title, description, row count
+    and the UCDs of its columns, plus an FTS5 index over those fields, so
+    'vizier find-catalogs' and 'vizier list' run offline in milliseconds.
+    `update()` downloads the table list from TAPVizieR and fetches column
+    UCDs only for tables that do not have them yet (NULL ucds: new tables,
+    tables indexed with --no-ucds, or whose UCD request failed).
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else config.get_cache_dir() / "vizier_index.sqlite"
+
+    def exists(self) -> bool:
+        return self.path.exists() and self.status().get("tables", 0) > 0
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def status(self) -> Dict[str, object]:
+        if not self.path.exists():
+            return {}
+        with self._connect() as conn:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            return {
+                "catalogs": conn.execute("SELECT COUNT(*) FROM catalogs").fetchone()[0],
+                "tables": conn.execute("SELECT COUNT(*) FROM tables").fetchone()[0],
+                "updated": float(meta["updated"]) if "updated" in meta else None,
+                "path": str(self.path),
+            }
+
+    def age_days(self) -> Optional[float]:
+        updated = self.status().get("updated")
+        return (time.time() - updated) / 86400 if updated else None
+
+    def update(self, full: bool = False, with_ucds: bool = True,
+               fetch_ucds: Optional[Callable[[List[List[str]]], Dict[str, List[str]]]] = None) -> Dict[str, int]:
+        """
+        Refreshes the index from TAPVizieR. Titles, descriptions and row counts
+        are always refreshed (one request each); UCDs are fetched for tables
+        without them, or for all tables with `full`. `fetch_ucds` receives the
+        chunks of TAP_SCHEMA table names (quoted as TAPVizieR spells them) and
+        returns table name -> UCDs for every table it could fetch (the CLI runs
+        the chunks concurrently); by default they are fetched one after another.
+        Tables missing from that result keep NULL ucds and are retried on the
+        next update.
+        """
+        schemas = run_tap("SELECT schema_name, description FROM TAP_SCHEMA.schemas")
+        tables = run_tap("SELECT * FROM TAP_SCHEMA.tables")
+        nrows_col = next((c for c in _NROWS_COLUMNS if c in tables.colnames), None)
+        debug(f"TAPVizieR: {len(schemas)} catalog(s), {len(tables)} table(s), row counts from {nrows_col}")
+
+        remote = {}
+        for row in tables:
+            tap_name = str(row["table_name"])
+            name = tap_name.strip('"')
+            if name.upper().startswith("TAP_SCHEMA."):
+                continue
+            nrows = row[nrows_col] if nrows_col else None
+            try:
+                nrows = int(nrows) if nrows is not None and str(nrows) not in ("", "--") else None
+            except (TypeError, ValueError):
+                nrows = None
+            remote[name] = (catalog_of(name), str(row["description"] or ""), nrows, tap_name)
+
+        with self._connect() as conn:
+            known = {name: ucds for name, ucds in conn.execute("SELECT table_name, ucds FROM tables")}
+            removed = [name for name in known if name not in remote]
+            added = [name for name in remote if name not in known]
+            conn.executemany("DELETE FROM tables WHERE table_name = ?", [(n,) for n in removed])
+            conn.execute("DELETE FROM catalogs")
+            conn.executemany("INSERT INTO catalogs (catalog, title) VALUES (?, ?)",
+                             [(str(r["schema_name"]).strip('"'), str(r["description"] or "")) for r in schemas])
+            conn.executemany(
+                "INSERT INTO tables (table_name, catalog, description, nrows, ucds) VALUES (?, ?, ?, ?, NULL) "
+                "ON CONFLICT(table_name) DO UPDATE SET catalog = excluded.catalog, description = excluded.description, nrows = excluded.nrows",
+                [(name, cat, desc, nrows) for name, (cat, desc, nrows, _tap) in remote.items()],
+            )
+
+            missing_ucds = {name for name, ucds in known.items() if ucds is None}
+            ucd_targets = list(remote) if full else [name for name in remote if name not in known or name in missing_ucds]
+            fetched = 0
+            if with_ucds and ucd_targets:
+                tap_names = [remote[name][3] for name in ucd_targets]
+                chunks = [tap_names[i:i + UCD_CHUNK_TABLES] for i in range(0, len(tap_names), UCD_CHUNK_TABLES)]
+                ucds = (fetch_ucds or (lambda cs: {k: v for c in cs for k, v in fetch_table_ucds(c).items()}))(chunks)
+                rows = [(" ".join(sorted({u for u in ucds[name] if u})), name) for name in ucd_targets if name in ucds]
+                conn.executemany("UPDATE tables SET ucds = ? WHERE table_name = ?", rows)
+                fetched = len(rows)
+
+            conn.execute("DELETE FROM tables_fts")
+            conn.execute(
+                "INSERT INTO tables_fts (rowid, table_name, title, description, ucds) "
+                "SELECT t.rowid, t.table_name, COALESCE(c.title, ''), t.description, COALESCE(t.ucds, '') "
+                "FROM tables t LEFT JOIN catalogs c ON c.catalog = t.catalog"
+            )
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('updated', ?)", (str(time.time()),))
+        return {"tables": len(remote), "added": len(added), "removed": len(removed), "ucd_tables": fetched}
+
+    def search(self, terms: List[str], ucd: Optional[str] = None, limit: int = 20) -> AstropyTable:
+        """Ranked full-text search over table names, titles, descriptions and UCDs."""
+        select = ("SELECT t.table_name, COALESCE(c.title, ''), t.description, t.nrows, {score} "
+                  "FROM tables t LEFT JOIN catalogs c ON c.catalog = t.catalog ")
+        where, params = [], []
+        match = _fts_query(terms)
+        if match:
+            sql = select.format(score=f"ROUND(-{_RANK}, 3)") + "JOIN tables_fts ON tables_fts.rowid = t.rowid "
+            where.append("tables_fts MATCH ?")
+            params.append(match)
+            order = _RANK
+        else:
+            sql = select.format(score="0.0")
+            order = "COALESCE(t.nrows, 0) DESC"
+        if ucd:
+            where.append("(' ' || t.ucds || ' ') LIKE ?")
+            params.append(f"% {ucd}%")
+        if where:
+            sql += "WHERE " + " AND ".join(where) + " "
+        sql += f"ORDER BY {order}" + (" LIMIT ?" if limit and limit > 0 else "")
+        if limit and limit > 0:
+            params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        table = _result_table(rows, ["catalog", "title", "description", "nrows", "score"])
+        if not match:
+            table.remove_column("score")
+        return table
+
+    def list_catalogs(self, prefix: Optional[str] = None, limit: int = 20) -> AstropyTable:
+        sql = ("SELECT c.catalog, c.title, COUNT(t.table_name), SUM(t.nrows) FROM catalogs c "
+               "LEFT JOIN tables t ON t.catalog = c.catalog ")
+        params: list = []
+        if prefix:
+            sql += "WHERE c.catalog LIKE ? "
+            params.append(prefix + "%")
+        sql += "GROUP BY c.catalog ORDER BY c.catalog" + (" LIMIT ?" if limit and limit > 0 else "")
+        if limit and limit > 0:
+            params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return _result_table(rows, ["catalog", "title", "tables", "nrows"])
+
+
+def _result_table(rows, names: List[str]) -> AstropyTable:
+    if not rows:
+        return AstropyTable(names=names)
+    columns = [list(c) for c in zip(*rows)]
+    missing = {}
+    for name in ("nrows", "tables"):
+        if name in names:
+            values = columns[names.index(name)]
+            missing[name] = [v is None for v in values]
+            columns[names.index(name)] = [0 if v is None else int(v) for v in values]
+    table = AstropyTable(columns, names=names, masked=True)
+    for name, mask in missing.items():
+        table[name].mask = mask
+    return table
+
+
+def fetch_table_ucds(table_names: List[str]) -> Dict[str, List[str]]:
+    """
+    Column UCDs of the given tables (one TAP_SCHEMA.columns request), keyed by
+    the unquoted table name; tables without UCDs map to an empty list.
+    `table_names` are spelled as in TAP_SCHEMA, quotes included.
+    """
+    quoted = ", ".join("'" + name.replace("'", "''") + "'" for name in table_names)
+    result = run_tap(f"SELECT table_name, ucd FROM TAP_SCHEMA.columns WHERE table_name IN ({quoted}) AND ucd IS NOT NULL")
+    ucds: Dict[str, List[str]] = {name.strip('"'): [] for name in table_names}
+    for row in result:
+        ucd = str(row["ucd"]).strip()
+        if ucd and ucd != "--":
+            ucds.setdefault(str(row["table_name"]).strip('"'), []).append(ucd)
+    return ucds
+
+
+_index: Optional[VizierIndex] = None
+
+
+def get_vizier_index() -> VizierIndex:
+    global _index
+    if _index is None:
+        _index = VizierIndex()
+    return _index
@@ -0,0 +1,46 @@
+import re
+
+import pytest
+from astroquery.heasarc import Heasarc
+
+from astroquery_cli.heasarc_tap import (
+    AdqlValidationError,
+    CatalogColumns,
+    build_adql,
+    check_where,
+    cone_query,
+    order_by_clause,
+    select_list,
+)
+
+SCHEMA = CatalogColumns("xmmssc", [["name"], ["ra"], ["dec"], ["ep_8_flux"]])
+
+
+def test_cone_query_payload():
+    adql = cone_query(Heasarc, "xmmssc", 10.5, -20.25, 0.1, columns="name, ra, dec")
+    assert adql.startswith("SELECT name, ra, dec FROM xmmssc WHERE CONTAINS(POINT('ICRS',ra,dec),CIRCLE('ICRS',")
+    ra, dec, radius = (float(v) for v in re.search(r"CIRCLE\('ICRS',([^,]+),([^,]+),([^)]+)\)", adql).groups())
+    assert ra == pytest.approx(10.5)
+    assert dec == pytest.approx(-20.25)
+    assert radius == pytest.approx(0.1)
+
+
+def test_cone_query_with_predicate_and_ordering():
+    base = cone_query(Heasarc, "xmmssc", 10.5, -20.25, 0.1, columns="name")
+    adql = build_adql(base, check_where("ep_8_flux > 1e-12", SCHEMA), order_by_clause(["EP_8_FLUX desc"], SCHEMA))
+    assert adql.startswith(base + " AND (ep_8_flux > 1e-12)")
+    assert adql.endswith(" ORDER BY ep_8_flux DESC")
+
+
+def test_all_sky_query():
+    adql = build_adql(f"SELECT {select_list(['NAME', 'ra'], SCHEMA)} FROM xmmssc", "name LIKE 'X%'")
+    assert adql == "SELECT name, ra FROM xmmssc WHERE (name LIKE 'X%')"
+
+
+def test_unknown_columns_are_rejected():
+    with pytest.raises(AdqlValidationError, match="Did you mean: name"):
+        select_list(["nam"], SCHEMA)
+    with pytest.raises(AdqlValidationError, match="fluxx"):
+        check_where("CONTAINS(POINT('ICRS',ra,dec),CIRCLE('ICRS',1,2,0.1))=1 AND fluxx > 1", SCHEMA)
+    with pytest.raises(AdqlValidationError):
+        check_where("ra > 1; DROP TABLE xmmssc", SCHEMA)